@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-from datetime import time, timedelta
+import asyncio
+from datetime import timedelta
 import logging
-import random
-from typing import TypedDict
+from typing import TYPE_CHECKING, Any
 
-from pycheckwatt import CheckwattManager, CheckWattRankManager
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
@@ -17,26 +16,25 @@ from homeassistant.core import (
     ServiceCall,
     ServiceResponse,
     SupportsResponse,
+    callback,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
 from .const import (
-    BASIC_TEST,
-    CONF_CM10_SENSOR,
     CONF_CWR_NAME,
-    CONF_POWER_SENSORS,
-    CONF_PUSH_CW_TO_RANK,
-    CONF_UPDATE_INTERVAL_ALL,
-    CONF_UPDATE_INTERVAL_MONETARY,
+    DATA_ACCOUNTS,
     DOMAIN,
-    EVENT_SIGNAL_FCRD,
+    EVENT_REPLAY_FINISHED,
     INTEGRATION_NAME,
+    STORAGE_VERSION,
 )
 
+if TYPE_CHECKING:
+    from .coordinator import CheckwattCoordinator
+
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.EVENT]
@@ -52,70 +50,109 @@ UPDATE_HISTORY_SCHEMA = vol.Schema(
 PUSH_CWR_SERVICE_NAME = "push_checkwatt_rank"
 PUSH_CWR_SCHEMA = None
 
+SPOT_PRICE_WINDOW_SERVICE_NAME = "find_spot_price_window"
+SPOT_PRICE_WINDOW_SCHEMA = vol.Schema(
+    {
+        vol.Optional("hours"): vol.All(vol.Coerce(float), vol.Range(min=0.25)),
+        vol.Optional("count"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("kind", default="cheapest"): vol.In(
+            ["cheapest", "most_expensive"]
+        ),
+        vol.Optional("within", default=24): vol.All(
+            vol.Coerce(float), vol.Range(min=0.25)
+        ),
+    }
+)
+
+EXPORT_HISTORY_SERVICE_NAME = "export_history"
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("start_date"): cv.date,
+        vol.Required("end_date"): cv.date,
+        vol.Optional("format", default="csv"): vol.In(["csv", "parquet"]),
+        vol.Optional("path"): cv.string,
+        vol.Optional("aggregate", default=False): cv.boolean,
+    }
+)
+
+CAPTURE_SERVICE_NAME = "capture_api"
+CAPTURE_SCHEMA = vol.Schema({vol.Required("action"): vol.In(["start", "stop"])})
+
+REPLAY_SERVICE_NAME = "replay_capture"
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Required("path"): cv.string,
+        vol.Optional("speed", default=1): vol.All(
+            vol.Coerce(float), vol.Range(min=0.01)
+        ),
+    }
+)
+
+INJECT_FAULT_SERVICE_NAME = "inject_fault"
+INJECT_FAULT_SCHEMA = vol.Schema(
+    {
+        vol.Optional("fault"): vol.In(
+            ["latency", "timeout", "auth_expiry", "malformed"]
+        ),
+        vol.Optional("endpoint"): vol.In(
+            [
+                "customer_details",
+                "energy_flow",
+                "meter_status",
+                "month_peak",
+                "power_data",
+                "price_zone",
+                "revenue",
+                "spot_price",
+            ]
+        ),
+        vol.Optional("count", default=1): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("latency", default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional("fcrd_states"): vol.All(
+            cv.ensure_list, [vol.In(["ACTIVATED", "DEACTIVATE", "FAIL ACTIVATION"])]
+        ),
+        vol.Optional("clear", default=False): cv.boolean,
+    }
+)
 
-CHECKWATTRANK_REPORTER = "HomeAssistantV2"
-
-
-class CheckwattResp(TypedDict):
-    """API response."""
-
-    id: str
-    firstname: str
-    lastname: str
-    address: str
-    zip: str
-    city: str
-    display_name: str
-    dso: str
-    energy_provider: str
-
-    battery_power: float
-    grid_power: float
-    solar_power: float
-    battery_soc: float
-    charge_peak_ac: float
-    charge_peak_dc: float
-    discharge_peak_ac: float
-    discharge_peak_dc: float
-    monthly_grid_peak_power: float
-
-    today_net_revenue: float
-    tomorrow_net_revenue: float
-    monthly_net_revenue: float
-    annual_net_revenue: float
-    month_estimate: float
-    daily_average: float
-
-    update_time: str
-    next_update_time: str
-
-    total_solar_energy: float
-    total_charging_energy: float
-    total_discharging_energy: float
-    total_import_energy: float
-    total_export_energy: float
-    spot_price: float
-    price_zone: str
-
-    cm10_status: str
-    cm10_version: str
-    fcr_d_status: str
-    fcr_d_info: str
-    fcr_d_date: str
-    reseller_id: int
+PROFILE_SERVICE_NAME = "profile_cycle"
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("coordinator", default="all"): vol.In(
+            ["all", "live", "device", "revenue", "spot"]
+        ),
+        vol.Optional("cycles", default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+        vol.Optional("top", default=20): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+    }
+)
 
 
 async def update_listener(hass: HomeAssistant, entry):
     """Handle options update."""
     _LOGGER.debug(entry.options)
-    if not hass:  # Not sure, to remove warning
-        await hass.config_entries.async_reload(entry.entry_id)
+    coordinator: CheckwattCoordinator = hass.data[DOMAIN][entry.entry_id]
+    await coordinator.async_options_updated()
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up CheckWatt from a config entry."""
-    coordinator = CheckwattCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    # The API client and the coordinator stack are imported on first use to
+    # keep them off the import path of the integration and its config flow
+    # pylint: disable-next=import-outside-toplevel
+    from .coordinator import (
+        CHECKWATTRANK_REPORTER,
+        CheckwattError,
+        InvalidAuth,
+        async_attach_coordinator,
+    )
+
+    coordinator = await async_attach_coordinator(hass, entry)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     entry.async_on_unload(entry.add_update_listener(update_listener))
@@ -138,7 +175,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         status = None
         stored_items = 0
         total_items = 0
-        async with CheckwattManager(username, password, INTEGRATION_NAME) as cw:
+        async with coordinator.session.factory(
+            username, password, INTEGRATION_NAME
+        ) as cw:
             try:
                 # Login to EnergyInBalance
                 if await cw.login():
@@ -168,7 +207,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                         cw.energy_provider_id
                     )
 
-                    async with CheckWattRankManager() as cwr:
+                    async with coordinator.rank_factory() as cwr:
                         dso = ""
                         if cw.battery_registration is not None:
                             if "Dso" in cw.battery_registration:
@@ -213,50 +252,65 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     async def push_cwr(call: ServiceCall) -> ServiceResponse:
         """Push data to CheckWattRank."""
-        username = entry.data.get(CONF_USERNAME)
-        password = entry.data.get(CONF_PASSWORD)
-        cwr_name = entry.options.get(CONF_CWR_NAME)
-        status = None
-        async with CheckwattManager(username, password, INTEGRATION_NAME) as cw:
-            try:
-                # Login to EnergyInBalance
-                if await cw.login():
-                    # Fetch customer detail
-                    if not await cw.get_customer_details():
-                        _LOGGER.error("Failed to fetch customer details")
-                        return {
-                            "status": "Failed to fetch customer details",
-                        }
-
-                    if not await cw.get_price_zone():
-                        _LOGGER.error("Failed to fetch prize zone")
-                        return {
-                            "status": "Failed to fetch prize zone",
-                        }
+        return {
+            "result": await coordinator.async_push_checkwatt_rank(),
+        }
 
-                    if not await cw.get_fcrd_today_net_revenue():
-                        raise UpdateFailed("Unknown error get_fcrd_revenue")
+    async def find_spot_price_window(call: ServiceCall) -> ServiceResponse:
+        """Find the cheapest or most expensive spot price window and slots."""
+        if (index := coordinator.spot.spot_price_index) is None:
+            raise HomeAssistantError(
+                "No spot prices available, enable the detailed sensors"
+            )
+
+        now = dt_util.now()
+        kind = call.data["kind"]
+        within = timedelta(hours=call.data["within"])
+        result: dict[str, Any] = {
+            "kind": kind,
+            "resolution": int(index.slot.total_seconds() // 60),
+        }
+        if "hours" in call.data:
+            result["window"] = index.find_window(call.data["hours"], now, within, kind)
+        if "count" in call.data:
+            result["slots"] = index.find_slots(call.data["count"], now, within, kind)
+        return result
 
-                    display_name = cwr_name if cwr_name != "" else cw.display_name
-                    if await push_to_checkwatt_rank(
-                        cw, display_name, cw.fcrd_today_net_revenue
-                    ):
-                        status = "Data successfully sent to CheckWattRank"
-                    else:
-                        status = "Failed to update to CheckWattRank"
+    async def export_history(call: ServiceCall) -> ServiceResponse:
+        """Export the daily revenue and energy of the sites to a file."""
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.helpers.update_coordinator import UpdateFailed
 
-                else:
-                    status = "Failed to login."
+        # pylint: disable-next=import-outside-toplevel
+        from .export import async_export_history
 
-            except InvalidAuth as err:
-                raise ConfigEntryAuthFailed from err
+        start_date = call.data["start_date"]
+        end_date = call.data["end_date"]
+        if start_date > end_date:
+            raise HomeAssistantError("The start date must not be after the end date")
 
-            except CheckwattError as err:
-                status = f"Failed to update CheckWattRank: {err}"
+        file_format = call.data["format"]
+        path = hass.config.path(
+            call.data.get("path")
+            or f"checkwatt_export_{dt_util.now():%Y%m%d_%H%M%S}.{file_format}"
+        )
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Access to {path} is not allowed")
 
-        return {
-            "result": status,
-        }
+        try:
+            return await async_export_history(
+                hass,
+                list(hass.data[DATA_ACCOUNTS].values()),
+                start_date,
+                end_date,
+                path,
+                file_format,
+                call.data["aggregate"],
+            )
+        except InvalidAuth as err:
+            raise ConfigEntryAuthFailed from err
+        except (CheckwattError, UpdateFailed, OSError) as err:
+            raise HomeAssistantError(f"Failed to export the history: {err}") from err
 
     hass.services.async_register(
         DOMAIN,
@@ -274,304 +328,180 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         supports_response=SupportsResponse.ONLY,
     )
 
-    return True
+    hass.services.async_register(
+        DOMAIN,
+        SPOT_PRICE_WINDOW_SERVICE_NAME,
+        find_spot_price_window,
+        schema=SPOT_PRICE_WINDOW_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
+    hass.services.async_register(
+        DOMAIN,
+        EXPORT_HISTORY_SERVICE_NAME,
+        export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+    # pylint: disable-next=import-outside-toplevel
+    from .websocket_api import async_register_websocket_commands
 
-    return unload_ok
+    async_register_websocket_commands(hass)
+    _async_register_debug_services(hass, entry, coordinator)
 
+    return True
 
-async def push_to_checkwatt_rank(cw_inst, cwr_name, today_net_income):
-    """Push data to CheckWattRank."""
-    if cw_inst.fcrd_today_net_revenue is not None:
-        energy_provider = await cw_inst.get_energy_trading_company(
-            cw_inst.energy_provider_id
-        )
-        async with CheckWattRankManager() as cwr:
-            dso = ""
-            if cw_inst.battery_registration is not None:
-                if "Dso" in cw_inst.battery_registration:
-                    dso = cw_inst.battery_registration["Dso"]
-            if await cwr.push_to_checkwatt_rank(
-                display_name=(cwr_name if cwr_name != "" else cw_inst.display_name),
-                dso=dso,
-                electricity_company=energy_provider,
-                electricity_area=cw_inst.price_zone,
-                installed_power=min(
-                    cw_inst.battery_charge_peak_ac, cw_inst.battery_discharge_peak_ac
-                ),
-                today_net_income=today_net_income,
-                reseller_id=cw_inst.reseller_id,
-                reporter=CHECKWATTRANK_REPORTER,
-            ):
-                return True
-    return False
-
-
-class CheckwattCoordinator(DataUpdateCoordinator[CheckwattResp]):
-    """Data update coordinator."""
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        """Initialize the coordinator."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=CONF_UPDATE_INTERVAL_ALL),
-        )
-        self._entry = entry
-        self.last_cw_rank_push = None
-        self.is_boot = True
-        self.energy_provider = None
-        self.fcrd_state = None
-        self.fcrd_info = None
-        self.fcrd_timestamp = None
-        self._id = None
-        self.update_all = 0
-        self.random_offset = random.randint(0, 14)
-        self.fcrd_today_net_revenue = None
-        self.fcrd_tomorrow_net_revenue = None
-        self.fcrd_month_net_revenue = None
-        self.fcrd_month_net_estimate = None
-        self.fcrd_daily_net_average = None
-        self.fcrd_year_net_revenue = None
-        self.monthly_grid_peak_power = None
-
-    @property
-    def entry_id(self) -> str:
-        """Return entry ID."""
-        return self._entry.entry_id
-
-    async def _async_update_data(self) -> CheckwattResp:  # noqa: C901
-        """Fetch the latest data from the source."""
 
-        try:
-            username = self._entry.data.get(CONF_USERNAME)
-            password = self._entry.data.get(CONF_PASSWORD)
-            use_power_sensors = self._entry.options.get(CONF_POWER_SENSORS)
-            push_to_cw_rank = self._entry.options.get(CONF_PUSH_CW_TO_RANK)
-            use_cm10_sensor = self._entry.options.get(CONF_CM10_SENSOR)
-            cwr_name = self._entry.options.get(CONF_CWR_NAME)
-
-            async with CheckwattManager(
-                username, password, INTEGRATION_NAME
-            ) as cw_inst:
-                if not await cw_inst.login():
-                    _LOGGER.error("Failed to login, abort update")
-                    raise UpdateFailed("Failed to login")
-
-                if not await cw_inst.get_customer_details():
-                    _LOGGER.error("Failed to obtain customer details, abort update")
-                    raise UpdateFailed("Unknown error get_customer_details")
-
-                if not await cw_inst.get_energy_flow():
-                    _LOGGER.error("Failed to get energy flows, abort update")
-                    raise UpdateFailed("Unknown error get_energy_flow")
-
-                if use_cm10_sensor:
-                    if not await cw_inst.get_meter_status():
-                        _LOGGER.error("Failed to obtain meter details, abort update")
-                        raise UpdateFailed("Unknown error get_meter_status")
-
-                # Only fetch some parameters every 15 min
-                if self.update_all == 0 and not self.is_boot:
-                    self.update_all = CONF_UPDATE_INTERVAL_MONETARY
-                    _LOGGER.debug("Fetching daily revenue")
-                    if not await cw_inst.get_fcrd_today_net_revenue():
-                        raise UpdateFailed("Unknown error get_fcrd_revenue")
-
-                    _LOGGER.debug("Fetching monthly revenue")
-                    if not await cw_inst.get_fcrd_month_net_revenue():
-                        raise UpdateFailed("Unknown error get_revenue_month")
-
-                    _LOGGER.debug("Fetching annual revenue")
-                    if not await cw_inst.get_fcrd_year_net_revenue():
-                        raise UpdateFailed("Unknown error get_revenue_year")
-
-                    _LOGGER.debug("Fetching montly peak power")
-                    if not await cw_inst.get_battery_month_peak_effect():
-                        raise UpdateFailed(
-                            "Unknown error get_battery_month_peak_effect"
-                        )
+@callback
+def _async_register_debug_services(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: CheckwattCoordinator
+) -> None:
+    """Register the services for debugging and profiling."""
 
-                    self.fcrd_today_net_revenue = cw_inst.fcrd_today_net_revenue
-                    self.fcrd_tomorrow_net_revenue = cw_inst.fcrd_tomorrow_net_revenue
-                    self.fcrd_month_net_revenue = cw_inst.fcrd_month_net_revenue
-                    self.fcrd_month_net_estimate = cw_inst.fcrd_month_net_estimate
-                    self.fcrd_daily_net_average = cw_inst.fcrd_daily_net_average
-                    self.fcrd_year_net_revenue = cw_inst.fcrd_year_net_revenue
-                    self.monthly_grid_peak_power = cw_inst.month_peak_effect
-
-                if not self.is_boot:
-                    self.update_all -= 1
-
-                if self.is_boot:
-                    self.is_boot = False
-                    self.energy_provider = await cw_inst.get_energy_trading_company(
-                        cw_inst.energy_provider_id
-                    )
+    async def inject_fault(call: ServiceCall) -> ServiceResponse:
+        """Inject faults into the coordinators and report their effect."""
+        # pylint: disable-next=import-outside-toplevel
+        from .faults import FaultInjector
+
+        if call.data["clear"]:
+            faults, coordinator.faults = coordinator.faults, None
+            return {"stats": faults.as_dict() if faults else None}
 
-                    # Store fcrd_state at boot, used to spark event
-                    self.fcrd_state = cw_inst.fcrd_state
-                    self._id = cw_inst.customer_details["Id"]
-
-                # Price Zone is used both as Detailed Sensor and by Push to CheckWattRank
-                if push_to_cw_rank or use_power_sensors:
-                    if not await cw_inst.get_price_zone():
-                        raise UpdateFailed("Unknown error get_price_zone")
-                if use_power_sensors:
-                    if not await cw_inst.get_power_data():
-                        raise UpdateFailed("Unknown error get_power_data")
-                    if not await cw_inst.get_spot_price():
-                        raise UpdateFailed("Unknown error get_spot_price")
-
-                if push_to_cw_rank:
-                    if self.last_cw_rank_push is None or (
-                        dt_util.now().time()
-                        >= time(11, self.random_offset)  # Wait until 11am + 0-14 min
-                        and dt_util.start_of_local_day(dt_util.now())
-                        != dt_util.start_of_local_day(self.last_cw_rank_push)
-                    ):
-                        if self.fcrd_today_net_revenue is not None:
-                            _LOGGER.debug("Pushing to CheckWattRank")
-                            if await push_to_checkwatt_rank(
-                                cw_inst, cwr_name, self.fcrd_today_net_revenue
-                            ):
-                                self.last_cw_rank_push = dt_util.now()
-
-                resp: CheckwattResp = {
-                    "id": cw_inst.customer_details["Id"],
-                    "firstname": cw_inst.customer_details["FirstName"],
-                    "lastname": cw_inst.customer_details["LastName"],
-                    "address": cw_inst.customer_details["StreetAddress"],
-                    "zip": cw_inst.customer_details["ZipCode"],
-                    "city": cw_inst.customer_details["City"],
-                    "display_name": cw_inst.display_name,
-                    "energy_provider": self.energy_provider,
-                    "reseller_id": cw_inst.reseller_id,
-                }
-                if cw_inst.battery_registration is not None:
-                    if "Dso" in cw_inst.battery_registration:
-                        resp["dso"] = cw_inst.battery_registration["Dso"]
-                if cw_inst.energy_data is not None:
-                    resp["battery_power"] = cw_inst.battery_power
-                    resp["grid_power"] = cw_inst.grid_power
-                    resp["solar_power"] = cw_inst.solar_power
-                    resp["battery_soc"] = cw_inst.battery_soc
-                    resp["charge_peak_ac"] = cw_inst.battery_charge_peak_ac
-                    resp["charge_peak_dc"] = cw_inst.battery_charge_peak_dc
-                    resp["discharge_peak_ac"] = cw_inst.battery_discharge_peak_ac
-                    resp["discharge_peak_dc"] = cw_inst.battery_discharge_peak_dc
-                    resp["monthly_grid_peak_power"] = self.monthly_grid_peak_power
-
-                # Use self stored variant of revenue parameters as they are not always fetched
-                if self.fcrd_today_net_revenue is not None:
-                    resp["today_net_revenue"] = self.fcrd_today_net_revenue
-                    resp["tomorrow_net_revenue"] = self.fcrd_tomorrow_net_revenue
-                if self.fcrd_month_net_revenue is not None:
-                    resp["monthly_net_revenue"] = self.fcrd_month_net_revenue
-                    resp["month_estimate"] = self.fcrd_month_net_estimate
-                    resp["daily_average"] = self.fcrd_daily_net_average
-                if self.fcrd_year_net_revenue is not None:
-                    resp["annual_net_revenue"] = self.fcrd_year_net_revenue
-
-                update_time = dt_util.now().strftime("%Y-%m-%d %H:%M:%S")
-                next_update = dt_util.now() + timedelta(
-                    minutes=CONF_UPDATE_INTERVAL_MONETARY
+        if coordinator.faults is None:
+            coordinator.faults = FaultInjector()
+        if "fault" in call.data:
+            if "endpoint" not in call.data:
+                raise HomeAssistantError("An endpoint is required to inject a fault")
+            try:
+                coordinator.faults.add(
+                    call.data["fault"],
+                    call.data["endpoint"],
+                    call.data["count"],
+                    call.data["latency"],
                 )
-                next_update_time = next_update.strftime("%Y-%m-%d %H:%M:%S")
-                resp["update_time"] = update_time
-                resp["next_update_time"] = next_update_time
-
-                if use_power_sensors:
-                    resp["total_solar_energy"] = cw_inst.total_solar_energy
-                    resp["total_charging_energy"] = cw_inst.total_charging_energy
-                    resp["total_discharging_energy"] = cw_inst.total_discharging_energy
-                    resp["total_import_energy"] = cw_inst.total_import_energy
-                    resp["total_export_energy"] = cw_inst.total_export_energy
-                    resp["spot_price"] = cw_inst.get_spot_price_excl_vat(
-                        int(dt_util.now().strftime("%H"))
-                    )
-                    resp["price_zone"] = cw_inst.price_zone
-
-                if cw_inst.meter_data is not None and use_cm10_sensor:
-                    if cw_inst.meter_status == "offline":
-                        resp["cm10_status"] = "Offline"
-                    elif cw_inst.meter_under_test:
-                        resp["cm10_status"] = "Test Pending"
-                    else:
-                        resp["cm10_status"] = "Active"
-
-                    resp["cm10_version"] = cw_inst.meter_version
-                    resp["fcr_d_status"] = cw_inst.fcrd_state
-                    resp["fcr_d_info"] = cw_inst.fcrd_info
-                    resp["fcr_d_date"] = cw_inst.fcrd_timestamp
-
-                # Check if FCR-D State has changed and dispatch it ACTIVATED/ DEACTIVATED
-                old_state = self.fcrd_state
-                new_state = cw_inst.fcrd_state
-
-                # During test, toggle (every minute)
-                if BASIC_TEST is True:
-                    if old_state == "ACTIVATED":
-                        new_state = "DEACTIVATE"
-                    if old_state == "DEACTIVATE":
-                        new_state = "FAIL ACTIVATION"
-                    if old_state == "FAIL ACTIVATION":
-                        new_state = "ACTIVATED"
-
-                if old_state != new_state:
-                    signal_payload = {
-                        "signal": EVENT_SIGNAL_FCRD,
-                        "data": {
-                            "current_fcrd": {
-                                "state": old_state,
-                                "info": self.fcrd_info,
-                                "date": self.fcrd_timestamp,
-                            },
-                            "new_fcrd": {
-                                "state": new_state,
-                                "info": cw_inst.fcrd_info,
-                                "date": cw_inst.fcrd_timestamp,
-                            },
-                        },
-                    }
-
-                    # Dispatch it to subscribers
-                    async_dispatcher_send(
-                        self.hass,
-                        f"checkwatt_{self._id}_signal",
-                        signal_payload,
-                    )
+            except ValueError as err:
+                raise HomeAssistantError(str(err)) from err
+        if "fcrd_states" in call.data:
+            coordinator.faults.script_fcrd_states(call.data["fcrd_states"])
+        return {"stats": coordinator.faults.as_dict()}
+
+    async def capture_api(call: ServiceCall) -> ServiceResponse:
+        """Start or stop capturing the calls to the APIs."""
+        if call.data["action"] == "start":
+            coordinator.async_start_capture()
+            return {"capturing": True}
+        return {"capturing": False, "capture": await coordinator.async_stop_capture()}
+
+    replay_task: asyncio.Task | None = None
+
+    async def replay_capture(call: ServiceCall) -> ServiceResponse:
+        """Replay a capture through a detached coordinator in the background.
+
+        The replay runs as long as the capture did, divided by the speed, so
+        its result is fired as an event when it has finished.
+        """
+        nonlocal replay_task
+        # pylint: disable-next=import-outside-toplevel
+        from .capture import async_replay, read_capture
+
+        if replay_task is not None and not replay_task.done():
+            raise HomeAssistantError("A capture is already being replayed")
+
+        path = hass.config.path(call.data["path"])
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Access to {path} is not allowed")
+        try:
+            records = await hass.async_add_executor_job(read_capture, path)
+        except OSError as err:
+            raise HomeAssistantError(f"Failed to read {path}: {err}") from err
 
-                    # Update self to discover next change
-                    self.fcrd_state = new_state
-                    self.fcrd_info = cw_inst.fcrd_info
-                    self.fcrd_timestamp = cw_inst.fcrd_timestamp
+        async def _async_replay() -> None:
+            """Replay the capture and fire its result."""
+            try:
+                result = await async_replay(hass, entry, records, call.data["speed"])
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.exception("Failed to replay %s", path)
+                result = {"error": str(err)}
+            hass.bus.async_fire(EVENT_REPLAY_FINISHED, {"path": path, **result})
+
+        replay_task = entry.async_create_background_task(
+            hass, _async_replay(), f"{DOMAIN}_replay_capture"
+        )
+        return {"path": path, "records": len(records), "event": EVENT_REPLAY_FINISHED}
+
+    async def profile_cycle(call: ServiceCall) -> ServiceResponse:
+        """Profile update cycles of the coordinators."""
+        # pylint: disable-next=import-outside-toplevel
+        from .profiling import async_profile_cycles
+
+        coordinators = [
+            profiled
+            for profiled in coordinator.coordinators
+            if call.data["coordinator"] in ("all", profiled.short_name)
+        ]
+        try:
+            return await async_profile_cycles(
+                hass, coordinators, call.data["cycles"], call.data["top"]
+            )
+        except ValueError as err:
+            # Raised when another profiler is active
+            raise HomeAssistantError(f"Failed to profile: {err}") from err
 
-                return resp
+    hass.services.async_register(
+        DOMAIN,
+        INJECT_FAULT_SERVICE_NAME,
+        inject_fault,
+        schema=INJECT_FAULT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
-        except InvalidAuth as err:
-            raise ConfigEntryAuthFailed from err
-        except CheckwattError as err:
-            raise UpdateFailed(str(err)) from err
+    hass.services.async_register(
+        DOMAIN,
+        CAPTURE_SERVICE_NAME,
+        capture_api,
+        schema=CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
+    hass.services.async_register(
+        DOMAIN,
+        REPLAY_SERVICE_NAME,
+        replay_capture,
+        schema=REPLAY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
-class CheckwattError(HomeAssistantError):
-    """Base error."""
+    hass.services.async_register(
+        DOMAIN,
+        PROFILE_SERVICE_NAME,
+        profile_cycle,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
-class InvalidAuth(CheckwattError):
-    """Raised when invalid authentication credentials are provided."""
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the locally aggregated data with the last entry of an account."""
+    # pylint: disable-next=import-outside-toplevel
+    from .coordinator import account_storage_key
 
+    key = account_storage_key(entry)
+    if not any(
+        account_storage_key(other) == key
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        await Store(hass, STORAGE_VERSION, key).async_remove()
 
-class APIRatelimitExceeded(CheckwattError):
-    """Raised when the API rate limit is exceeded."""
 
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        # pylint: disable-next=import-outside-toplevel
+        from .coordinator import async_detach_coordinator
 
-class UnknownError(CheckwattError):
-    """Raised when an unknown error occurs."""
+        hass.data[DOMAIN].pop(entry.entry_id)
+        await async_detach_coordinator(hass, entry)
+
+    return unload_ok
@@ -0,0 +1,139 @@
+"""Streaming cycle counting of the battery state of charge."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any
+
+# Upper bounds in % of the depth of discharge bins
+DOD_BINS = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+# Samples further apart are a gap, not integrated into the throughput
+MAX_SAMPLE_GAP = 300  # seconds
+
+
+class BatteryCycleCounter:
+    """Rainflow count of the state of charge cycles and the daily throughput.
+
+    The reversals of the state of charge are counted as they arrive, with the
+    three point rainflow algorithm. Only the reversals not yet closed into a
+    cycle are kept, a stack of shrinking ranges that cannot hold more
+    reversals than there are levels of charge. Cycles are folded into the
+    equivalent full cycles and a depth of discharge histogram.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty counter."""
+        self.reversals: list[float] = []
+        self.last_soc: float | None = None
+        self.direction = 0
+        self.equivalent_full_cycles = 0.0
+        self.dod_histogram = [0.0] * len(DOD_BINS)
+        self.day: date | None = None
+        self.sampled: datetime | None = None
+        self.last_power: float | None = None
+        self.throughput_today = 0.0
+
+    def add_sample(self, now: datetime, soc: float | None, power: float | None) -> bool:
+        """Add a state of charge sample in % and battery power in W.
+
+        Return True if the sample was a reversal of the state of charge.
+        """
+        if power is not None:
+            self._add_power(now, power)
+        if soc is None:
+            return False
+
+        if self.last_soc is None:
+            self.last_soc = soc
+            self.reversals = [soc]
+            return False
+
+        direction = (soc > self.last_soc) - (soc < self.last_soc)
+        if direction == 0:
+            return False
+
+        reversal = self.direction not in (0, direction)
+        if reversal:
+            # The last sample was a peak or a valley
+            self._add_reversal(self.last_soc)
+        self.direction = direction
+        self.last_soc = soc
+        return reversal
+
+    def _add_power(self, now: datetime, power: float) -> None:
+        """Integrate the battery power into the throughput of the day."""
+        if self.day != now.date():
+            self.day = now.date()
+            self.throughput_today = 0.0
+        elif self.sampled is not None and self.last_power is not None:
+            elapsed = (now - self.sampled).total_seconds()
+            if 0 < elapsed <= MAX_SAMPLE_GAP:
+                average = (abs(self.last_power) + abs(power)) / 2
+                self.throughput_today += average * elapsed / 3600 / 1000
+        self.sampled = now
+        self.last_power = power
+
+    def _add_reversal(self, soc: float) -> None:
+        """Add a reversal and close the cycles it completes."""
+        stack = self.reversals
+        stack.append(soc)
+        while len(stack) >= 3:
+            latest = abs(stack[-1] - stack[-2])
+            previous = abs(stack[-2] - stack[-3])
+            if latest < previous:
+                break
+            if len(stack) == 3:
+                # The range from the start of the series is a half cycle
+                self._count(previous, 0.5)
+                del stack[0]
+            else:
+                self._count(previous, 1.0)
+                del stack[-3:-1]
+
+    def _count(self, depth: float, cycles: float) -> None:
+        """Fold cycles of a depth in % into the totals."""
+        if depth <= 0:
+            return
+        self.equivalent_full_cycles += cycles * depth / 100
+        for index, upper in enumerate(DOD_BINS):
+            if depth <= upper or index == len(DOD_BINS) - 1:
+                self.dod_histogram[index] += cycles
+                break
+
+    @property
+    def dod_distribution(self) -> dict[str, float]:
+        """Return the number of cycles per depth of discharge bin."""
+        lower = 0
+        distribution = {}
+        for upper, cycles in zip(DOD_BINS, self.dod_histogram):
+            distribution[f"{lower}-{upper}%"] = cycles
+            lower = upper
+        return distribution
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counter as a dictionary for storage."""
+        return {
+            "reversals": self.reversals,
+            "last_soc": self.last_soc,
+            "direction": self.direction,
+            "equivalent_full_cycles": self.equivalent_full_cycles,
+            "dod_histogram": self.dod_histogram,
+            "day": self.day.isoformat() if self.day else None,
+            "throughput_today": self.throughput_today,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BatteryCycleCounter:
+        """Restore a counter from storage."""
+        counter = cls()
+        counter.reversals = list(data.get("reversals", []))
+        counter.last_soc = data.get("last_soc")
+        counter.direction = data.get("direction", 0)
+        counter.equivalent_full_cycles = data.get("equivalent_full_cycles", 0.0)
+        histogram = data.get("dod_histogram", [])
+        if len(histogram) == len(DOD_BINS):
+            counter.dod_histogram = list(histogram)
+        if data.get("day"):
+            counter.day = date.fromisoformat(data["day"])
+        counter.throughput_today = data.get("throughput_today", 0.0)
+        return counter
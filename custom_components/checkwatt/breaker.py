@@ -0,0 +1,63 @@
+"""Circuit breaker for the CheckWatt API endpoints."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker of a single endpoint.
+
+    After a number of consecutive failures the breaker opens and requests are
+    not issued until the reset timeout has passed. A single probe is then let
+    through, closing the breaker on success or opening it again with a doubled
+    reset timeout on failure.
+    """
+
+    def __init__(
+        self, failure_threshold: int, reset_timeout: int, reset_timeout_max: int
+    ) -> None:
+        """Initialize a closed breaker, the timeouts are in seconds."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = timedelta(seconds=reset_timeout)
+        self.reset_timeout_max = timedelta(seconds=reset_timeout_max)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.timeout = self.reset_timeout
+        self.opened: datetime | None = None
+        self.last_success: datetime | None = None
+
+    def allow_request(self, now: datetime) -> bool:
+        """Return True if a request shall be issued."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and now - self.opened >= self.timeout:
+            self.state = STATE_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self, now: datetime) -> None:
+        """Close the breaker after a successful request."""
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.timeout = self.reset_timeout
+        self.opened = None
+        self.last_success = now
+
+    def record_failure(self, now: datetime) -> None:
+        """Count a failed request, opening the breaker if required."""
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN:
+            self.timeout = min(self.timeout * 2, self.reset_timeout_max)
+            self._open(now)
+        elif self.failures >= self.failure_threshold:
+            self._open(now)
+
+    def _open(self, now: datetime) -> None:
+        """Stop issuing requests until the reset timeout has passed."""
+        self.state = STATE_OPEN
+        self.opened = now
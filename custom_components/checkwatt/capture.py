@@ -0,0 +1,274 @@
+"""Capture and replay of the calls to the CheckWatt APIs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import gzip
+import inspect
+import json
+import logging
+import time
+from typing import Any
+
+from pycheckwatt import CheckwattManager, CheckWattRankManager
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_UPDATE_INTERVAL_MONETARY
+
+_LOGGER = logging.getLogger(__name__)
+
+MANAGER_CHECKWATT = "checkwatt"
+MANAGER_RANK = "rank"
+
+# Manager attributes never written to a capture
+PRIVATE_ATTRIBUTES = {"session", "username", "password", "jwt_token", "refresh_token"}
+
+
+def _state(manager: Any) -> dict[str, Any]:
+    """Return the data attributes of a manager."""
+    return {
+        key: value
+        for key, value in vars(manager).items()
+        if key not in PRIVATE_ATTRIBUTES and not callable(value)
+    }
+
+
+def _methods(manager: Any) -> list[str]:
+    """Return the names of the public API calls of a manager."""
+    return [
+        name
+        for name, member in inspect.getmembers(type(manager))
+        if not name.startswith("_") and inspect.iscoroutinefunction(member)
+    ]
+
+
+class CaptureRecorder:
+    """Recorder of the calls to the API managers, with their timing.
+
+    The calls are recorded on the manager instances, with their arguments,
+    result and the data they left in the manager. Credentials and tokens
+    are left out, the account data is not.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty capture."""
+        self.started = time.monotonic()
+        self.records: list[dict[str, Any]] = []
+        self._managers: list[Any] = []
+        self._baselined: set[int] = set()
+
+    def factory(self, manager_type: type, kind: str) -> Callable[..., Any]:
+        """Return a factory of managers whose calls are recorded."""
+
+        def _create(*args: Any) -> Any:
+            """Create a recorded manager."""
+            return self.instrument(manager_type(*args), kind)
+
+        return _create
+
+    def instrument(self, manager: Any, kind: str) -> Any:
+        """Record the calls of a manager."""
+        for name in _methods(manager):
+            setattr(manager, name, self._recorded(manager, kind, name))
+        self._managers.append(manager)
+        return manager
+
+    def release(self) -> None:
+        """Stop recording the calls of the managers."""
+        for manager in self._managers:
+            for name in _methods(manager):
+                vars(manager).pop(name, None)
+        self._managers.clear()
+
+    def _recorded(self, manager: Any, kind: str, name: str) -> Callable[..., Any]:
+        """Return a call of a manager that is recorded."""
+        call = getattr(type(manager), name).__get__(manager)
+
+        async def _call(*args: Any, **kwargs: Any) -> Any:
+            """Call the API and record the exchange."""
+            # The first record of a manager carries its whole state, for the
+            # replay to start from the same data
+            before = _state(manager) if id(manager) in self._baselined else {}
+            self._baselined.add(id(manager))
+            start = time.monotonic()
+            record: dict[str, Any] = {
+                "t": round(start - self.started, 3),
+                "manager": kind,
+                "call": name,
+                "args": args,
+                "kwargs": kwargs,
+            }
+            try:
+                result = await call(*args, **kwargs)
+            except Exception as err:
+                record["error"] = repr(err)
+                raise
+            else:
+                record["result"] = result
+            finally:
+                record["duration"] = round(time.monotonic() - start, 3)
+                record["state"] = {
+                    key: value
+                    for key, value in _state(manager).items()
+                    if before.get(key) != value
+                }
+                self.records.append(record)
+            return result
+
+        return _call
+
+    def write(self, path: str) -> None:
+        """Write the capture to a gzipped JSON lines file."""
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            for record in self.records:
+                file.write(json.dumps(record, default=str, separators=(",", ":")))
+                file.write("\n")
+
+
+def read_capture(path: str) -> list[dict[str, Any]]:
+    """Read a capture written by the recorder."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class CaptureReplay:
+    """Replay of a capture, calls are answered in the order recorded.
+
+    The replayed calls take their recorded duration divided by the speed.
+    Calls missing in the capture are answered without delay or new data.
+    """
+
+    def __init__(self, records: list[dict[str, Any]], speed: float = 1.0) -> None:
+        """Initialize the replay of the records."""
+        self.speed = speed
+        self.replayed = 0
+        self.missing: dict[str, int] = {}
+        self._records: dict[tuple[str, str], deque[dict[str, Any]]] = {}
+        self._last: dict[tuple[str, str], Any] = {}
+        for record in records:
+            key = (record["manager"], record["call"])
+            self._records.setdefault(key, deque()).append(record)
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of records not yet replayed."""
+        return sum(len(records) for records in self._records.values())
+
+    def factory(self, manager_type: type, kind: str) -> Callable[..., Any]:
+        """Return a factory of managers answered from the capture."""
+
+        def _create(*args: Any) -> Any:
+            """Create a replaying manager."""
+            manager = manager_type(*args)
+            for name in _methods(manager):
+                setattr(manager, name, self._replayed(manager, kind, name))
+            return manager
+
+        return _create
+
+    def _replayed(self, manager: Any, kind: str, name: str) -> Callable[..., Any]:
+        """Return a call of a manager that is answered from the capture."""
+
+        async def _call(*args: Any, **kwargs: Any) -> Any:
+            """Answer the call with the next record."""
+            if not (records := self._records.get((kind, name))):
+                # Answer as the last time, leaving the data of the manager as is
+                self.missing[name] = self.missing.get(name, 0) + 1
+                return self._last.get((kind, name), True)
+
+            record = records.popleft()
+            self._last[(kind, name)] = record.get("result")
+            await asyncio.sleep(record["duration"] / self.speed)
+            for key, value in record["state"].items():
+                setattr(manager, key, value)
+            self.replayed += 1
+            if "error" in record:
+                raise RuntimeError(f"Replayed error: {record['error']}")
+            return record.get("result")
+
+        return _call
+
+
+class _ReplayCheckwattManager(CheckwattManager):
+    """CheckWatt manager without a connection."""
+
+    async def __aenter__(self):
+        """Asynchronous enter."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Asynchronous exit."""
+
+
+class _ReplayRankManager(CheckWattRankManager):
+    """CheckWattRank manager without a connection."""
+
+    async def __aenter__(self):
+        """Asynchronous enter."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Asynchronous exit."""
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    records: list[dict[str, Any]],
+    speed: float = 1.0,
+) -> dict[str, Any]:
+    """Feed the records of a capture through a coordinator detached from the entry.
+
+    The coordinators are run at their update intervals, shortened by the
+    speed, until the capture is exhausted. Return the timing of the cycles.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from .coordinator import CheckwattCoordinator
+
+    if not records:
+        return {"records": 0}
+
+    replay = CaptureReplay(records, speed)
+    hub = CheckwattCoordinator(hass, entry, replay=True)
+    hub.session.factory = replay.factory(_ReplayCheckwattManager, MANAGER_CHECKWATT)
+    hub.rank_factory = replay.factory(_ReplayRankManager, MANAGER_RANK)
+
+    durations: dict[str, list[float]] = {c.short_name: [] for c in hub.coordinators}
+    due = {coordinator.short_name: 0.0 for coordinator in hub.coordinators}
+    simulated = 0.0
+    # Run until the capture is exhausted, or one revenue interval past its end
+    end = records[-1]["t"] + CONF_UPDATE_INTERVAL_MONETARY * 60
+    started = time.monotonic()
+    try:
+        while simulated <= end and replay.remaining:
+            for coordinator in hub.coordinators:
+                if due[coordinator.short_name] > simulated:
+                    continue
+                await coordinator.async_refresh()
+                if coordinator.last_cycle_duration is not None:
+                    durations[coordinator.short_name].append(
+                        round(coordinator.last_cycle_duration, 3)
+                    )
+                due[coordinator.short_name] = (
+                    simulated + coordinator.update_interval.total_seconds()
+                )
+            step = min(due.values()) - simulated
+            await asyncio.sleep(step / speed)
+            simulated += step
+    finally:
+        await hub.session.async_close()
+
+    return {
+        "records": len(records),
+        "replayed": replay.replayed,
+        "missing": replay.missing,
+        "wall_time": round(time.monotonic() - started, 3),
+        "finished": dt_util.now().isoformat(),
+        "cycle_durations": durations,
+        "diagnostics": hub.diagnostics,
+    }
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
+from contextlib import AsyncExitStack
 import logging
 from typing import Any
 
-from pycheckwatt import CheckwattManager
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -17,9 +17,13 @@ from homeassistant.exceptions import HomeAssistantError
 from .const import (
     CONF_CM10_SENSOR,
     CONF_CWR_NAME,
+    CONF_FCRD_WATCHER,
     CONF_POWER_SENSORS,
     CONF_PUSH_CW_TO_RANK,
+    CONF_UPDATE_DEADLINE,
+    DEFAULT_UPDATE_DEADLINE,
     DOMAIN,
+    INTEGRATION_NAME,
 )
 
 CONF_TITLE = "CheckWatt"
@@ -35,13 +39,40 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Validate that the user input allows us to connect to CheckWatt."""
-    async with CheckwattManager(
-        data[CONF_USERNAME], data[CONF_PASSWORD]
-    ) as check_watt_instance:
+    """Validate that the user input allows us to connect to CheckWatt.
+
+    The logged in session is returned together with the customer details
+    and energy provider, so the first refresh of the new entry can start warm.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from pycheckwatt import CheckwattManager
+
+    stack = AsyncExitStack()
+    try:
+        check_watt_instance = await stack.enter_async_context(
+            CheckwattManager(data[CONF_USERNAME], data[CONF_PASSWORD], INTEGRATION_NAME)
+        )
         if not await check_watt_instance.login():
             raise InvalidAuth
 
+        if not await check_watt_instance.get_customer_details():
+            # Valid credentials, but nothing worth handing over
+            await stack.aclose()
+            return {}
+
+        energy_provider = await check_watt_instance.get_energy_trading_company(
+            check_watt_instance.energy_provider_id
+        )
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    return {
+        "cw_inst": check_watt_instance,
+        "stack": stack,
+        "energy_provider": energy_provider,
+    }
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for CheckWatt."""
@@ -64,7 +95,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         self.data = user_input
         try:
-            await validate_input(self.hass, self.data)
+            info = await validate_input(self.hass, self.data)
         except CannotConnect:
             errors["base"] = "cannot_connect"
         except InvalidAuth:
@@ -73,6 +104,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unexpected exception")
             errors["base"] = "unknown"
         else:
+            # pylint: disable-next=import-outside-toplevel
+            from .coordinator import CheckwattHandoff, async_store_handoff
+
+            if info:
+                async_store_handoff(
+                    self.hass, self.data[CONF_USERNAME], CheckwattHandoff(**info)
+                )
             return self.async_create_entry(
                 title=CONF_TITLE,
                 data=self.data,
@@ -81,6 +119,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_PUSH_CW_TO_RANK: False,
                     CONF_CM10_SENSOR: True,
                     CONF_CWR_NAME: "",
+                    CONF_FCRD_WATCHER: False,
+                    CONF_UPDATE_DEADLINE: DEFAULT_UPDATE_DEADLINE,
                 },
             )
 
@@ -127,6 +167,16 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_CM10_SENSOR,
                         default=self.config_entry.options.get(CONF_CM10_SENSOR),
                     ): bool,
+                    vol.Required(
+                        CONF_FCRD_WATCHER,
+                        default=self.config_entry.options.get(CONF_FCRD_WATCHER, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_UPDATE_DEADLINE,
+                        default=self.config_entry.options.get(
+                            CONF_UPDATE_DEADLINE, DEFAULT_UPDATE_DEADLINE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=55)),
                     vol.Optional(
                         CONF_CWR_NAME,
                         default=self.config_entry.options.get(CONF_CWR_NAME),
@@ -8,6 +8,24 @@ INTEGRATION_NAME = "ha-checkwatt"
 # Update interval for regular sensors is once every minute
 CONF_UPDATE_INTERVAL_ALL = 1
 CONF_UPDATE_INTERVAL_MONETARY = 15
+# Update interval for the optional FCR-D watcher is in seconds
+CONF_UPDATE_INTERVAL_FCRD = 15
+DEFAULT_UPDATE_DEADLINE = 45  # seconds per update cycle
+UPDATE_DEADLINE_GRACE = 5
+# Monthly and annual revenue are reconciled with EnergyInBalance once a day
+REVENUE_RECONCILE_HOUR = 2
+# Days of revenue missed while offline that are backfilled at most
+BACKFILL_MAX_DAYS = 180
+# Days of history fetched and written at a time by the export
+EXPORT_CHUNK_DAYS = 31
+# Number of daily peaks averaged by the capacity tariffs
+GRID_PEAK_TOP_N = 3
+# Seconds a session validated by the config flow waits for its entry
+HANDOFF_TIMEOUT = 120
+CWR_PUSH_RETRY = 15  # minutes
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 120  # seconds, doubled per failed probe
+BREAKER_RESET_TIMEOUT_MAX = 1800
 ATTRIBUTION = "Data provided by CheckWatt EnergyInBalance"
 MANUFACTURER = "CheckWatt"
 CHECKWATT_MODEL = "CheckWatt"
@@ -16,12 +34,25 @@ CONF_POWER_SENSORS: Final = "show_details"
 CONF_PUSH_CW_TO_RANK: Final = "push_to_cw_rank"
 CONF_CM10_SENSOR: Final = "cm10_sensor"
 CONF_CWR_NAME: Final = "cwr_name"
+CONF_FCRD_WATCHER: Final = "fcrd_watcher"
+CONF_UPDATE_DEADLINE: Final = "update_deadline"
 
 # Misc
 P_UNKNOWN = "Unknown"
+DATA_HANDOFF = f"{DOMAIN}_handoff"
+DATA_ACCOUNTS = f"{DOMAIN}_accounts"
+DATA_PORTFOLIO = f"{DOMAIN}_portfolio"
+DATA_SUBSCRIPTIONS = f"{DOMAIN}_subscriptions"
+# Number of sites from which the portfolio entities are provided
+PORTFOLIO_MIN_SITES = 2
+PORTFOLIO_DEVICE_ID = "portfolio"
+# Samples of the live power data kept for charts, a day of live updates
+SERIES_SIZE = 1440
 
-# Temp Test
-BASIC_TEST = False
+# Storage of locally aggregated data
+STORAGE_KEY = DOMAIN
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
 
 # CheckWatt Sensor Attributes
 # NOTE Keep these names aligned with strings.json
@@ -39,6 +70,8 @@ C_FCRD_DATE = "fcr_d_date"
 C_FCRD_INFO = "fcr_d_info"
 C_FCRD_STATUS = "fcr_d_status"
 C_MONTH_ESITIMATE = "month_estimate"
+C_MONTH_ESTIMATE_HIGH = "month_estimate_high"
+C_MONTH_ESTIMATE_LOW = "month_estimate_low"
 C_NEXT_UPDATE_TIME = "next_update"
 C_PRICE_ZONE = "price_zone"
 C_RESELLER_ID = "reseller_id"
@@ -52,6 +85,29 @@ C_CHARGE_PEAK_DC = "charge_peak_dc"
 C_DISCHARGE_PEAK_AC = "discharge_peak_ac"
 C_DISCHARGE_PEAK_DC = "discharge_peak_dc"
 C_MONTHLY_GRID_PEAK_POWER = "monthly_grid_peak_power"
+C_GRID_PEAK_HOUR_AVERAGE = "grid_peak_hour_average"
+C_GRID_PEAK_TOP = "grid_peak_top"
+C_GRID_PEAK_TOP_AVERAGE = "grid_peak_top_average"
+C_CHEAPEST_HOUR = "cheapest_hour"
+C_MOST_EXPENSIVE_HOUR = "most_expensive_hour"
+C_STALE_ENDPOINTS = "stale_endpoints"
+C_CYCLE_DURATION = "cycle_duration"
+C_MISSED_CALLS = "missed_calls"
+C_OVERRUN_CYCLES = "overrun_cycles"
+C_SKIPPED_CYCLES = "skipped_cycles"
+C_SPOT_PRICE_RESOLUTION = "resolution"
+C_DOD_DISTRIBUTION = "depth_of_discharge"
+C_FCRD_RECENT_TRANSITIONS = "recent_transitions"
 
 # CheckWatt Event Signals
 EVENT_SIGNAL_FCRD = "fcrd"
+
+# Event fired with the result of a replay of a capture
+EVENT_REPLAY_FINISHED = f"{DOMAIN}_replay_finished"
+
+# FCR-D states parsed from the logbook
+FCRD_ACTIVATED = "ACTIVATED"
+FCRD_DEACTIVATED = "DEACTIVATE"
+FCRD_FAILED = "FAIL ACTIVATION"
+# Number of FCR-D transitions kept in the timeline
+FCRD_TIMELINE_SIZE = 100
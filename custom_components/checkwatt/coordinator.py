@@ -0,0 +1,1588 @@
+"""Data update coordinator for the CheckWatt integration."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections.abc import Callable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import partial
+import logging
+import random
+from typing import Any, TypedDict
+
+from pycheckwatt import CheckwattManager, CheckWattRankManager
+
+from homeassistant.config_entries import ConfigEntry, current_entry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_time,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util, slugify
+
+from .battery import BatteryCycleCounter
+from .breaker import CircuitBreaker
+from .capture import MANAGER_CHECKWATT, MANAGER_RANK, CaptureRecorder
+from .const import (
+    BACKFILL_MAX_DAYS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT_MAX,
+    CONF_CM10_SENSOR,
+    CONF_CWR_NAME,
+    CONF_FCRD_WATCHER,
+    CONF_POWER_SENSORS,
+    CONF_PUSH_CW_TO_RANK,
+    CONF_UPDATE_DEADLINE,
+    CONF_UPDATE_INTERVAL_ALL,
+    CONF_UPDATE_INTERVAL_FCRD,
+    CONF_UPDATE_INTERVAL_MONETARY,
+    CWR_PUSH_RETRY,
+    DATA_ACCOUNTS,
+    DATA_HANDOFF,
+    DEFAULT_UPDATE_DEADLINE,
+    DOMAIN,
+    EVENT_SIGNAL_FCRD,
+    FCRD_TIMELINE_SIZE,
+    GRID_PEAK_TOP_N,
+    HANDOFF_TIMEOUT,
+    INTEGRATION_NAME,
+    REVENUE_RECONCILE_HOUR,
+    SERIES_SIZE,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    UPDATE_DEADLINE_GRACE,
+)
+from .energyvalue import EnergyValueTracker
+from .faults import FaultInjector
+from .forecast import forecast_month
+from .peak import GridPeakTracker
+from .periods import EnergyPeriodCounters
+from .revenue import RevenueLedger
+from .series import PowerSeries
+from .spotprice import SpotPriceIndex
+from .timeline import FCRDTimeline
+
+_LOGGER = logging.getLogger(__name__)
+
+CHECKWATTRANK_REPORTER = "HomeAssistantV2"
+
+# Energy totals of the meters, in Wh
+ENERGY_TOTALS = [
+    "total_solar_energy",
+    "total_charging_energy",
+    "total_discharging_energy",
+    "total_import_energy",
+    "total_export_energy",
+]
+
+
+@dataclass
+class CheckwattHandoff:
+    """Logged in session handed from the config flow to the coordinator."""
+
+    cw_inst: CheckwattManager
+    stack: AsyncExitStack
+    energy_provider: str | None
+    cancel_expiry: CALLBACK_TYPE | None = None
+
+
+@callback
+def async_store_handoff(
+    hass: HomeAssistant, username: str, handoff: CheckwattHandoff
+) -> None:
+    """Park a validated session until the new entry claims it."""
+    handoffs: dict[str, CheckwattHandoff] = hass.data.setdefault(DATA_HANDOFF, {})
+    if (previous := handoffs.pop(username, None)) is not None:
+        _async_discard_handoff(hass, previous)
+
+    async def _async_expire(_now) -> None:
+        """Close the session if no entry claimed it."""
+        if handoffs.get(username) is handoff:
+            _LOGGER.debug("Discarding unclaimed session")
+            del handoffs[username]
+            await handoff.stack.aclose()
+
+    handoff.cancel_expiry = async_call_later(hass, HANDOFF_TIMEOUT, _async_expire)
+    handoffs[username] = handoff
+
+
+@callback
+def async_pop_handoff(hass: HomeAssistant, username: str) -> CheckwattHandoff | None:
+    """Claim the session parked by the config flow, if any."""
+    handoff: CheckwattHandoff | None = hass.data.get(DATA_HANDOFF, {}).pop(
+        username, None
+    )
+    if handoff is not None and handoff.cancel_expiry is not None:
+        handoff.cancel_expiry()
+        handoff.cancel_expiry = None
+    return handoff
+
+
+@callback
+def _async_discard_handoff(hass: HomeAssistant, handoff: CheckwattHandoff) -> None:
+    """Close a parked session that will not be claimed."""
+    if handoff.cancel_expiry is not None:
+        handoff.cancel_expiry()
+    hass.async_create_task(handoff.stack.aclose())
+
+
+def _account_key(entry: ConfigEntry) -> str:
+    """Return the key of the EnergyInBalance account of an entry."""
+    return entry.data[CONF_USERNAME].casefold()
+
+
+def account_storage_key(entry: ConfigEntry) -> str:
+    """Return the key of the locally aggregated data of the account of an entry."""
+    return f"{STORAGE_KEY}.{slugify(_account_key(entry))}"
+
+
+async def async_attach_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> CheckwattCoordinator:
+    """Return the coordinator of the account of an entry, starting it if required.
+
+    Entries of the same account share one coordinator, fetching the data for
+    the union of their options.
+    """
+    accounts: dict[str, CheckwattCoordinator] = hass.data.setdefault(DATA_ACCOUNTS, {})
+    key = _account_key(entry)
+    if (coordinator := accounts.get(key)) is None:
+        coordinator = accounts[key] = CheckwattCoordinator(hass, entry)
+        shared = False
+    else:
+        _LOGGER.debug("Sharing the coordinator of %s", coordinator.entries[0].title)
+        coordinator.entries.append(entry)
+        shared = True
+        if (handoff := async_pop_handoff(hass, entry.data[CONF_USERNAME])) is not None:
+            _async_discard_handoff(hass, handoff)
+
+    try:
+        await coordinator.async_setup()
+    except Exception:
+        await async_detach_coordinator(hass, entry)
+        raise
+
+    # A shared coordinator fetches the data of the added options right away
+    await coordinator.async_options_updated(refresh=shared)
+    return coordinator
+
+
+async def async_detach_coordinator(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Detach an entry, stopping the coordinator of its account with the last."""
+    accounts: dict[str, CheckwattCoordinator] = hass.data[DATA_ACCOUNTS]
+    key = _account_key(entry)
+    coordinator = accounts[key]
+    coordinator.entries.remove(entry)
+    if coordinator.entries:
+        coordinator.async_bind_entries()
+        await coordinator.async_options_updated(refresh=False)
+        return
+
+    del accounts[key]
+    await coordinator.async_unload()
+
+
+def _merge_options(entries: list[ConfigEntry]) -> dict[str, Any]:
+    """Return the union of the options of the entries of an account."""
+    options = dict(entries[0].options)
+    for key in (
+        CONF_POWER_SENSORS,
+        CONF_CM10_SENSOR,
+        CONF_FCRD_WATCHER,
+        CONF_PUSH_CW_TO_RANK,
+    ):
+        options[key] = any(entry.options.get(key) for entry in entries)
+    options[CONF_UPDATE_DEADLINE] = max(
+        entry.options.get(CONF_UPDATE_DEADLINE, DEFAULT_UPDATE_DEADLINE)
+        for entry in entries
+    )
+    # Push to CheckWattRank under the name of the first entry asking for it
+    for entry in entries:
+        if entry.options.get(CONF_PUSH_CW_TO_RANK):
+            options[CONF_CWR_NAME] = entry.options.get(CONF_CWR_NAME)
+            break
+    return options
+
+
+class CheckwattResp(TypedDict):
+    """API response."""
+
+    id: str
+    firstname: str
+    lastname: str
+    address: str
+    zip: str
+    city: str
+    display_name: str
+    dso: str
+    energy_provider: str
+
+    battery_power: float
+    grid_power: float
+    solar_power: float
+    battery_soc: float
+    charge_peak_ac: float
+    charge_peak_dc: float
+    discharge_peak_ac: float
+    discharge_peak_dc: float
+    monthly_grid_peak_power: float
+    grid_peak_hour_average: float
+    grid_peak_top: list[float]
+    grid_peak_top_average: float
+    battery_equivalent_full_cycles: float
+    battery_dod_distribution: dict[str, float]
+    battery_throughput_today: float
+
+    today_net_revenue: float
+    tomorrow_net_revenue: float
+    monthly_net_revenue: float
+    annual_net_revenue: float
+    month_estimate: float
+    month_estimate_low: float
+    month_estimate_high: float
+    daily_average: float
+
+    update_time: str
+    next_update_time: str
+
+    total_solar_energy: float
+    total_charging_energy: float
+    total_discharging_energy: float
+    total_import_energy: float
+    total_export_energy: float
+    import_cost_today: float
+    export_value_today: float
+    import_cost_month: float
+    export_value_month: float
+    energy_periods: dict[str, dict[str, float]]
+    spot_price: float
+    spot_price_resolution: int
+    cheapest_hour: str
+    most_expensive_hour: str
+    price_zone: str
+
+    cm10_status: str
+    cm10_version: str
+    fcr_d_status: str
+    fcr_d_info: str
+    fcr_d_date: str
+    fcrd_time_in_state: dict[str, float]
+    fcrd_activations: int
+    fcrd_failed_activation_rate: float
+    fcrd_mean_time_to_reactivation: float
+    reseller_id: int
+
+
+async def push_to_checkwatt_rank(
+    cw_inst, cwr_name, today_net_income, rank_factory=CheckWattRankManager
+):
+    """Push data to CheckWattRank."""
+    if cw_inst.fcrd_today_net_revenue is not None:
+        energy_provider = await cw_inst.get_energy_trading_company(
+            cw_inst.energy_provider_id
+        )
+        async with rank_factory() as cwr:
+            dso = ""
+            if cw_inst.battery_registration is not None:
+                if "Dso" in cw_inst.battery_registration:
+                    dso = cw_inst.battery_registration["Dso"]
+            if await cwr.push_to_checkwatt_rank(
+                display_name=(cwr_name if cwr_name != "" else cw_inst.display_name),
+                dso=dso,
+                electricity_company=energy_provider,
+                electricity_area=cw_inst.price_zone,
+                installed_power=min(
+                    cw_inst.battery_charge_peak_ac, cw_inst.battery_discharge_peak_ac
+                ),
+                today_net_income=today_net_income,
+                reseller_id=cw_inst.reseller_id,
+                reporter=CHECKWATTRANK_REPORTER,
+            ):
+                return True
+    return False
+
+
+class CheckwattSession:
+    """Logged in EnergyInBalance session shared by the coordinators of an entry.
+
+    The session is kept between cycles. The API does not tell an expired
+    token apart from other errors, so a failed call makes the next user of the
+    session log in again.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, claim_handoff: bool = True
+    ) -> None:
+        """Initialize the session, claiming the one of the config flow."""
+        # Entry holding the credentials, the first attached of the account
+        self.entry = entry
+        self._lock = asyncio.Lock()
+        self._stack: AsyncExitStack | None = None
+        self._logged_in = False
+        self.cw_inst: CheckwattManager | None = None
+        self.energy_provider: str | None = None
+        self.factory: Callable[..., CheckwattManager] = CheckwattManager
+        self._handoff = (
+            async_pop_handoff(hass, entry.data.get(CONF_USERNAME))
+            if claim_handoff
+            else None
+        )
+
+    async def async_get(self) -> CheckwattManager:
+        """Return the logged in manager, logging in if required."""
+        async with self._lock:
+            if self.cw_inst is None:
+                handoff, self._handoff = self._handoff, None
+                if handoff is not None:
+                    # Start warm on the session validated by the config flow
+                    _LOGGER.debug("Using session handed over by the config flow")
+                    self._stack = handoff.stack
+                    self.cw_inst = handoff.cw_inst
+                    self.energy_provider = handoff.energy_provider
+                    self._logged_in = True
+                else:
+                    self._stack = AsyncExitStack()
+                    self.cw_inst = await self._stack.enter_async_context(
+                        self.factory(
+                            self.entry.data.get(CONF_USERNAME),
+                            self.entry.data.get(CONF_PASSWORD),
+                            INTEGRATION_NAME,
+                        )
+                    )
+
+            cw_inst = self.cw_inst
+            if not self._logged_in:
+                if not await cw_inst.login():
+                    _LOGGER.error("Failed to login, abort update")
+                    raise UpdateFailed("Failed to login")
+
+                if not await cw_inst.get_customer_details():
+                    _LOGGER.error("Failed to obtain customer details, abort update")
+                    raise UpdateFailed("Unknown error get_customer_details")
+
+                if self.energy_provider is None:
+                    self.energy_provider = await cw_inst.get_energy_trading_company(
+                        cw_inst.energy_provider_id
+                    )
+                self._logged_in = True
+
+            return cw_inst
+
+    @callback
+    def async_expire(self) -> None:
+        """Log in again before the next call."""
+        self._logged_in = False
+
+    async def async_close(self) -> None:
+        """Close the session."""
+        self.cw_inst = None
+        self._logged_in = False
+        if self._stack is not None:
+            stack, self._stack = self._stack, None
+            await stack.aclose()
+
+
+class CheckwattDataCoordinator(DataUpdateCoordinator[CheckwattResp], ABC):
+    """Base of the coordinators sharing the session of an entry.
+
+    A cycle runs within the time budget of the entry and its endpoints are
+    called through circuit breakers, serving their last good data on failure.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        hub: CheckwattCoordinator | None,
+        session: CheckwattSession,
+        name: str,
+        update_interval: timedelta,
+        always_update: bool = True,
+    ) -> None:
+        """Initialize the coordinator."""
+        # The coordinators outlive the entry set up first when the account has
+        # several entries, so the base class must not bind them to that one.
+        # They are bound to the first attached entry instead.
+        token = current_entry.set(None)
+        try:
+            super().__init__(
+                hass,
+                _LOGGER,
+                name=f"{DOMAIN}_{name}",
+                update_interval=update_interval,
+                always_update=always_update,
+            )
+        finally:
+            current_entry.reset(token)
+        self.config_entry = entry
+        self.hub = hub if hub is not None else self
+        self.session = session
+        self.short_name = name
+        self.wanted: list[str] = []
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._last_good: dict[str, dict[str, Any]] = {}
+        self._cycle_lock = asyncio.Lock()
+        self._deadline = 0.0
+        self.last_cycle_duration: float | None = None
+        self.missed_calls = 0
+        self.overrun_cycles = 0
+        self.skipped_cycles = 0
+
+    @property
+    def entry_id(self) -> str:
+        """Return entry ID."""
+        return self.config_entry.entry_id
+
+    @property
+    def options(self) -> dict[str, Any]:
+        """Return the options the data is fetched for."""
+        return _merge_options(self.hub.entries)
+
+    async def _async_update_data(self) -> CheckwattResp:
+        """Fetch the latest data within the time budget of a cycle."""
+        if self._cycle_lock.locked():
+            # A manual refresh raced the scheduled one, do not queue up
+            self.skipped_cycles += 1
+            _LOGGER.debug("Update cycle of %s already running, skipping", self.name)
+            if self.data is None:
+                raise UpdateFailed("Update cycle already running")
+            return self.data
+
+        async with self._cycle_lock:
+            budget = self.options.get(CONF_UPDATE_DEADLINE, DEFAULT_UPDATE_DEADLINE)
+            start = self.hass.loop.time()
+            self._deadline = start + budget
+            try:
+                # Calls through _async_call are cut at the deadline, the grace
+                # period bounds the others before the cycle is abandoned
+                async with asyncio.timeout_at(self._deadline + UPDATE_DEADLINE_GRACE):
+                    cw_inst = await self.session.async_get()
+                    resp = self._identity(cw_inst)
+                    await self._async_fetch(cw_inst, resp)
+            except TimeoutError as err:
+                self.overrun_cycles += 1
+                self.last_cycle_duration = self.hass.loop.time() - start
+                raise UpdateFailed("Update cycle exceeded its deadline") from err
+            except InvalidAuth as err:
+                raise ConfigEntryAuthFailed from err
+            except CheckwattError as err:
+                raise UpdateFailed(str(err)) from err
+
+            self.last_cycle_duration = self.hass.loop.time() - start
+            if self.last_cycle_duration > budget:
+                self.overrun_cycles += 1
+
+        return resp
+
+    @abstractmethod
+    async def _async_fetch(
+        self, cw_inst: CheckwattManager, resp: CheckwattResp
+    ) -> None:
+        """Fetch the data of the coordinator into resp."""
+
+    def _identity(self, cw_inst: CheckwattManager) -> CheckwattResp:
+        """Return the customer data shared by all coordinators."""
+        resp: CheckwattResp = {
+            "id": cw_inst.customer_details["Id"],
+            "firstname": cw_inst.customer_details["FirstName"],
+            "lastname": cw_inst.customer_details["LastName"],
+            "address": cw_inst.customer_details["StreetAddress"],
+            "zip": cw_inst.customer_details["ZipCode"],
+            "city": cw_inst.customer_details["City"],
+            "display_name": cw_inst.display_name,
+            "energy_provider": self.session.energy_provider,
+            "reseller_id": cw_inst.reseller_id,
+        }
+        if cw_inst.battery_registration is not None:
+            if "Dso" in cw_inst.battery_registration:
+                resp["dso"] = cw_inst.battery_registration["Dso"]
+        return resp
+
+    async def _async_call(
+        self, name: str, call, valid: Callable[[], bool] | None = None
+    ) -> bool:
+        """Call an endpoint through its circuit breaker.
+
+        A payload rejected by valid counts as a failure of the endpoint.
+        """
+        if (breaker := self._breakers.get(name)) is None:
+            breaker = self._breakers[name] = CircuitBreaker(
+                BREAKER_FAILURE_THRESHOLD,
+                BREAKER_RESET_TIMEOUT,
+                BREAKER_RESET_TIMEOUT_MAX,
+            )
+
+        now = dt_util.utcnow()
+        if not breaker.allow_request(now):
+            _LOGGER.debug("Circuit breaker of %s is open, skipping", name)
+            return False
+
+        faults = self.hub.faults
+        remaining = self._deadline - self.hass.loop.time()
+        try:
+            if remaining <= 0:
+                raise TimeoutError
+            async with asyncio.timeout(remaining):
+                if faults is None:
+                    success = await call()
+                else:
+                    success = await faults.async_call(name, call, self.session)
+        except TimeoutError:
+            self.missed_calls += 1
+            _LOGGER.warning("Fetching %s missed the deadline, serving last good", name)
+            breaker.record_failure(now)
+            if faults is not None:
+                faults.record_result(name, False, now)
+            return False
+
+        if success and valid is not None and not valid():
+            _LOGGER.warning("Malformed %s payload, serving last good value", name)
+            breaker.record_failure(now)
+            if faults is not None:
+                faults.record_result(name, False, now)
+            return False
+
+        if faults is not None:
+            faults.record_result(name, success, now)
+
+        if success:
+            breaker.record_success(now)
+            return True
+
+        _LOGGER.warning("Failed to fetch %s, serving last good value", name)
+        breaker.record_failure(now)
+        self.session.async_expire()
+        return False
+
+    @callback
+    def _async_serve(
+        self, resp: CheckwattResp, name: str, fresh: dict[str, Any] | None
+    ) -> None:
+        """Add the data of an endpoint to resp, falling back to its last good."""
+        if fresh is not None:
+            self._last_good[name] = fresh
+        resp.update(self._last_good.get(name, {}))
+
+    @property
+    def stale_endpoints(self) -> dict[str, int | None]:
+        """Return the age in seconds of the data of failing endpoints."""
+        now = dt_util.utcnow()
+        stale: dict[str, int | None] = {}
+        for name in self.wanted:
+            breaker = self._breakers.get(name)
+            if breaker is None or breaker.failures == 0:
+                continue
+            stale[name] = None
+            if breaker.last_success is not None:
+                stale[name] = int((now - breaker.last_success).total_seconds())
+        return stale
+
+
+class CheckwattCoordinator(CheckwattDataCoordinator):
+    """Coordinator of the live power data, owning the state of an account.
+
+    The revenue, the spot prices and the device status are updated by
+    coordinators of their own, at their own pace. They share the session and
+    the local storage of this coordinator, and entities only listen to the
+    coordinator of the data they display.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, replay: bool = False
+    ) -> None:
+        """Initialize the coordinator, a replay one keeps no local data."""
+        super().__init__(
+            hass,
+            entry,
+            None,
+            # A replay must leave the session of the config flow to the entry
+            CheckwattSession(hass, entry, claim_handoff=not replay),
+            "live",
+            timedelta(minutes=CONF_UPDATE_INTERVAL_ALL),
+        )
+        self.entries: list[ConfigEntry] = [entry]
+        self.faults: FaultInjector | None = None
+        self.capture: CaptureRecorder | None = None
+        self.rank_factory: Callable[[], CheckWattRankManager] = CheckWattRankManager
+        self.replay = replay
+        self._setup_lock = asyncio.Lock()
+        self._setup_done = False
+        self.last_cw_rank_push: datetime | None = None
+        self._unsub_cwr_push: CALLBACK_TYPE | None = None
+        self.random_offset = random.randint(0, 14)
+        self.monthly_grid_peak_power = None
+        self._peaks = GridPeakTracker(GRID_PEAK_TOP_N)
+        self._energy_value = EnergyValueTracker()
+        self._energy_periods = EnergyPeriodCounters()
+        self._battery = BatteryCycleCounter()
+        # Recent samples for charts, kept in memory only
+        self.series = PowerSeries(SERIES_SIZE)
+        # Stored per account, as the entries of an account share the data
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, account_storage_key(entry)
+        )
+        self.device = CheckwattDeviceCoordinator(hass, entry, self)
+        self.revenue = CheckwattRevenueCoordinator(hass, entry, self)
+        self.spot = CheckwattSpotPriceCoordinator(hass, entry, self)
+        self.coordinators: list[CheckwattDataCoordinator] = [
+            self,
+            self.device,
+            self.revenue,
+            self.spot,
+        ]
+        self.fcrd_watcher = CheckwattFCRDWatcher(hass, self.device)
+        # Platforms adding the entities of the account, by entry, and the
+        # entry they are added through
+        self._account_platforms: dict[str, dict[str, CALLBACK_TYPE]] = {}
+        self._account_owners: dict[str, str] = {}
+
+    async def async_setup(self) -> None:
+        """Restore the local data and run the first refresh of the coordinators."""
+        async with self._setup_lock:
+            if self._setup_done:
+                return
+            await self._async_load()
+            try:
+                for coordinator in self.coordinators:
+                    await coordinator.async_config_entry_first_refresh()
+            except Exception:
+                await self.session.async_close()
+                raise
+            self._setup_done = True
+
+    @callback
+    def async_add_account_entities(
+        self, platform: str, entry_id: str, async_add_entities: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Add the entities of the account of a platform through one entry.
+
+        The entities of the account are added through the first entry and
+        moved to another entry when that one is unloaded. Return the callback
+        removing the entry.
+        """
+        self._account_platforms.setdefault(platform, {})[entry_id] = async_add_entities
+        self._async_assign_account_entities(platform)
+        return partial(self._async_remove_account_entities, platform, entry_id)
+
+    @callback
+    def _async_remove_account_entities(self, platform: str, entry_id: str) -> None:
+        """Move the entities of the account away from an unloaded entry."""
+        del self._account_platforms[platform][entry_id]
+        if self._account_owners.get(platform) == entry_id:
+            # The entities were removed with the platform of the entry
+            del self._account_owners[platform]
+            self._async_assign_account_entities(platform)
+
+    @callback
+    def _async_assign_account_entities(self, platform: str) -> None:
+        """Add the entities of the account through an entry if none has."""
+        adders = self._account_platforms[platform]
+        if platform in self._account_owners or not adders:
+            return
+        entry_id, async_add_entities = next(iter(adders.items()))
+        _LOGGER.debug(
+            "Adding the %s entities of the account through %s", platform, entry_id
+        )
+        self._account_owners[platform] = entry_id
+        async_add_entities()
+
+    @callback
+    def async_bind_entries(self) -> None:
+        """Bind the coordinators and the session to the first attached entry."""
+        entry = self.entries[0]
+        self.session.entry = entry
+        for coordinator in self.coordinators:
+            coordinator.config_entry = entry
+
+    async def async_unload(self) -> None:
+        """Stop the background work, close the session and store the data."""
+        for coordinator in self.coordinators:
+            await coordinator.async_shutdown()
+        self.fcrd_watcher.async_stop()
+        self.async_cancel_cwr_push()
+        await self.session.async_close()
+        # Write the pending data for the next setup of the entry to restore
+        await self._store.async_save(self._data_to_store())
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the health of the update cycles of all coordinators."""
+        stale: dict[str, int | None] = {}
+        for coordinator in self.coordinators:
+            stale.update(coordinator.stale_endpoints)
+        return {
+            "stale_endpoints": stale,
+            "cycle_duration": {
+                coordinator.short_name: round(coordinator.last_cycle_duration, 2)
+                for coordinator in self.coordinators
+                if coordinator.last_cycle_duration is not None
+            },
+            "missed_calls": sum(c.missed_calls for c in self.coordinators),
+            "overrun_cycles": sum(c.overrun_cycles for c in self.coordinators),
+            "skipped_cycles": sum(c.skipped_cycles for c in self.coordinators),
+        }
+
+    async def _async_fetch(
+        self, cw_inst: CheckwattManager, resp: CheckwattResp
+    ) -> None:
+        """Fetch the live power data."""
+        use_power_sensors = self.options.get(CONF_POWER_SENSORS)
+        self.wanted = ["energy_flow", "month_peak"]
+        if use_power_sensors:
+            self.wanted.append("power_data")
+
+        now = dt_util.now()
+        if await self._async_call(
+            "energy_flow",
+            cw_inst.get_energy_flow,
+            lambda: "GridNow" in (cw_inst.energy_data or {}),
+        ):
+            # Track the monthly peak from the live grid power samples
+            if cw_inst.grid_power is not None:
+                if self._peaks.add_sample(now, cw_inst.grid_power):
+                    self.async_schedule_save()
+                self.monthly_grid_peak_power = self._peaks.monthly_peak
+
+            if self._battery.add_sample(
+                now, cw_inst.battery_soc, cw_inst.battery_power
+            ):
+                self.async_schedule_save()
+
+            if cw_inst.energy_data is not None:
+                flow = {
+                    "battery_power": cw_inst.battery_power,
+                    "grid_power": cw_inst.grid_power,
+                    "solar_power": cw_inst.solar_power,
+                    "battery_soc": cw_inst.battery_soc,
+                }
+                self.series.add(now, flow)
+                self._async_serve(
+                    resp,
+                    "energy_flow",
+                    {
+                        **flow,
+                        "charge_peak_ac": cw_inst.battery_charge_peak_ac,
+                        "charge_peak_dc": cw_inst.battery_charge_peak_dc,
+                        "discharge_peak_ac": cw_inst.battery_discharge_peak_ac,
+                        "discharge_peak_dc": cw_inst.battery_discharge_peak_dc,
+                    },
+                )
+        if "grid_power" not in resp:
+            self._async_serve(resp, "energy_flow", None)
+
+        # Raise the peak to the one of EnergyInBalance once a day, the first
+        # cycle is left out to keep the start fast
+        if self.data is not None and self._peaks.needs_reconcile(now.date()):
+            _LOGGER.debug("Fetching montly peak power")
+            if await self._async_call(
+                "month_peak", cw_inst.get_battery_month_peak_effect
+            ):
+                self._peaks.reconcile(now.date(), cw_inst.month_peak_effect)
+                self.monthly_grid_peak_power = self._peaks.monthly_peak
+                self.async_schedule_save()
+
+        if "grid_power" in resp:
+            resp["monthly_grid_peak_power"] = self.monthly_grid_peak_power
+            resp["grid_peak_hour_average"] = self._peaks.hour_average
+            resp["grid_peak_top"] = self._peaks.top_peaks
+            resp["grid_peak_top_average"] = self._peaks.top_peaks_average
+            resp["battery_equivalent_full_cycles"] = (
+                self._battery.equivalent_full_cycles
+            )
+            resp["battery_dod_distribution"] = self._battery.dod_distribution
+            resp["battery_throughput_today"] = self._battery.throughput_today
+
+        if use_power_sensors:
+            fresh = None
+            if await self._async_call(
+                "power_data",
+                cw_inst.get_power_data,
+                lambda: "Meters" in (cw_inst.power_data or {}),
+            ):
+                fresh = {key: getattr(cw_inst, key) for key in ENERGY_TOTALS}
+                # Price the energy since the last cycle at the indexed price
+                index = self.spot.spot_price_index
+                if self._energy_value.add(
+                    now,
+                    fresh["total_import_energy"],
+                    fresh["total_export_energy"],
+                    index.price_at(now) if index is not None else None,
+                ):
+                    self.async_schedule_save()
+            self._async_serve(resp, "power_data", fresh)
+            if "total_import_energy" in resp:
+                self._energy_value.roll_over(now.date())
+                resp["import_cost_today"] = self._energy_value.import_cost_today
+                resp["export_value_today"] = self._energy_value.export_value_today
+                resp["import_cost_month"] = self._energy_value.import_cost_month
+                resp["export_value_month"] = self._energy_value.export_value_month
+
+                resp["energy_periods"], rebased = self._energy_periods.update(
+                    now, {key: resp[key] for key in ENERGY_TOTALS}
+                )
+                if rebased:
+                    self.async_schedule_save()
+
+    @callback
+    def async_start_capture(self) -> None:
+        """Start recording the calls to the APIs."""
+        if self.capture is not None:
+            return
+
+        _LOGGER.debug("Starting capture of the API calls")
+        self.capture = CaptureRecorder()
+        self.session.factory = self.capture.factory(CheckwattManager, MANAGER_CHECKWATT)
+        self.rank_factory = self.capture.factory(CheckWattRankManager, MANAGER_RANK)
+        if self.session.cw_inst is not None:
+            self.capture.instrument(self.session.cw_inst, MANAGER_CHECKWATT)
+        # Capture the login too, for the replay to start from it
+        self.session.async_expire()
+
+    async def async_stop_capture(self) -> dict[str, Any] | None:
+        """Stop recording and write the capture, return where to."""
+        if (capture := self.capture) is None:
+            return None
+
+        self.capture = None
+        self.session.factory = CheckwattManager
+        self.rank_factory = CheckWattRankManager
+        capture.release()
+        path = self.hass.config.path(
+            f"{DOMAIN}_capture_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz"
+        )
+        await self.hass.async_add_executor_job(capture.write, path)
+        _LOGGER.debug("Wrote %d API calls to %s", len(capture.records), path)
+        return {"path": path, "records": len(capture.records)}
+
+    async def async_options_updated(self, refresh: bool = True) -> None:
+        """Apply the options in place, keeping the session and caches warm."""
+        if self.options.get(CONF_FCRD_WATCHER):
+            self.fcrd_watcher.async_start()
+        else:
+            self.fcrd_watcher.async_stop()
+
+        if self.options.get(CONF_PUSH_CW_TO_RANK):
+            if self._unsub_cwr_push is None:
+                self._async_plan_cwr_push()
+        else:
+            self.async_cancel_cwr_push()
+
+        if refresh:
+            # Let the platforms drop entities of disabled options before the
+            # data they display goes away, then fetch for the enabled ones
+            for coordinator in self.coordinators:
+                coordinator.async_update_listeners()
+            for coordinator in self.coordinators:
+                await coordinator.async_refresh()
+
+    async def _async_load(self) -> None:
+        """Restore the locally aggregated data."""
+        if (stored := await self._store.async_load()) is not None:
+            self.revenue.ledger = RevenueLedger.from_dict(stored.get("revenue", {}))
+            self._peaks = GridPeakTracker.from_dict(
+                GRID_PEAK_TOP_N, stored.get("peak", {})
+            )
+            if last_push := stored.get("checkwatt_rank", {}).get("last_push"):
+                self.last_cw_rank_push = dt_util.parse_datetime(last_push)
+            backfill = stored.get("backfill", {})
+            if last_success := backfill.get("last_success"):
+                self.revenue.last_success = dt_util.parse_datetime(last_success)
+            if backfill_from := backfill.get("from"):
+                self.revenue.backfill_from = date.fromisoformat(backfill_from)
+            self._energy_value = EnergyValueTracker.from_dict(
+                stored.get("energy_value", {})
+            )
+            self._energy_periods = EnergyPeriodCounters.from_dict(
+                stored.get("energy_periods", {})
+            )
+            self._battery = BatteryCycleCounter.from_dict(stored.get("battery", {}))
+            fcrd = stored.get("fcrd", {})
+            self.device.fcrd_state = fcrd.get("state")
+            self.device.fcrd_info = fcrd.get("info")
+            self.device.fcrd_timestamp = fcrd.get("date")
+            self.device.timeline = FCRDTimeline.from_dict(
+                FCRD_TIMELINE_SIZE, stored.get("fcrd_timeline", {})
+            )
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule storing the locally aggregated data."""
+        if self.replay:
+            return
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the locally aggregated data to store."""
+        last_push = self.last_cw_rank_push
+        last_success = self.revenue.last_success
+        backfill_from = self.revenue.backfill_from
+        return {
+            "revenue": self.revenue.ledger.as_dict(),
+            "peak": self._peaks.as_dict(),
+            "energy_value": self._energy_value.as_dict(),
+            "energy_periods": self._energy_periods.as_dict(),
+            "battery": self._battery.as_dict(),
+            "checkwatt_rank": {
+                "last_push": last_push.isoformat() if last_push else None
+            },
+            "backfill": {
+                "last_success": last_success.isoformat() if last_success else None,
+                "from": backfill_from.isoformat() if backfill_from else None,
+            },
+            "fcrd": {
+                "state": self.device.fcrd_state,
+                "info": self.device.fcrd_info,
+                "date": self.device.fcrd_timestamp,
+            },
+            "fcrd_timeline": self.device.timeline.as_dict(),
+        }
+
+    async def async_push_checkwatt_rank(self) -> str:
+        """Push today's revenue to CheckWattRank, return the status."""
+        username = self.session.entry.data.get(CONF_USERNAME)
+        password = self.session.entry.data.get(CONF_PASSWORD)
+        cwr_name = self.options.get(CONF_CWR_NAME)
+        async with self.session.factory(
+            username, password, INTEGRATION_NAME
+        ) as cw_inst:
+            try:
+                # Login to EnergyInBalance
+                if not await cw_inst.login():
+                    return "Failed to login."
+
+                if not await cw_inst.get_customer_details():
+                    _LOGGER.error("Failed to fetch customer details")
+                    return "Failed to fetch customer details"
+
+                if not await cw_inst.get_price_zone():
+                    _LOGGER.error("Failed to fetch prize zone")
+                    return "Failed to fetch prize zone"
+
+                if not await cw_inst.get_fcrd_today_net_revenue():
+                    _LOGGER.error("Failed to fetch revenue")
+                    return "Failed to fetch revenue"
+
+                _LOGGER.debug("Pushing to CheckWattRank")
+                if not await push_to_checkwatt_rank(
+                    cw_inst,
+                    cwr_name,
+                    cw_inst.fcrd_today_net_revenue,
+                    self.rank_factory,
+                ):
+                    return "Failed to update to CheckWattRank"
+
+            except InvalidAuth as err:
+                raise ConfigEntryAuthFailed from err
+
+            except CheckwattError as err:
+                return f"Failed to update CheckWattRank: {err}"
+
+        self.last_cw_rank_push = dt_util.now()
+        self.async_schedule_save()
+        return "Data successfully sent to CheckWattRank"
+
+    def _cwr_pushed_today(self, now: datetime) -> bool:
+        """Return True if today's revenue has been pushed to CheckWattRank."""
+        return (
+            self.last_cw_rank_push is not None
+            and dt_util.as_local(self.last_cw_rank_push).date() == now.date()
+        )
+
+    @callback
+    def _async_plan_cwr_push(self, retry: bool = False) -> None:
+        """Schedule the next daily push to CheckWattRank."""
+        now = dt_util.now()
+        # Wait until 11am + 0-14 min to spread the load on CheckWattRank
+        due = now.replace(hour=11, minute=self.random_offset, second=0, microsecond=0)
+        if self._cwr_pushed_today(now):
+            due = (now + timedelta(days=1)).replace(
+                hour=11, minute=self.random_offset, second=0, microsecond=0
+            )
+        elif due <= now:
+            # Catch up on a missed push, or retry a failed one later
+            due = now + timedelta(minutes=CWR_PUSH_RETRY if retry else 0)
+
+        _LOGGER.debug("Next push to CheckWattRank at %s", due)
+        self.async_cancel_cwr_push()
+        self._unsub_cwr_push = async_track_point_in_time(
+            self.hass, self._async_cwr_push_due, due
+        )
+
+    @callback
+    def async_cancel_cwr_push(self) -> None:
+        """Cancel the scheduled push to CheckWattRank."""
+        if self._unsub_cwr_push is not None:
+            self._unsub_cwr_push()
+            self._unsub_cwr_push = None
+
+    @callback
+    def _async_cwr_push_due(self, _now: datetime) -> None:
+        """Start the due push to CheckWattRank outside the update cycle."""
+        self._unsub_cwr_push = None
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_scheduled_cwr_push(), f"{DOMAIN} CheckWattRank push"
+        )
+
+    async def _async_scheduled_cwr_push(self) -> None:
+        """Push to CheckWattRank and schedule the next push."""
+        if not self._cwr_pushed_today(dt_util.now()):
+            status = await self.async_push_checkwatt_rank()
+            _LOGGER.debug("Scheduled push to CheckWattRank: %s", status)
+
+        if self.options.get(CONF_PUSH_CW_TO_RANK):
+            self._async_plan_cwr_push(retry=True)
+
+
+class CheckwattRevenueCoordinator(CheckwattDataCoordinator):
+    """Coordinator of the FCR-D net revenue, updated every 15 minutes."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, hub: CheckwattCoordinator
+    ) -> None:
+        """Initialize the coordinator."""
+        # The revenue is first fetched a minute after boot to keep the start
+        # fast, the interval is raised after that
+        super().__init__(
+            hass,
+            entry,
+            hub,
+            hub.session,
+            "revenue",
+            timedelta(minutes=CONF_UPDATE_INTERVAL_ALL),
+        )
+        self.is_boot = True
+        self.ledger = RevenueLedger()
+        self.fcrd_today_net_revenue = None
+        self.fcrd_tomorrow_net_revenue = None
+        self.fcrd_month_net_revenue = None
+        self.fcrd_month_net_estimate = None
+        self.fcrd_daily_net_average = None
+        self.fcrd_year_net_revenue = None
+        self.last_success: datetime | None = None
+        self.backfill_from: date | None = None
+
+    async def _async_fetch(
+        self, cw_inst: CheckwattManager, resp: CheckwattResp
+    ) -> None:
+        """Fetch the net revenue."""
+        self.wanted = ["revenue"]
+        if self.is_boot:
+            self.is_boot = False
+        else:
+            self.update_interval = timedelta(minutes=CONF_UPDATE_INTERVAL_MONETARY)
+            _LOGGER.debug("Fetching daily revenue")
+            if await self._async_call("revenue", cw_inst.get_fcrd_today_net_revenue):
+                now = dt_util.now()
+                # The last revenue seen of a day is final once the day has passed
+                last_day, last_revenue = self.ledger.day, self.ledger.today
+                if self.ledger.needs_reconcile(
+                    now.date(), now.hour, REVENUE_RECONCILE_HOUR
+                ):
+                    await self._async_reconcile_revenue(cw_inst, now.date())
+
+                self.ledger.update_today(
+                    now.date(),
+                    cw_inst.fcrd_today_net_revenue,
+                    cw_inst.fcrd_tomorrow_net_revenue,
+                )
+
+                # Days that settled since the last successful cycle go to the
+                # statistics. The last revenue seen is only taken as final when
+                # it was seen right before midnight, else the days are fetched
+                if self.last_success is not None:
+                    last_success = dt_util.as_local(self.last_success)
+                    last_success_day = last_success.date()
+                    if last_success_day < now.date():
+                        end_of_day = dt_util.start_of_local_day(
+                            last_success_day + timedelta(days=1)
+                        )
+                        if (
+                            now.date() - last_success_day == timedelta(days=1)
+                            and last_day == last_success_day
+                            and last_revenue is not None
+                            and end_of_day - last_success
+                            <= timedelta(minutes=CONF_UPDATE_INTERVAL_MONETARY)
+                        ):
+                            await self._async_import_revenue(
+                                cw_inst, {last_day.isoformat(): last_revenue}
+                            )
+                        else:
+                            self.backfill_from = min(
+                                self.backfill_from or last_success_day,
+                                last_success_day,
+                            )
+                self.last_success = now
+                if self.backfill_from is not None and await self._async_backfill(
+                    cw_inst, self.backfill_from, now.date()
+                ):
+                    self.backfill_from = None
+                self.hub.async_schedule_save()
+
+                self.fcrd_today_net_revenue = self.ledger.today
+                self.fcrd_tomorrow_net_revenue = self.ledger.tomorrow
+                self.fcrd_month_net_revenue = self.ledger.monthly
+                self.fcrd_year_net_revenue = self.ledger.annual
+
+        # Use self stored variant of revenue parameters as they are not always fetched
+        if self.fcrd_today_net_revenue is not None:
+            resp["today_net_revenue"] = self.fcrd_today_net_revenue
+            resp["tomorrow_net_revenue"] = self.fcrd_tomorrow_net_revenue
+        if self.fcrd_month_net_revenue is not None:
+            # Forecast locally from the settled days and today
+            forecast = forecast_month(
+                self.ledger.day,
+                self.ledger.daily.values(),
+                self.ledger.today,
+            )
+            self.fcrd_month_net_estimate = forecast.month_estimate
+            self.fcrd_daily_net_average = forecast.daily_average
+            resp["monthly_net_revenue"] = self.fcrd_month_net_revenue
+            resp["month_estimate"] = forecast.month_estimate
+            resp["month_estimate_low"] = forecast.month_estimate_low
+            resp["month_estimate_high"] = forecast.month_estimate_high
+            resp["daily_average"] = forecast.daily_average
+        if self.fcrd_year_net_revenue is not None:
+            resp["annual_net_revenue"] = self.fcrd_year_net_revenue
+
+        update_time = dt_util.now().strftime("%Y-%m-%d %H:%M:%S")
+        next_update = dt_util.now() + self.update_interval
+        next_update_time = next_update.strftime("%Y-%m-%d %H:%M:%S")
+        resp["update_time"] = update_time
+        resp["next_update_time"] = next_update_time
+
+    async def _async_backfill(self, cw_inst, start: date, today: date) -> bool:
+        """Write the net revenue of the days from start until today to statistics.
+
+        The days are fetched in one range request, return True when done.
+        """
+        if "recorder" not in self.hass.config.components:
+            return True
+
+        start = max(start, today - timedelta(days=BACKFILL_MAX_DAYS))
+        _LOGGER.debug("Backfilling revenue from %s", start)
+        revenue = await self._async_fetch_revenue_range(cw_inst, start, today)
+        if not revenue:
+            _LOGGER.warning("Failed to fetch revenue since %s, backfill later", start)
+            return False
+
+        days: dict[str, float] = {}
+        for offset, each in enumerate(revenue.get("Revenue", [])):
+            day = start + timedelta(days=offset)
+            if day >= today:
+                break
+            days[day.isoformat()] = each.get("NetRevenue", 0)
+
+        await self._async_import_revenue(cw_inst, days)
+        return True
+
+    async def _async_import_revenue(self, cw_inst, days: dict[str, float]) -> None:
+        """Add the net revenue of settled days to the statistics."""
+        if "recorder" not in self.hass.config.components:
+            return
+
+        # pylint: disable-next=import-outside-toplevel
+        from .statistics import async_import_daily_revenue
+
+        added = await async_import_daily_revenue(
+            self.hass, cw_inst.customer_details["Id"], cw_inst.display_name, days
+        )
+        _LOGGER.debug("Added the revenue of %d days to the statistics", added)
+
+    @staticmethod
+    async def _async_fetch_revenue_range(
+        cw_inst, start: date, end: date
+    ) -> dict[str, Any] | None:
+        """Fetch the net revenue of the days from start to end, None on failure."""
+        try:
+            return await cw_inst.fetch_and_return_net_revenue(
+                start.isoformat(), end.isoformat()
+            )
+        except ValueError as err:
+            # The range is checked against today in the timezone of the system,
+            # which may differ from the one of Home Assistant
+            _LOGGER.debug("Revenue range %s to %s refused: %s", start, end, err)
+            return None
+
+    async def _async_reconcile_revenue(self, cw_inst, today: date) -> None:
+        """Reconcile the local revenue sums with EnergyInBalance."""
+        _LOGGER.debug("Reconciling monthly and annual revenue")
+        month_days: dict[str, float] = {}
+        if today.day > 1:
+            first_day = today.replace(day=1)
+            revenue = await self._async_fetch_revenue_range(cw_inst, first_day, today)
+            if not revenue:
+                _LOGGER.warning("Failed to fetch monthly revenue, reconcile later")
+                return
+
+            for offset, each in enumerate(revenue.get("Revenue", [])):
+                day = first_day + timedelta(days=offset)
+                if day > today:
+                    break
+                month_days[day.isoformat()] = each.get("NetRevenue", 0)
+
+        # The manager adds the year up into its own state, which lives as long
+        # as the session, so start it over for each reconcile
+        cw_inst.revenueyear = None
+        cw_inst.revenueyeartotal = 0
+        if not await cw_inst.get_fcrd_year_net_revenue():
+            _LOGGER.warning("Failed to fetch annual revenue, reconcile later")
+            return
+
+        # The month series is not fetched on the first day of the month, but
+        # the annual total already holds the revenue of today
+        self.ledger.reconcile(
+            today,
+            month_days,
+            cw_inst.fcrd_year_net_revenue,
+            cw_inst.fcrd_today_net_revenue,
+        )
+
+
+class CheckwattSpotPriceCoordinator(CheckwattDataCoordinator):
+    """Coordinator of the spot prices.
+
+    The prices are only fetched when the index lacks a publication, while the
+    current price is looked up every minute. Listeners are only notified when
+    the data has changed.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, hub: CheckwattCoordinator
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            entry,
+            hub,
+            hub.session,
+            "spot",
+            timedelta(minutes=CONF_UPDATE_INTERVAL_ALL),
+            always_update=False,
+        )
+        self.spot_price_index: SpotPriceIndex | None = None
+        self._prices_fetched: datetime | None = None
+
+    async def _async_fetch(
+        self, cw_inst: CheckwattManager, resp: CheckwattResp
+    ) -> None:
+        """Fetch the spot prices if required and look up the current price."""
+        if not self.options.get(CONF_POWER_SENSORS):
+            self.wanted = []
+            return
+
+        self.wanted = ["price_zone", "spot_price"]
+        if cw_inst.price_zone is None:
+            await self._async_call("price_zone", cw_inst.get_price_zone)
+        self._async_serve(
+            resp,
+            "price_zone",
+            {"price_zone": cw_inst.price_zone} if cw_inst.price_zone else None,
+        )
+
+        now = dt_util.now()
+        if self._needs_prices(now) and await self._async_call(
+            "spot_price", cw_inst.get_spot_price
+        ):
+            self._prices_fetched = now
+            self._async_index_spot_prices(cw_inst.spot_prices)
+
+        # The index of the last publication keeps serving the prices of the
+        # slots it covers
+        resp["spot_price"] = None
+        if (index := self.spot_price_index) is not None:
+            day = timedelta(days=1)
+            cheapest = index.find_window(1, now, day, "cheapest")
+            expensive = index.find_window(1, now, day, "most_expensive")
+            resp["spot_price"] = index.price_at(now)
+            resp["spot_price_resolution"] = int(index.slot.total_seconds() // 60)
+            resp["cheapest_hour"] = cheapest and cheapest["start"]
+            resp["most_expensive_hour"] = expensive and expensive["start"]
+
+    def _needs_prices(self, now: datetime) -> bool:
+        """Return True if the spot prices shall be fetched."""
+        index = self.spot_price_index
+        if index is None or self._prices_fetched is None:
+            return True
+        if not index.start <= now < index.end:
+            return True
+        # Look for the prices of tomorrow until they are published
+        tomorrow_end = dt_util.start_of_local_day(now + timedelta(days=2))
+        return index.end < tomorrow_end and now - self._prices_fetched >= timedelta(
+            minutes=CONF_UPDATE_INTERVAL_MONETARY
+        )
+
+    @callback
+    def _async_index_spot_prices(self, spot_prices) -> None:
+        """Index the spot prices, once per price publication."""
+        start = dt_util.start_of_local_day()
+        index = self.spot_price_index
+        prices = [each["Value"] for each in (spot_prices or {}).get("Prices", [])]
+        if index is not None and index.start == start:
+            if index.prices == prices:
+                return
+            if not prices:
+                # Keep serving the curve of today over an empty payload
+                _LOGGER.warning("No spot prices received, keeping the last ones")
+                return
+
+        _LOGGER.debug("Indexing %d spot prices", len(prices))
+        self.spot_price_index = SpotPriceIndex.from_spot_prices(spot_prices, start)
+
+
+class CheckwattDeviceCoordinator(CheckwattDataCoordinator):
+    """Coordinator of the CM10 and FCR-D status.
+
+    Listeners are only notified when the status has changed.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, hub: CheckwattCoordinator
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            entry,
+            hub,
+            hub.session,
+            "device",
+            timedelta(minutes=CONF_UPDATE_INTERVAL_ALL),
+            always_update=False,
+        )
+        self.fcrd_state = None
+        self.fcrd_info = None
+        self.fcrd_timestamp = None
+        self.boot_transition: str | None = None
+        self.timeline = FCRDTimeline(FCRD_TIMELINE_SIZE)
+        self._id = None
+
+    async def _async_fetch(
+        self, cw_inst: CheckwattManager, resp: CheckwattResp
+    ) -> None:
+        """Fetch the FCR-D state and the meter status."""
+        use_cm10_sensor = self.options.get(CONF_CM10_SENSOR)
+        self.wanted = ["customer_details"]
+        if use_cm10_sensor:
+            self.wanted.append("meter_status")
+
+        if self._id is None:
+            # The customer details were just fetched when logging in, the
+            # state is diffed against the one stored before the restart
+            self._id = cw_inst.customer_details["Id"]
+            fcrd_fetched = True
+        else:
+            # The FCR-D state is parsed from the logbook in the customer details
+            fcrd_fetched = await self._async_call(
+                "customer_details", cw_inst.get_customer_details
+            )
+
+        if use_cm10_sensor:
+            fresh = None
+            if await self._async_call(
+                "meter_status",
+                cw_inst.get_meter_status,
+                lambda: bool(cw_inst.meter_data),
+            ):
+                if cw_inst.meter_status == "offline":
+                    fresh = {"cm10_status": "Offline"}
+                elif cw_inst.meter_under_test:
+                    fresh = {"cm10_status": "Test Pending"}
+                else:
+                    fresh = {"cm10_status": "Active"}
+                fresh["cm10_version"] = cw_inst.meter_version
+            self._async_serve(resp, "meter_status", fresh)
+
+        if fcrd_fetched:
+            new_state = cw_inst.fcrd_state
+            if self.hub.faults is not None:
+                new_state = self.hub.faults.next_fcrd_state(new_state)
+
+            self.async_handle_fcrd_state(
+                new_state, cw_inst.fcrd_info, cw_inst.fcrd_timestamp
+            )
+
+        timeline = self.timeline
+        if timeline.state is not None:
+            # Hours with one decimal, to notify the listeners every 6 minutes
+            resp["fcrd_time_in_state"] = {
+                state: round(seconds / 3600, 1)
+                for state, seconds in timeline.time_in_states(dt_util.utcnow()).items()
+            }
+            resp["fcrd_activations"] = timeline.activations
+            resp["fcrd_failed_activation_rate"] = timeline.failed_activation_rate
+            resp["fcrd_mean_time_to_reactivation"] = timeline.mean_time_to_reactivation
+
+        if "cm10_status" in resp:
+            resp["fcr_d_status"] = self.fcrd_state
+            resp["fcr_d_info"] = self.fcrd_info
+            resp["fcr_d_date"] = self.fcrd_timestamp
+
+    @callback
+    def async_handle_fcrd_state(self, new_state, new_info, new_timestamp) -> None:
+        """Dispatch ACTIVATED/DEACTIVATED if the FCR-D state has changed."""
+        old_state = self.fcrd_state
+        if old_state == new_state:
+            return
+
+        signal_payload = {
+            "signal": EVENT_SIGNAL_FCRD,
+            "data": {
+                "current_fcrd": {
+                    "state": old_state,
+                    "info": self.fcrd_info,
+                    "date": self.fcrd_timestamp,
+                },
+                "new_fcrd": {
+                    "state": new_state,
+                    "info": new_info,
+                    "date": new_timestamp,
+                },
+            },
+        }
+
+        # The event entity is added after the first refresh, keep a
+        # transition found at boot for it
+        if self.data is None:
+            self.boot_transition = new_state
+
+        if self.hub.faults is not None:
+            self.hub.faults.transitions += 1
+        # A replay shares the customer ID of the live entities, so it must
+        # not reach their timeline and events
+        if not self.hub.replay:
+            if new_state is not None:
+                self.timeline.add(dt_util.utcnow(), new_state, new_info)
+
+            # Dispatch it to subscribers
+            async_dispatcher_send(
+                self.hass,
+                f"checkwatt_{self._id}_signal",
+                signal_payload,
+            )
+
+        # Update self to discover next change
+        self.fcrd_state = new_state
+        self.fcrd_info = new_info
+        self.fcrd_timestamp = new_timestamp
+        self.hub.async_schedule_save()
+
+    @callback
+    def async_pop_boot_transition(self) -> str | None:
+        """Return the FCR-D state entered at boot, once."""
+        state, self.boot_transition = self.boot_transition, None
+        return state
+
+
+class CheckwattFCRDWatcher:
+    """Lightweight high-frequency watcher of the FCR-D state.
+
+    The FCR-D state is parsed from the logbook in the customer details, so
+    only that endpoint is polled on the session shared with the coordinators.
+    Transitions are fed straight to the device coordinator, leaving the data
+    cycles at their own cadence.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: CheckwattDeviceCoordinator
+    ) -> None:
+        """Initialize the watcher."""
+        self.hass = hass
+        self._coordinator = coordinator
+        self._unsub_poll = None
+        self._polling = False
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if the watcher is polling."""
+        return self._unsub_poll is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start polling the FCR-D state."""
+        if self._unsub_poll is not None:
+            return
+        _LOGGER.debug("Starting FCR-D watcher")
+        self._unsub_poll = async_track_time_interval(
+            self.hass,
+            self._async_poll,
+            timedelta(seconds=CONF_UPDATE_INTERVAL_FCRD),
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling."""
+        if self._unsub_poll is not None:
+            _LOGGER.debug("Stopping FCR-D watcher")
+            self._unsub_poll()
+            self._unsub_poll = None
+
+    async def _async_poll(self, now=None) -> None:
+        """Poll the FCR-D state and feed transitions to the coordinator."""
+        # Skip if the previous poll is still running or the coordinator
+        # has not yet completed its first refresh
+        if self._polling or self._coordinator.data is None:
+            return
+
+        self._polling = True
+        budget = self._coordinator.options.get(
+            CONF_UPDATE_DEADLINE, DEFAULT_UPDATE_DEADLINE
+        )
+        try:
+            try:
+                async with asyncio.timeout(budget):
+                    cw_inst = await self._coordinator.session.async_get()
+                    success = await cw_inst.get_customer_details()
+            except UpdateFailed:
+                _LOGGER.debug("FCR-D watcher failed to login")
+                return
+            except TimeoutError:
+                _LOGGER.debug("FCR-D watcher missed the deadline")
+                return
+            except Exception:  # pylint: disable=broad-except
+                # Keep polling, a failing call must not stop the watcher
+                _LOGGER.exception("Unexpected error in the FCR-D watcher")
+                self._coordinator.session.async_expire()
+                return
+
+            if not success:
+                # Most likely an expired session, login again on next poll
+                _LOGGER.debug("FCR-D watcher failed to get customer details")
+                self._coordinator.session.async_expire()
+                return
+
+            new_state = cw_inst.fcrd_state
+            if (faults := self._coordinator.hub.faults) is not None:
+                new_state = faults.next_fcrd_state(new_state)
+
+            self._coordinator.async_handle_fcrd_state(
+                new_state, cw_inst.fcrd_info, cw_inst.fcrd_timestamp
+            )
+        finally:
+            self._polling = False
+
+
+class CheckwattError(HomeAssistantError):
+    """Base error."""
+
+
+class InvalidAuth(CheckwattError):
+    """Raised when invalid authentication credentials are provided."""
+
+
+class APIRatelimitExceeded(CheckwattError):
+    """Raised when the API rate limit is exceeded."""
+
+
+class UnknownError(CheckwattError):
+    """Raised when an unknown error occurs."""
@@ -0,0 +1,97 @@
+"""Running spot price value of the imported and exported energy."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any
+
+
+class EnergyValueTracker:
+    """Daily and monthly cost of the import and value of the export.
+
+    Each update prices the energy imported and exported since the previous
+    one at the current spot price, so the sums are updated in constant time.
+    The totals are not stored, as the energy of a restart gap cannot be
+    priced. Energy totals are in Wh, prices in SEK/kWh excluding VAT.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty tracker."""
+        self.day: date | None = None
+        self.last_import: float | None = None
+        self.last_export: float | None = None
+        self.import_cost_today = 0.0
+        self.export_value_today = 0.0
+        self.import_cost_month = 0.0
+        self.export_value_month = 0.0
+        # Energy in kWh that could not be priced, as no spot price was known
+        self.unpriced_energy = 0.0
+
+    def add(
+        self,
+        now: datetime,
+        import_total: float | None,
+        export_total: float | None,
+        price: float | None,
+    ) -> bool:
+        """Price the energy since the last update, return True if it changed."""
+        self.roll_over(now.date())
+        imported = self._delta(self.last_import, import_total)
+        exported = self._delta(self.last_export, export_total)
+        if import_total is not None:
+            self.last_import = import_total
+        if export_total is not None:
+            self.last_export = export_total
+        if not imported and not exported:
+            return False
+
+        if price is None:
+            self.unpriced_energy += imported + exported
+        else:
+            self.import_cost_today += imported * price
+            self.import_cost_month += imported * price
+            self.export_value_today += exported * price
+            self.export_value_month += exported * price
+        return True
+
+    @staticmethod
+    def _delta(last: float | None, total: float | None) -> float:
+        """Return the energy in kWh since the last total."""
+        # A meter reset or a missing total starts over from the new total
+        if last is None or total is None or total < last:
+            return 0.0
+        return (total - last) / 1000
+
+    def roll_over(self, today: date) -> None:
+        """Reset the sums of the days and months that have passed."""
+        if self.day is not None and self.day != today:
+            self.import_cost_today = 0.0
+            self.export_value_today = 0.0
+            if (self.day.year, self.day.month) != (today.year, today.month):
+                self.import_cost_month = 0.0
+                self.export_value_month = 0.0
+        self.day = today
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tracker as a dictionary for storage."""
+        return {
+            "day": self.day.isoformat() if self.day else None,
+            "import_cost_today": self.import_cost_today,
+            "export_value_today": self.export_value_today,
+            "import_cost_month": self.import_cost_month,
+            "export_value_month": self.export_value_month,
+            "unpriced_energy": self.unpriced_energy,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EnergyValueTracker:
+        """Restore a tracker from storage."""
+        tracker = cls()
+        if data.get("day"):
+            tracker.day = date.fromisoformat(data["day"])
+        tracker.import_cost_today = data.get("import_cost_today", 0.0)
+        tracker.export_value_today = data.get("export_value_today", 0.0)
+        tracker.import_cost_month = data.get("import_cost_month", 0.0)
+        tracker.export_value_month = data.get("export_value_month", 0.0)
+        tracker.unpriced_energy = data.get("unpriced_energy", 0.0)
+        return tracker
@@ -2,23 +2,46 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 import logging
+from typing import Any
 
 from homeassistant.components.event import EventEntity, EventEntityDescription
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import CheckwattCoordinator, CheckwattResp
-from .const import ATTRIBUTION, CHECKWATT_MODEL, DOMAIN, EVENT_SIGNAL_FCRD, MANUFACTURER
+from .const import (
+    ATTRIBUTION,
+    CHECKWATT_MODEL,
+    DOMAIN,
+    EVENT_SIGNAL_FCRD,
+    FCRD_ACTIVATED,
+    FCRD_DEACTIVATED,
+    FCRD_FAILED,
+    MANUFACTURER,
+)
+from .coordinator import (
+    CheckwattCoordinator,
+    CheckwattDeviceCoordinator,
+    CheckwattResp,
+)
 
 EVENT_FCRD_ACTIVATED = "fcrd_activated"
 EVENT_FCRD_DEACTIVATED = "fcrd_deactivated"
 EVENT_FCRD_FAILED = "fcrd_failed"
 
+# Event fired when entering an FCR-D state
+FCRD_STATE_EVENTS = {
+    FCRD_ACTIVATED: EVENT_FCRD_ACTIVATED,
+    FCRD_DEACTIVATED: EVENT_FCRD_DEACTIVATED,
+    FCRD_FAILED: EVENT_FCRD_FAILED,
+}
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -29,26 +52,38 @@ async def async_setup_entry(
 ) -> None:
     """Set up the CheckWatt event platform."""
     coordinator: CheckwattCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities: list[AbstractCheckwattEvent] = []
-    checkwatt_data: CheckwattResp = coordinator.data
-    _LOGGER.debug(
-        "Setting up detailed CheckWatt event for %s",
-        checkwatt_data["display_name"],
-    )
 
-    event_description = EventEntityDescription(
-        key="fcr_d_event",
-        name="FCR-D State",
-        icon="mdi:battery-alert",
-        device_class="fcrd",
-        translation_key="fcr_d_event",
-    )
+    @callback
+    def async_add_account_events() -> None:
+        """Add the events of the account, shared by its entries."""
+        entities: list[AbstractCheckwattEvent] = []
+        checkwatt_data: CheckwattResp = coordinator.data
+        _LOGGER.debug(
+            "Setting up detailed CheckWatt event for %s",
+            checkwatt_data["display_name"],
+        )
 
-    entities.append(CheckWattFCRDEvent(coordinator, event_description))
-    async_add_entities(entities, True)
+        event_description = EventEntityDescription(
+            key="fcr_d_event",
+            name="FCR-D State",
+            icon="mdi:battery-alert",
+            device_class="fcrd",
+            translation_key="fcr_d_event",
+        )
 
+        entities.append(CheckWattFCRDEvent(coordinator.device, event_description))
+        async_add_entities(entities, True)
 
-class AbstractCheckwattEvent(CoordinatorEntity[CheckwattCoordinator], EventEntity):
+    entry.async_on_unload(
+        coordinator.async_add_account_entities(
+            Platform.EVENT, entry.entry_id, async_add_account_events
+        )
+    )
+
+
+class AbstractCheckwattEvent(
+    CoordinatorEntity[CheckwattDeviceCoordinator], EventEntity
+):
     """Abstract class for an CheckWatt event."""
 
     _attr_attribution = ATTRIBUTION
@@ -56,7 +91,7 @@ class AbstractCheckwattEvent(CoordinatorEntity[CheckwattCoordinator], EventEntit
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDeviceCoordinator,
         description: EventEntity,
     ) -> None:
         """Initialize the event."""
@@ -93,12 +128,16 @@ class CheckWattFCRDEvent(AbstractCheckwattEvent):
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDeviceCoordinator,
         description: EventEntityDescription,
     ) -> None:
         """Initialize the CheckWatt event entity."""
         super().__init__(coordinator=coordinator, description=description)
         self._coordinator = coordinator
+        # Handlers of the signals, add new signals here
+        self._signal_handlers: dict[str, Callable[[dict[str, Any]], None]] = {
+            EVENT_SIGNAL_FCRD: self._handle_fcrd
+        }
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
@@ -111,48 +150,41 @@ class CheckWattFCRDEvent(AbstractCheckwattEvent):
             ),
         )
 
-        # Send the status upon boot
-        if "fcr_d_status" in self._coordinator.data:
-            event = None
-            if self._coordinator.data["fcr_d_status"] == "ACTIVATED":
-                event = EVENT_FCRD_ACTIVATED
-            elif self._coordinator.data["fcr_d_status"] == "DEACTIVATE":
-                event = EVENT_FCRD_DEACTIVATED
-            elif self._coordinator.data["fcr_d_status"] == "FAIL ACTIVATION":
-                event = EVENT_FCRD_FAILED
-
-            if event is not None:
-                self._trigger_event(event)
-                self.async_write_ha_state()
+        # Send the state entered at boot, a restart without a change of the
+        # stored state stays quiet
+        if (state := self._coordinator.async_pop_boot_transition()) is not None:
+            self._async_fire(state, {})
 
     @callback
     def handle_event(self, signal_payload) -> None:
         """Handle received event."""
-        event = None
-        if "signal" in signal_payload and signal_payload["signal"] == EVENT_SIGNAL_FCRD:
-            if (
-                "new_fcrd" in signal_payload["data"]
-                and "state" in signal_payload["data"]["new_fcrd"]
-            ):
-                if signal_payload["data"]["new_fcrd"]["state"] == "ACTIVATED":
-                    event = EVENT_FCRD_ACTIVATED
-                elif signal_payload["data"]["new_fcrd"]["state"] == "DEACTIVATE":
-                    event = EVENT_FCRD_DEACTIVATED
-                elif signal_payload["data"]["new_fcrd"]["state"] == "FAIL ACTIVATION":
-                    event = EVENT_FCRD_FAILED
-
-            else:
-                _LOGGER.error(
-                    "Signal %s payload did not include correct data", EVENT_SIGNAL_FCRD
-                )
-
-        # Add additional signals and events here
-        # Eg:
-        # elif signal_payload["signal"] == EVENT_SIGNAL_NEW
-
-        else:
+        handler = self._signal_handlers.get(signal_payload.get("signal"))
+        if handler is None:
             _LOGGER.error("Signal did not include a known signal")
+            return
+        handler(signal_payload.get("data", {}))
 
-        if event is not None:
-            self._trigger_event(event)
+    @callback
+    def _handle_fcrd(self, data: dict[str, Any]) -> None:
+        """Fire the event of the FCR-D state entered."""
+        if "state" not in data.get("new_fcrd", {}):
+            _LOGGER.error(
+                "Signal %s payload did not include correct data", EVENT_SIGNAL_FCRD
+            )
+            return
+        new_fcrd = data["new_fcrd"]
+        self._async_fire(
+            new_fcrd["state"],
+            {
+                "previous_state": data.get("current_fcrd", {}).get("state"),
+                "info": new_fcrd.get("info"),
+                "date": new_fcrd.get("date"),
+            },
+        )
+
+    @callback
+    def _async_fire(self, state: str, attributes: dict[str, Any]) -> None:
+        """Fire the event of an FCR-D state, if it has one."""
+        if (event := FCRD_STATE_EVENTS.get(state)) is not None:
+            self._trigger_event(event, attributes)
             self.async_write_ha_state()
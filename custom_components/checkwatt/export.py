@@ -0,0 +1,260 @@
+"""Export of the revenue and energy history of the CheckWatt sites."""
+
+from __future__ import annotations
+
+import csv
+from datetime import date, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import BACKFILL_MAX_DAYS, DOMAIN, EXPORT_CHUNK_DAYS
+
+if TYPE_CHECKING:
+    from .coordinator import CheckwattCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_CSV = "csv"
+EXPORT_PARQUET = "parquet"
+
+# Keys of the energy sensors, their daily change is exported in kWh
+ENERGY_KEYS = ["solar", "charging", "discharging", "import", "export"]
+COLUMNS = ["date", "site", "customer_id", "net_revenue", *ENERGY_KEYS]
+
+
+class _CsvWriter:
+    """Writer of the rows to a CSV file."""
+
+    def __init__(self, path: str) -> None:
+        """Open the file and write the header."""
+        # pylint: disable-next=consider-using-with
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, COLUMNS)
+        self._writer.writeheader()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        """Write a chunk of rows."""
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Writer of the rows to a Parquet file, one row group per chunk."""
+
+    def __init__(self, path: str) -> None:
+        """Open the file."""
+        # pylint: disable-next=import-outside-toplevel
+        import pyarrow as pa
+
+        # pylint: disable-next=import-outside-toplevel
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("date", pa.date32()),
+                ("site", pa.string()),
+                ("customer_id", pa.string()),
+                *((column, pa.float64()) for column in COLUMNS[3:]),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        """Write a chunk of rows."""
+        if rows:
+            self._writer.write_table(
+                self._pa.Table.from_pylist(rows, schema=self._schema)
+            )
+
+    def close(self) -> None:
+        """Close the file."""
+        self._writer.close()
+
+
+def _open_writer(path: str, file_format: str) -> _CsvWriter | _ParquetWriter:
+    """Open a writer of the format."""
+    if file_format == EXPORT_PARQUET:
+        try:
+            return _ParquetWriter(path)
+        except ImportError as err:
+            raise HomeAssistantError(
+                "Parquet export requires the pyarrow package, export to CSV instead"
+            ) from err
+    return _CsvWriter(path)
+
+
+async def _async_revenue(cw_inst, first: date, last: date) -> dict[date, float]:
+    """Return the daily net revenue of the settled days from first to last.
+
+    EnergyInBalance only serves the revenue of the last six months.
+    """
+    today = dt_util.now().date()
+    start = max(first, today - timedelta(days=BACKFILL_MAX_DAYS))
+    stop = min(last + timedelta(days=1), today)
+    if start >= stop:
+        return {}
+
+    # The range includes its last day and may not end after today in the
+    # timezone of the system, so it ends on the last settled day when it can
+    end = max(stop - timedelta(days=1), start + timedelta(days=1))
+    try:
+        revenue = await cw_inst.fetch_and_return_net_revenue(
+            start.isoformat(), end.isoformat()
+        )
+    except ValueError as err:
+        raise HomeAssistantError(
+            f"The revenue from {start} to {end} was refused: {err}"
+        ) from err
+    if not revenue:
+        raise HomeAssistantError(f"Failed to fetch the revenue from {start}")
+
+    days: dict[date, float] = {}
+    for offset, each in enumerate(revenue.get("Revenue", [])):
+        day = start + timedelta(days=offset)
+        if day >= stop:
+            break
+        days[day] = each.get("NetRevenue", 0)
+    return days
+
+
+async def _async_energy(
+    hass: HomeAssistant, site_id: str, first: date, last: date
+) -> dict[date, dict[str, float]]:
+    """Return the daily energy of the days from first to last.
+
+    The energy is taken from the long-term statistics of the energy sensors,
+    so it is only known from when the sensors were enabled.
+    """
+    if "recorder" not in hass.config.components:
+        return {}
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.statistics import (
+        statistics_during_period,
+    )
+
+    registry = er.async_get(hass)
+    entity_ids = {
+        entity_id: key
+        for key in ENERGY_KEYS
+        if (
+            entity_id := registry.async_get_entity_id(
+                "sensor", DOMAIN, f"checkwattUid_{key}_{site_id}"
+            )
+        )
+    }
+    if not entity_ids:
+        return {}
+
+    statistics = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        dt_util.start_of_local_day(first),
+        dt_util.start_of_local_day(last + timedelta(days=1)),
+        set(entity_ids),
+        "day",
+        None,
+        {"change"},
+    )
+    days: dict[date, dict[str, float]] = {}
+    for entity_id, rows in statistics.items():
+        for row in rows:
+            day = dt_util.as_local(dt_util.utc_from_timestamp(row["start"])).date()
+            days.setdefault(day, {})[entity_ids[entity_id]] = row.get("change")
+    return days
+
+
+async def _async_site_rows(
+    hass: HomeAssistant, hub: CheckwattCoordinator, first: date, last: date
+) -> list[dict[str, Any]]:
+    """Return the rows of the days from first to last of a site."""
+    cw_inst = await hub.session.async_get()
+    site_id = cw_inst.customer_details["Id"]
+    revenue = await _async_revenue(cw_inst, first, last)
+    energy = await _async_energy(hass, site_id, first, last)
+
+    rows = []
+    day = first
+    while day <= last:
+        rows.append(
+            {
+                "date": day,
+                "site": cw_inst.display_name,
+                "customer_id": str(site_id),
+                "net_revenue": revenue.get(day),
+                **{key: energy.get(day, {}).get(key) for key in ENERGY_KEYS},
+            }
+        )
+        day += timedelta(days=1)
+    return rows
+
+
+def _aggregate(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sum the rows of the sites per day."""
+    days: dict[date, dict[str, Any]] = {}
+    for row in rows:
+        total = days.setdefault(
+            row["date"], {"date": row["date"], "site": "all", "customer_id": ""}
+        )
+        for column in COLUMNS[3:]:
+            if row[column] is not None:
+                total[column] = (total.get(column) or 0) + row[column]
+            else:
+                total.setdefault(column, None)
+    return list(days.values())
+
+
+async def async_export_history(
+    hass: HomeAssistant,
+    hubs: list[CheckwattCoordinator],
+    first: date,
+    last: date,
+    path: str,
+    file_format: str = EXPORT_CSV,
+    aggregate: bool = False,
+) -> dict[str, Any]:
+    """Write the daily revenue and energy of the sites to a file.
+
+    The days are fetched and written in chunks, so the memory used does not
+    grow with the length of the period. With aggregate, the sites are summed
+    into one row per day.
+    """
+    writer = await hass.async_add_executor_job(_open_writer, path, file_format)
+    rows_written = 0
+    try:
+        start = first
+        while start <= last:
+            stop = min(start + timedelta(days=EXPORT_CHUNK_DAYS - 1), last)
+            rows = []
+            for hub in hubs:
+                rows.extend(await _async_site_rows(hass, hub, start, stop))
+            if aggregate:
+                rows = _aggregate(rows)
+            await hass.async_add_executor_job(writer.write, rows)
+            rows_written += len(rows)
+            _LOGGER.debug("Exported %d rows from %s to %s", len(rows), start, stop)
+            start = stop + timedelta(days=1)
+    finally:
+        await hass.async_add_executor_job(writer.close)
+
+    return {
+        "path": path,
+        "format": file_format,
+        "sites": len(hubs),
+        "rows": rows_written,
+        "start_date": first.isoformat(),
+        "end_date": last.isoformat(),
+    }
@@ -0,0 +1,140 @@
+"""Fault injection for exercising the CheckWatt coordinators."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .coordinator import CheckwattSession
+
+FAULT_LATENCY = "latency"
+FAULT_TIMEOUT = "timeout"
+FAULT_AUTH_EXPIRY = "auth_expiry"
+FAULT_MALFORMED = "malformed"
+FAULTS = [FAULT_LATENCY, FAULT_TIMEOUT, FAULT_AUTH_EXPIRY, FAULT_MALFORMED]
+
+# Manager attribute holding the payload of the endpoints that can be malformed
+PAYLOADS = {
+    "energy_flow": "energy_data",
+    "meter_status": "meter_data",
+    "power_data": "power_data",
+    "spot_price": "spot_prices",
+}
+
+
+@dataclass
+class Fault:
+    """Fault applied to the next calls of an endpoint."""
+
+    kind: str
+    remaining: int
+    latency: float = 0.0
+
+
+class FaultInjector:
+    """Scripted faults applied to the calls and FCR-D state of the coordinators.
+
+    The coordinators only consult the injector when one is installed, so the
+    production code paths are untouched otherwise. Faults are consumed in the
+    order they were added, which makes a script deterministic.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an injector without faults."""
+        self.started = dt_util.utcnow()
+        self._faults: dict[str, deque[Fault]] = {}
+        self._fcrd_states: deque[str] = deque()
+        self.injected: Counter[str] = Counter()
+        self.transitions = 0
+        self._failing_since: dict[str, datetime] = {}
+        self.recovery_times: dict[str, list[float]] = {}
+
+    def add(
+        self, kind: str, endpoint: str, count: int = 1, latency: float = 0.0
+    ) -> None:
+        """Apply a fault to the next count calls of an endpoint."""
+        if kind not in FAULTS:
+            raise ValueError(f"Unknown fault {kind}")
+        if kind == FAULT_MALFORMED and endpoint not in PAYLOADS:
+            raise ValueError(f"The payload of {endpoint} cannot be malformed")
+        self._faults.setdefault(endpoint, deque()).append(Fault(kind, count, latency))
+
+    def script_fcrd_states(self, states: Iterable[str]) -> None:
+        """Report the states, one per FCR-D poll, instead of the fetched ones."""
+        self._fcrd_states.extend(states)
+
+    def next_fcrd_state(self, state: str | None) -> str | None:
+        """Return the scripted FCR-D state, or the fetched one if none is left."""
+        if not self._fcrd_states:
+            return state
+        self.injected["fcrd_state"] += 1
+        return self._fcrd_states.popleft()
+
+    def _take(self, endpoint: str) -> Fault | None:
+        """Return the fault of the next call of an endpoint, if any."""
+        if not (faults := self._faults.get(endpoint)):
+            return None
+        fault = faults[0]
+        fault.remaining -= 1
+        if fault.remaining <= 0:
+            faults.popleft()
+        self.injected[fault.kind] += 1
+        return fault
+
+    async def async_call(
+        self,
+        endpoint: str,
+        call: Callable[[], Awaitable[bool]],
+        session: CheckwattSession,
+    ) -> bool:
+        """Call an endpoint, applying its next fault."""
+        if (fault := self._take(endpoint)) is None:
+            return await call()
+
+        if fault.kind == FAULT_TIMEOUT:
+            raise TimeoutError
+        if fault.kind == FAULT_AUTH_EXPIRY:
+            session.async_expire()
+            return False
+        if fault.kind == FAULT_LATENCY:
+            await asyncio.sleep(fault.latency)
+            return await call()
+
+        success = await call()
+        setattr(session.cw_inst, PAYLOADS[endpoint], {})
+        return success
+
+    def record_result(self, endpoint: str, success: bool, now: datetime) -> None:
+        """Measure the time an endpoint takes to recover from failing."""
+        if not success:
+            self._failing_since.setdefault(endpoint, now)
+        elif (since := self._failing_since.pop(endpoint, None)) is not None:
+            self.recovery_times.setdefault(endpoint, []).append(
+                (now - since).total_seconds()
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the faults injected and their effect."""
+        elapsed = (dt_util.utcnow() - self.started).total_seconds()
+        return {
+            "injected": dict(self.injected),
+            "pending": {
+                endpoint: [f"{fault.kind} x{fault.remaining}" for fault in faults]
+                for endpoint, faults in self._faults.items()
+                if faults
+            },
+            "pending_fcrd_states": list(self._fcrd_states),
+            "fcrd_transitions": self.transitions,
+            "fcrd_transitions_per_minute": (
+                round(self.transitions * 60 / elapsed, 2) if elapsed else None
+            ),
+            "failing": sorted(self._failing_since),
+            "recovery_times": self.recovery_times,
+        }
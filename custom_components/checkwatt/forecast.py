@@ -0,0 +1,59 @@
+"""Local month-end forecast of the CheckWatt FCR-D net revenue."""
+
+from __future__ import annotations
+
+import calendar
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+import math
+import statistics
+
+# Two-sided 90% confidence
+CONFIDENCE_Z = 1.645
+
+
+@dataclass(frozen=True)
+class MonthForecast:
+    """Forecast of the net revenue at the end of the month."""
+
+    daily_average: float
+    month_estimate: float
+    month_estimate_low: float
+    month_estimate_high: float
+
+
+def forecast_month(
+    day: date, settled: Iterable[float], today: float | None
+) -> MonthForecast:
+    """Forecast the month-end net revenue.
+
+    The settled days of the month and today's running value are averaged
+    over the days with revenue, in line with EnergyInBalance, and the
+    remaining days of the month are projected from that average. The
+    confidence band widens with the spread of the settled days and the
+    number of days left.
+    """
+    settled = list(settled)
+    today = today or 0.0
+    month_to_date = sum(settled) + today
+
+    days_without_revenue = sum(1 for revenue in settled if revenue == 0)
+    if today == 0:
+        days_without_revenue += 1
+    days_with_revenue = day.day - days_without_revenue
+    daily_average = month_to_date / days_with_revenue if days_with_revenue > 0 else 0.0
+
+    days_left = calendar.monthrange(day.year, day.month)[1] - day.day
+    month_estimate = month_to_date + daily_average * days_left
+
+    earning_days = [revenue for revenue in settled if revenue != 0]
+    spread = statistics.stdev(earning_days) if len(earning_days) > 1 else 0.0
+    margin = CONFIDENCE_Z * spread * math.sqrt(days_left)
+
+    return MonthForecast(
+        daily_average=daily_average,
+        month_estimate=month_estimate,
+        month_estimate_low=month_estimate - margin,
+        month_estimate_high=month_estimate + margin,
+    )
@@ -0,0 +1,127 @@
+"""Streaming tracker of the monthly grid peak power."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+import heapq
+from typing import Any
+
+
+class GridPeakTracker:
+    """Running monthly peak of the hourly average grid import.
+
+    Samples of the grid power, positive when importing, are averaged per
+    hour. The highest hourly average of each day is kept, which is what the
+    Swedish capacity tariffs use when averaging the top peaks of a month on
+    separate days. Powers are in kW.
+    """
+
+    def __init__(self, top_n: int) -> None:
+        """Initialize an empty tracker."""
+        self.top_n = top_n
+        self.month: str | None = None
+        self.hour: datetime | None = None
+        self.hour_sum = 0.0
+        self.hour_count = 0
+        self.daily_peaks: dict[str, float] = {}
+        self.monthly_peak: float | None = None
+        self.reconciled: date | None = None
+
+    def add_sample(self, now: datetime, grid_power: float) -> bool:
+        """Add a grid power sample in W, return True if an hour was closed."""
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        closed = False
+        if self.hour is not None and hour != self.hour:
+            self._close_hour()
+            closed = True
+
+        month = hour.strftime("%Y-%m")
+        if month != self.month:
+            self._new_month(month)
+
+        self.hour = hour
+        self.hour_sum += max(grid_power, 0) / 1000
+        self.hour_count += 1
+        return closed
+
+    def _close_hour(self) -> None:
+        """Fold the average of the passed hour into the peaks."""
+        if (
+            self.hour is not None
+            and self.hour_count > 0
+            and self.hour.strftime("%Y-%m") == self.month
+        ):
+            average = self.hour_sum / self.hour_count
+            day = self.hour.date().isoformat()
+            self.daily_peaks[day] = max(average, self.daily_peaks.get(day, 0.0))
+            self.monthly_peak = max(average, self.monthly_peak or 0.0)
+        self.hour_sum = 0.0
+        self.hour_count = 0
+
+    def _new_month(self, month: str) -> None:
+        """Start tracking a new month."""
+        self.month = month
+        self.daily_peaks = {}
+        self.monthly_peak = None
+
+    def needs_reconcile(self, today: date) -> bool:
+        """Return True if the peak shall be reconciled with EnergyInBalance."""
+        return self.reconciled != today
+
+    def reconcile(self, today: date, peak: float | None) -> None:
+        """Raise the monthly peak to the one reported by EnergyInBalance.
+
+        The API catches hours missed while Home Assistant was not running.
+        """
+        month = today.strftime("%Y-%m")
+        if month != self.month:
+            self._new_month(month)
+        if peak is not None:
+            self.monthly_peak = max(peak, self.monthly_peak or 0.0)
+        self.reconciled = today
+
+    @property
+    def hour_average(self) -> float | None:
+        """Return the running average of the current hour."""
+        if self.hour_count == 0:
+            return None
+        return self.hour_sum / self.hour_count
+
+    @property
+    def top_peaks(self) -> list[float]:
+        """Return the highest daily peaks of the month."""
+        return heapq.nlargest(self.top_n, self.daily_peaks.values())
+
+    @property
+    def top_peaks_average(self) -> float | None:
+        """Return the average of the highest daily peaks of the month."""
+        if not (peaks := self.top_peaks):
+            return None
+        return sum(peaks) / len(peaks)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tracker as a dictionary for storage."""
+        return {
+            "month": self.month,
+            "hour": self.hour.isoformat() if self.hour else None,
+            "hour_sum": self.hour_sum,
+            "hour_count": self.hour_count,
+            "daily_peaks": self.daily_peaks,
+            "monthly_peak": self.monthly_peak,
+            "reconciled": self.reconciled.isoformat() if self.reconciled else None,
+        }
+
+    @classmethod
+    def from_dict(cls, top_n: int, data: dict[str, Any]) -> GridPeakTracker:
+        """Restore a tracker from storage."""
+        tracker = cls(top_n)
+        tracker.month = data.get("month")
+        if data.get("hour"):
+            tracker.hour = datetime.fromisoformat(data["hour"])
+        tracker.hour_sum = data.get("hour_sum", 0.0)
+        tracker.hour_count = data.get("hour_count", 0)
+        tracker.daily_peaks = dict(data.get("daily_peaks", {}))
+        tracker.monthly_peak = data.get("monthly_peak")
+        if data.get("reconciled"):
+            tracker.reconciled = date.fromisoformat(data["reconciled"])
+        return tracker
@@ -0,0 +1,76 @@
+"""Daily, weekly and monthly counters of the energy totals."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any
+
+PERIOD_DAILY = "daily"
+PERIOD_WEEKLY = "weekly"
+PERIOD_MONTHLY = "monthly"
+PERIODS = [PERIOD_DAILY, PERIOD_WEEKLY, PERIOD_MONTHLY]
+
+
+def period_start(period: str, day: date) -> date:
+    """Return the first day of the period covering a day, weeks start Monday."""
+    if period == PERIOD_WEEKLY:
+        return day - timedelta(days=day.weekday())
+    if period == PERIOD_MONTHLY:
+        return day.replace(day=1)
+    return day
+
+
+class EnergyPeriodCounters:
+    """Energy of the current periods, counted from the totals at their start.
+
+    A baseline of all totals is taken when a period starts, and the energy of
+    the period is the difference to the latest totals. Only the baselines are
+    stored, so the energy of a restart gap is kept in its period.
+    """
+
+    def __init__(self) -> None:
+        """Initialize counters without baselines."""
+        self.starts: dict[str, date] = {}
+        self.baselines: dict[str, dict[str, float]] = {}
+
+    def update(
+        self, now: datetime, totals: dict[str, float]
+    ) -> tuple[dict[str, dict[str, float]], bool]:
+        """Return the energy of the periods and if a baseline was taken."""
+        today = now.date()
+        rebased = False
+        periods: dict[str, dict[str, float]] = {}
+        for period in PERIODS:
+            start = period_start(period, today)
+            baseline = self.baselines.get(period)
+            if self.starts.get(period) != start or baseline is None:
+                self.starts[period] = start
+                baseline = self.baselines[period] = dict(totals)
+                rebased = True
+
+            counters: dict[str, float] = {}
+            for key, total in totals.items():
+                if key not in baseline or total < baseline[key]:
+                    # A new or reset meter is counted from its current total
+                    baseline[key] = total
+                    rebased = True
+                counters[key] = total - baseline[key]
+            periods[period] = counters
+        return periods, rebased
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dictionary for storage."""
+        return {
+            period: {"start": start.isoformat(), "baseline": self.baselines[period]}
+            for period, start in self.starts.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EnergyPeriodCounters:
+        """Restore the counters from storage."""
+        counters = cls()
+        for period, stored in data.items():
+            if period in PERIODS and stored.get("start"):
+                counters.starts[period] = date.fromisoformat(stored["start"])
+                counters.baselines[period] = dict(stored.get("baseline", {}))
+        return counters
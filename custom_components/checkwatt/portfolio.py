@@ -0,0 +1,190 @@
+"""Aggregation of the CheckWatt sites into a portfolio."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import partial
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DATA_PORTFOLIO, PORTFOLIO_MIN_SITES
+
+if TYPE_CHECKING:
+    from .coordinator import CheckwattCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+AGGREGATE_SUM = "sum"
+AGGREGATE_MEAN = "mean"
+
+# Portfolio metrics, with the coordinator of the site serving them and how
+# they are aggregated
+PORTFOLIO_METRICS: dict[str, tuple[str, str]] = {
+    "today_net_revenue": ("revenue", AGGREGATE_SUM),
+    "monthly_net_revenue": ("revenue", AGGREGATE_SUM),
+    "annual_net_revenue": ("revenue", AGGREGATE_SUM),
+    "battery_power": ("live", AGGREGATE_SUM),
+    "battery_soc": ("live", AGGREGATE_MEAN),
+}
+
+
+@callback
+def async_get_portfolio(hass: HomeAssistant) -> CheckwattPortfolio:
+    """Return the portfolio of all sites, creating it on first use."""
+    if (portfolio := hass.data.get(DATA_PORTFOLIO)) is None:
+        portfolio = hass.data[DATA_PORTFOLIO] = CheckwattPortfolio(hass)
+    return portfolio
+
+
+class CheckwattPortfolio:
+    """Running sums of the metrics of all sites.
+
+    Each site update replaces the contribution of that site to the sums, so
+    an update costs the same regardless of the number of sites. The entities
+    of the portfolio are added through the platform of one of the entries,
+    and moved to another entry when that one is unloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty portfolio."""
+        self.hass = hass
+        self.sites: dict[str, dict[str, float | None]] = {}
+        self.totals: dict[str, float] = dict.fromkeys(PORTFOLIO_METRICS, 0.0)
+        self.counts: dict[str, int] = dict.fromkeys(PORTFOLIO_METRICS, 0)
+        self._site_entries: dict[str, set[str]] = {}
+        self._unsub_sites: dict[str, list[CALLBACK_TYPE]] = {}
+        self._adders: dict[str, AddEntitiesCallback] = {}
+        self._owner: str | None = None
+        self._entities: list[Entity] = []
+        self._entity_factory: Callable[[CheckwattPortfolio], list[Entity]] | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_site(
+        self,
+        entry_id: str,
+        hub: CheckwattCoordinator,
+        async_add_entities: AddEntitiesCallback,
+        entity_factory: Callable[[CheckwattPortfolio], list[Entity]],
+    ) -> CALLBACK_TYPE:
+        """Add the site of an entry, return the callback removing it."""
+        site = str(hub.data["id"])
+        self._adders[entry_id] = async_add_entities
+        self._entity_factory = entity_factory
+        entries = self._site_entries.setdefault(site, set())
+        if not entries:
+            _LOGGER.debug("Adding site %s to the portfolio", site)
+            self.sites[site] = dict.fromkeys(PORTFOLIO_METRICS)
+            update = partial(self._async_update_site, site, hub)
+            self._unsub_sites[site] = [
+                hub.async_add_listener(update),
+                hub.revenue.async_add_listener(update),
+            ]
+            self._async_update_site(site, hub)
+        entries.add(entry_id)
+        self._async_sync_entities()
+        return partial(self._async_remove_site, entry_id, site)
+
+    @callback
+    def _async_remove_site(self, entry_id: str, site: str) -> None:
+        """Remove the site of an unloaded entry."""
+        self._adders.pop(entry_id, None)
+        if entry_id == self._owner:
+            # The entities were removed with the platform of the entry
+            self._owner = None
+            self._entities = []
+
+        entries = self._site_entries[site]
+        entries.discard(entry_id)
+        if not entries:
+            _LOGGER.debug("Removing site %s from the portfolio", site)
+            del self._site_entries[site]
+            for unsub in self._unsub_sites.pop(site):
+                unsub()
+            self._async_set_values(site, dict.fromkeys(PORTFOLIO_METRICS))
+            del self.sites[site]
+        self._async_sync_entities()
+        self._async_notify()
+
+    @callback
+    def _async_update_site(self, site: str, hub: CheckwattCoordinator) -> None:
+        """Replace the contribution of a site with its latest data."""
+        sources = {"live": hub.data or {}, "revenue": hub.revenue.data or {}}
+        values = {
+            key: sources[source].get(key)
+            for key, (source, _) in PORTFOLIO_METRICS.items()
+        }
+        if self._async_set_values(site, values):
+            self._async_notify()
+
+    @callback
+    def _async_set_values(self, site: str, values: dict[str, float | None]) -> bool:
+        """Update the sums with the values of a site, return True if changed."""
+        current = self.sites[site]
+        changed = False
+        for key, new in values.items():
+            if (old := current[key]) == new:
+                continue
+            if old is not None:
+                self.totals[key] -= old
+                self.counts[key] -= 1
+            if new is not None:
+                self.totals[key] += new
+                self.counts[key] += 1
+            if not self.counts[key]:
+                # Drop the rounding errors left by the removed values
+                self.totals[key] = 0.0
+            current[key] = new
+            changed = True
+        return changed
+
+    def value(self, key: str) -> float | None:
+        """Return the aggregated value of a metric."""
+        if not (count := self.counts[key]):
+            return None
+        if PORTFOLIO_METRICS[key][1] == AGGREGATE_MEAN:
+            return self.totals[key] / count
+        return self.totals[key]
+
+    @callback
+    def _async_sync_entities(self) -> None:
+        """Add or remove the entities as the number of sites changes."""
+        if len(self.sites) < PORTFOLIO_MIN_SITES:
+            if self._entities:
+                # The registry entries are kept for the entities to come back
+                # with their customizations
+                _LOGGER.debug("Removing the portfolio entities")
+                for entity in self._entities:
+                    if entity.hass is not None:
+                        self.hass.async_create_task(entity.async_remove())
+                self._entities = []
+                self._owner = None
+            return
+
+        if self._entities or not self._adders or self._entity_factory is None:
+            return
+        _LOGGER.debug("Adding the portfolio entities of %d sites", len(self.sites))
+        self._owner, async_add_entities = next(iter(self._adders.items()))
+        self._entities = self._entity_factory(self)
+        async_add_entities(self._entities)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for changes of the portfolio, return the callback to stop."""
+        self._listeners.append(update_callback)
+        return partial(self._listeners.remove, update_callback)
+
+    @callback
+    def _async_notify(self) -> None:
+        """Notify the listeners of a change."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the attributes shared by the portfolio entities."""
+        return {"sites": len(self.sites)}
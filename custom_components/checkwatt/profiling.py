@@ -0,0 +1,123 @@
+"""Profiling of the update cycles of the CheckWatt coordinators."""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+if TYPE_CHECKING:
+    from .coordinator import CheckwattDataCoordinator
+
+
+def _top_functions(profiler: cProfile.Profile, top: int) -> list[dict[str, Any]]:
+    """Return the functions with the most cumulative time."""
+    stats = pstats.Stats(profiler)
+    rows = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][3],
+        reverse=True,
+    )
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "total_time": round(total_time, 4),
+            "cumulative_time": round(cumulative_time, 4),
+        }
+        for (filename, line, name), (
+            _,
+            calls,
+            total_time,
+            cumulative_time,
+            _,
+        ) in rows[:top]
+    ]
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    """Take a snapshot of the allocations, leaving out the ones of tracemalloc."""
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+
+
+def _growth(
+    first: tracemalloc.Snapshot, last: tracemalloc.Snapshot, top: int
+) -> list[dict[str, Any]]:
+    """Return the lines whose allocations grew the most between the snapshots."""
+    return [
+        {
+            "line": str(stat.traceback),
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+            "size": stat.size,
+        }
+        for stat in last.compare_to(first, "lineno")[:top]
+        if stat.size_diff > 0
+    ]
+
+
+async def async_profile_cycles(
+    hass: HomeAssistant,
+    coordinators: list[CheckwattDataCoordinator],
+    cycles: int = 1,
+    top: int = 20,
+) -> dict[str, Any]:
+    """Run update cycles of the coordinators under a profiler.
+
+    The wall time of a cycle that is not spent on the CPU of the event loop
+    is spent awaiting I/O. The allocations are compared between the first
+    and the last cycle to show what grows from one cycle to the next.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    profiler = cProfile.Profile()
+    per_cycle: list[dict[str, float]] = []
+    snapshots: list[tracemalloc.Snapshot] = []
+    try:
+        for _ in range(cycles):
+            wall = time.perf_counter()
+            cpu = time.thread_time()
+            profiler.enable()
+            try:
+                for coordinator in coordinators:
+                    await coordinator.async_refresh()
+            finally:
+                profiler.disable()
+            cpu = time.thread_time() - cpu
+            wall = time.perf_counter() - wall
+            per_cycle.append(
+                {
+                    "wall_time": round(wall, 4),
+                    "cpu_time": round(cpu, 4),
+                    "io_wait_time": round(max(wall - cpu, 0.0), 4),
+                }
+            )
+            snapshots.append(await hass.async_add_executor_job(_snapshot))
+        traced, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    wall = sum(cycle["wall_time"] for cycle in per_cycle)
+    cpu = sum(cycle["cpu_time"] for cycle in per_cycle)
+    return {
+        "coordinators": [coordinator.short_name for coordinator in coordinators],
+        "cycles": per_cycle,
+        "wall_time": round(wall, 4),
+        "cpu_time": round(cpu, 4),
+        "io_wait_share": round(max(wall - cpu, 0.0) / wall, 3) if wall else None,
+        "top_functions": _top_functions(profiler, top),
+        "memory_growth": (
+            _growth(snapshots[0], snapshots[-1], top) if len(snapshots) > 1 else []
+        ),
+        "traced_memory": traced,
+        "traced_memory_peak": peak,
+    }
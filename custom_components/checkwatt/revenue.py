@@ -0,0 +1,137 @@
+"""Local aggregation of the CheckWatt FCR-D net revenue."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+
+class RevenueLedger:
+    """Settled daily net revenue with running monthly and annual sums.
+
+    Only today's revenue can still change, so settled days are kept locally
+    and the monthly and annual totals are derived as running sums. A
+    reconciliation with the totals from EnergyInBalance resets the sums to
+    guard against drift.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty ledger."""
+        self.day: date | None = None
+        self.today: float | None = None
+        self.tomorrow: float | None = None
+        self.daily: dict[str, float] = {}
+        self.month_settled = 0.0
+        self.year_prior = 0.0
+        self.reconciled: date | None = None
+
+    def needs_reconcile(self, today: date, hour: int, reconcile_hour: int) -> bool:
+        """Return True if the sums shall be reconciled with EnergyInBalance."""
+        if self.reconciled is None or (today - self.reconciled).days > 1:
+            return True
+        if self.reconciled.year != today.year:
+            return True
+        return self.reconciled != today and hour >= reconcile_hour
+
+    def reconcile(
+        self,
+        today: date,
+        month_days: dict[str, float],
+        year_total: float,
+        today_revenue: float,
+    ) -> None:
+        """Reset the sums from the revenue series and totals of EnergyInBalance.
+
+        month_days holds the revenue per day of the current month, which may
+        leave out today, and year_total the annual revenue including today.
+        today_revenue is the revenue of today fetched with the totals.
+        """
+        self._roll_over(today)
+        server_today = month_days.pop(today.isoformat(), today_revenue)
+        self.daily = month_days
+        self.month_settled = sum(month_days.values())
+        self.year_prior = year_total - self.month_settled - server_today
+        if self.today is None:
+            self.today = server_today
+        self.reconciled = today
+
+    def update_today(self, today: date, revenue: float, tomorrow: float) -> None:
+        """Update the running revenue of today, settling the days passed."""
+        self._roll_over(today)
+        self.today = revenue
+        self.tomorrow = tomorrow
+
+    def _roll_over(self, today: date) -> None:
+        """Settle the days that have passed since the last update."""
+        if self.day is None:
+            self.day = today
+            return
+
+        while self.day < today:
+            # Only the first day passed has a known value, the other days are
+            # left for the next reconciliation to fill in
+            if self.today is not None:
+                self._settle(self.day, self.today)
+            self.today = None
+            self.tomorrow = None
+
+            next_day = self.day + timedelta(days=1)
+            if next_day.year != self.day.year:
+                self.year_prior = 0.0
+                self._new_month()
+            elif next_day.month != self.day.month:
+                self.year_prior += self.month_settled
+                self._new_month()
+            self.day = next_day
+
+    def _settle(self, day: date, revenue: float) -> None:
+        """Store the final revenue of a day."""
+        key = day.isoformat()
+        self.month_settled += revenue - self.daily.get(key, 0.0)
+        self.daily[key] = revenue
+
+    def _new_month(self) -> None:
+        """Start aggregating a new month."""
+        self.daily = {}
+        self.month_settled = 0.0
+
+    @property
+    def monthly(self) -> float | None:
+        """Return the net revenue of the month, including today."""
+        if self.reconciled is None:
+            return None
+        return self.month_settled + (self.today or 0.0)
+
+    @property
+    def annual(self) -> float | None:
+        """Return the net revenue of the year, including today."""
+        if self.reconciled is None:
+            return None
+        return self.year_prior + self.month_settled + (self.today or 0.0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the ledger as a dictionary for storage."""
+        return {
+            "day": self.day.isoformat() if self.day else None,
+            "today": self.today,
+            "tomorrow": self.tomorrow,
+            "daily": self.daily,
+            "month_settled": self.month_settled,
+            "year_prior": self.year_prior,
+            "reconciled": self.reconciled.isoformat() if self.reconciled else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RevenueLedger:
+        """Restore a ledger from storage."""
+        ledger = cls()
+        if data.get("day"):
+            ledger.day = date.fromisoformat(data["day"])
+        ledger.today = data.get("today")
+        ledger.tomorrow = data.get("tomorrow")
+        ledger.daily = dict(data.get("daily", {}))
+        ledger.month_settled = data.get("month_settled", 0.0)
+        ledger.year_prior = data.get("year_prior", 0.0)
+        if data.get("reconciled"):
+            ledger.reconciled = date.fromisoformat(data["reconciled"])
+        return ledger
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import partial
 import logging
 
 from homeassistant.components.sensor import (
@@ -12,37 +13,59 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfEnergy
+from homeassistant.const import (
+    PERCENTAGE,
+    Platform,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from . import CheckwattCoordinator, CheckwattResp
 from .const import (
     ATTRIBUTION,
     C_ADR,
     C_BATTERY_POWER,
     C_CHARGE_PEAK_AC,
     C_CHARGE_PEAK_DC,
+    C_CHEAPEST_HOUR,
     C_CITY,
     C_CM10_VERSION,
+    C_CYCLE_DURATION,
     C_DAILY_AVERAGE,
     C_DISCHARGE_PEAK_AC,
     C_DISCHARGE_PEAK_DC,
     C_DISPLAY_NAME,
+    C_DOD_DISTRIBUTION,
     C_DSO,
     C_ENERGY_PROVIDER,
     C_FCRD_DATE,
     C_FCRD_INFO,
+    C_FCRD_RECENT_TRANSITIONS,
     C_FCRD_STATUS,
+    C_GRID_PEAK_HOUR_AVERAGE,
+    C_GRID_PEAK_TOP,
+    C_GRID_PEAK_TOP_AVERAGE,
     C_GRID_POWER,
+    C_MISSED_CALLS,
     C_MONTH_ESITIMATE,
+    C_MONTH_ESTIMATE_HIGH,
+    C_MONTH_ESTIMATE_LOW,
     C_MONTHLY_GRID_PEAK_POWER,
+    C_MOST_EXPENSIVE_HOUR,
     C_NEXT_UPDATE_TIME,
+    C_OVERRUN_CYCLES,
     C_PRICE_ZONE,
     C_RESELLER_ID,
+    C_SKIPPED_CYCLES,
     C_SOLAR_POWER,
+    C_SPOT_PRICE_RESOLUTION,
+    C_STALE_ENDPOINTS,
     C_TOMORROW_REVENUE,
     C_UPDATE_TIME,
     C_VAT,
@@ -51,10 +74,24 @@ from .const import (
     CONF_CM10_SENSOR,
     CONF_POWER_SENSORS,
     DOMAIN,
+    FCRD_ACTIVATED,
+    FCRD_DEACTIVATED,
+    FCRD_FAILED,
     MANUFACTURER,
+    PORTFOLIO_DEVICE_ID,
+)
+from .coordinator import (
+    CheckwattCoordinator,
+    CheckwattDataCoordinator,
+    CheckwattDeviceCoordinator,
+    CheckwattResp,
 )
+from .periods import PERIODS
+from .portfolio import CheckwattPortfolio, async_get_portfolio
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
+# Number of FCR-D transitions shown as attribute
+FCRD_RECENT_TRANSITIONS = 5
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -152,6 +189,187 @@ CHECKWATT_ENERGY_SENSORS: dict[str, SensorEntityDescription] = {
 }
 
 
+CHECKWATT_BATTERY_SENSORS: dict[str, SensorEntityDescription] = {
+    "battery_equivalent_full_cycles": SensorEntityDescription(
+        key="battery_cycles",
+        name="Battery Equivalent Full Cycles",
+        icon="mdi:battery-sync",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key="battery_cycles_sensor",
+    ),
+    "battery_throughput_today": SensorEntityDescription(
+        key="battery_throughput",
+        name="Battery Throughput Today",
+        icon="mdi:battery-charging-high",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key="battery_throughput_sensor",
+    ),
+}
+
+
+# FCR-D statistics, keyed by data key and the state of the time in state ones
+CHECKWATT_FCRD_SENSORS: dict[tuple[str, str | None], SensorEntityDescription] = {
+    ("fcrd_activations", None): SensorEntityDescription(
+        key="fcrd_activations",
+        name="FCR-D Activations",
+        icon="mdi:battery-arrow-up",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key="fcrd_activations_sensor",
+    ),
+    ("fcrd_failed_activation_rate", None): SensorEntityDescription(
+        key="fcrd_failed_activation_rate",
+        name="FCR-D Failed Activation Rate",
+        icon="mdi:battery-alert",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        translation_key="fcrd_failed_activation_rate_sensor",
+    ),
+    ("fcrd_mean_time_to_reactivation", None): SensorEntityDescription(
+        key="fcrd_mean_time_to_reactivation",
+        name="FCR-D Mean Time to Reactivation",
+        icon="mdi:timer-refresh-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        translation_key="fcrd_mean_time_to_reactivation_sensor",
+    ),
+    ("fcrd_time_in_state", FCRD_ACTIVATED): SensorEntityDescription(
+        key="fcrd_time_activated",
+        name="FCR-D Time Activated",
+        icon="mdi:timer-check-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key="fcrd_time_activated_sensor",
+    ),
+    ("fcrd_time_in_state", FCRD_DEACTIVATED): SensorEntityDescription(
+        key="fcrd_time_deactivated",
+        name="FCR-D Time Deactivated",
+        icon="mdi:timer-pause-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key="fcrd_time_deactivated_sensor",
+    ),
+    ("fcrd_time_in_state", FCRD_FAILED): SensorEntityDescription(
+        key="fcrd_time_failed",
+        name="FCR-D Time Failed",
+        icon="mdi:timer-alert-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key="fcrd_time_failed_sensor",
+    ),
+}
+
+
+# Sensors of the portfolio device, keyed by the portfolio metric
+CHECKWATT_PORTFOLIO_SENSORS: dict[str, SensorEntityDescription] = {
+    "today_net_revenue": SensorEntityDescription(
+        key="portfolio_daily_yield",
+        name="Portfolio Daily Yield",
+        icon="mdi:account-cash",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement="SEK",
+        state_class=SensorStateClass.TOTAL,
+        translation_key="portfolio_daily_yield_sensor",
+    ),
+    "monthly_net_revenue": SensorEntityDescription(
+        key="portfolio_monthly_yield",
+        name="Portfolio Monthly Yield",
+        icon="mdi:account-cash-outline",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement="SEK",
+        state_class=SensorStateClass.TOTAL,
+        translation_key="portfolio_monthly_yield_sensor",
+    ),
+    "annual_net_revenue": SensorEntityDescription(
+        key="portfolio_annual_yield",
+        name="Portfolio Annual Yield",
+        icon="mdi:cash-multiple",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement="SEK",
+        state_class=SensorStateClass.TOTAL,
+        translation_key="portfolio_annual_yield_sensor",
+    ),
+    "battery_power": SensorEntityDescription(
+        key="portfolio_battery_power",
+        name="Portfolio Battery Power",
+        icon="mdi:battery-charging",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        translation_key="portfolio_battery_power_sensor",
+    ),
+    "battery_soc": SensorEntityDescription(
+        key="portfolio_battery_soc",
+        name="Portfolio Average Battery SoC",
+        icon="mdi:battery-medium",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        translation_key="portfolio_battery_soc_sensor",
+    ),
+}
+
+
+# Daily, weekly and monthly counters of the energy sensors
+CHECKWATT_ENERGY_PERIOD_SENSORS: dict[tuple[str, str], SensorEntityDescription] = {
+    (data_key, period): SensorEntityDescription(
+        key=f"{description.key}_{period}",
+        name=f"{description.name} {period.capitalize()}",
+        icon=description.icon,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key=f"{description.translation_key}_{period}",
+    )
+    for data_key, description in CHECKWATT_ENERGY_SENSORS.items()
+    for period in PERIODS
+}
+
+
+CHECKWATT_ENERGY_VALUE_SENSORS: dict[str, SensorEntityDescription] = {
+    "import_cost_today": SensorEntityDescription(
+        key="import_cost_today",
+        name="Import Cost Today",
+        icon="mdi:cash-minus",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement="SEK",
+        state_class=SensorStateClass.TOTAL,
+        translation_key="import_cost_today_sensor",
+    ),
+    "export_value_today": SensorEntityDescription(
+        key="export_value_today",
+        name="Export Value Today",
+        icon="mdi:cash-plus",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement="SEK",
+        state_class=SensorStateClass.TOTAL,
+        translation_key="export_value_today_sensor",
+    ),
+    "import_cost_month": SensorEntityDescription(
+        key="import_cost_month",
+        name="Import Cost Month",
+        icon="mdi:cash-minus",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement="SEK",
+        state_class=SensorStateClass.TOTAL,
+        translation_key="import_cost_month_sensor",
+    ),
+    "export_value_month": SensorEntityDescription(
+        key="export_value_month",
+        name="Export Value Month",
+        icon="mdi:cash-plus",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement="SEK",
+        state_class=SensorStateClass.TOTAL,
+        translation_key="export_value_month_sensor",
+    ),
+}
+
+
 CHECKWATT_SPOTPRICE_SENSORS: dict[str, SensorEntityDescription] = {
     "excl_vat": SensorEntityDescription(
         key="spot_price",
@@ -173,44 +391,204 @@ CHECKWATT_SPOTPRICE_SENSORS: dict[str, SensorEntityDescription] = {
     ),
 }
 
+# Sensor groups depending on the options, with the option enabling them and
+# the data key telling that their coordinator has fetched their data
+CHECKWATT_OPTIONAL_SENSORS: dict[str, tuple[str, str]] = {
+    "cm10": (CONF_CM10_SENSOR, "cm10_status"),
+    "energy": (CONF_POWER_SENSORS, "total_solar_energy"),
+    "energy_periods": (CONF_POWER_SENSORS, "energy_periods"),
+    "energy_value": (CONF_POWER_SENSORS, "import_cost_today"),
+    "spot": (CONF_POWER_SENSORS, "spot_price"),
+}
+
+# Keys of the sensors depending on the options
+CHECKWATT_OPTIONAL_SENSOR_KEYS = {
+    CHECKWATT_MONETARY_SENSORS["cm10"].key,
+    *(description.key for description in CHECKWATT_ENERGY_SENSORS.values()),
+    *(description.key for description in CHECKWATT_ENERGY_PERIOD_SENSORS.values()),
+    *(description.key for description in CHECKWATT_ENERGY_VALUE_SENSORS.values()),
+    *(description.key for description in CHECKWATT_SPOTPRICE_SENSORS.values()),
+}
+
+
+def _optional_coordinator(
+    coordinator: CheckwattCoordinator, group: str
+) -> CheckwattDataCoordinator:
+    """Return the coordinator of a sensor group that depends on the options."""
+    if group == "cm10":
+        return coordinator.device
+    if group == "spot":
+        return coordinator.spot
+    return coordinator
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the CheckWatt sensor."""
     coordinator: CheckwattCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities: list[AbstractCheckwattSensor] = []
     checkwatt_data: CheckwattResp = coordinator.data
-    use_power_sensors = entry.options.get(CONF_POWER_SENSORS)
-    use_cm10_sensor = entry.options.get(CONF_CM10_SENSOR)
-
-    _LOGGER.debug("Setting up CheckWatt sensor for %s", checkwatt_data["display_name"])
-    for key, description in CHECKWATT_MONETARY_SENSORS.items():
-        if key == "daily":
-            entities.append(CheckwattSensor(coordinator, description))
-        elif key == "monthly":
-            entities.append(CheckwattMonthlySensor(coordinator, description))
-        elif key == "annual":
-            entities.append(CheckwattAnnualSensor(coordinator, description))
-        elif key == "battery":
-            entities.append(CheckwattBatterySoCSensor(coordinator, description))
-        elif key == "cm10" and use_cm10_sensor:
-            entities.append(CheckwattCM10Sensor(coordinator, description))
-
-    if use_power_sensors:
+
+    @callback
+    def async_add_account_sensors() -> None:
+        """Add the sensors of the account, shared by its entries."""
+        entities: list[AbstractCheckwattSensor] = []
+        # Each sensor listens to the coordinator of the data it displays
+        _LOGGER.debug(
+            "Setting up CheckWatt sensor for %s", checkwatt_data["display_name"]
+        )
+        for key, description in CHECKWATT_MONETARY_SENSORS.items():
+            if key == "daily":
+                entities.append(CheckwattSensor(coordinator.revenue, description))
+            elif key == "monthly":
+                entities.append(
+                    CheckwattMonthlySensor(coordinator.revenue, description)
+                )
+            elif key == "annual":
+                entities.append(CheckwattAnnualSensor(coordinator.revenue, description))
+            elif key == "battery":
+                entities.append(CheckwattBatterySoCSensor(coordinator, description))
+        for data_key, description in CHECKWATT_BATTERY_SENSORS.items():
+            entities.append(
+                CheckwattBatteryCycleSensor(coordinator, description, data_key)
+            )
+        for (data_key, fcrd_state), description in CHECKWATT_FCRD_SENSORS.items():
+            entities.append(
+                CheckwattFCRDSensor(
+                    coordinator.device, description, data_key, fcrd_state
+                )
+            )
+
+        async_add_entities(entities, True)
+
+    entry.async_on_unload(
+        coordinator.async_add_account_entities(
+            Platform.SENSOR, entry.entry_id, async_add_account_sensors
+        )
+    )
+
+    # The portfolio sensors are added through one of the entries once there
+    # are several sites
+    entry.async_on_unload(
+        async_get_portfolio(hass).async_add_site(
+            entry.entry_id, coordinator, async_add_entities, _create_portfolio_sensors
+        )
+    )
+
+    # Sensors depending on the options are added and removed in place as the
+    # options change, the coordinators fetch the data they need on next cycle.
+    # They belong to their entry, as the entries of an account may have
+    # different options.
+    await er.async_migrate_entries(
+        hass,
+        entry.entry_id,
+        partial(_scope_unique_id, entry.entry_id, str(checkwatt_data["id"])),
+    )
+    optional_entities: dict[str, list[AbstractCheckwattSensor]] = {}
+
+    @callback
+    def async_update_optional_sensors() -> None:
+        """Add or remove the sensors depending on the options."""
+        new_entities: list[AbstractCheckwattSensor] = []
+        for group, (option, data_key) in CHECKWATT_OPTIONAL_SENSORS.items():
+            enabled = bool(entry.options.get(option))
+            group_coordinator = _optional_coordinator(coordinator, group)
+            if (
+                enabled
+                and group not in optional_entities
+                and data_key in group_coordinator.data
+            ):
+                optional_entities[group] = _create_optional_sensors(
+                    group_coordinator, group, entry.entry_id
+                )
+                new_entities.extend(optional_entities[group])
+            elif not enabled and group in optional_entities:
+                # The registry entries are kept, for the customizations of the
+                # sensors to come back with the group
+                _LOGGER.debug("Removing CheckWatt %s sensors", group)
+                for entity in optional_entities.pop(group):
+                    if entity.hass is not None:
+                        hass.async_create_task(entity.async_remove())
+
+        if new_entities:
+            async_add_entities(new_entities, True)
+
+    async_update_optional_sensors()
+    for group in CHECKWATT_OPTIONAL_SENSORS:
+        entry.async_on_unload(
+            _optional_coordinator(coordinator, group).async_add_listener(
+                async_update_optional_sensors
+            )
+        )
+
+
+def _scope_unique_id(
+    entry_id: str, site_id: str, registry_entry: er.RegistryEntry
+) -> dict[str, str] | None:
+    """Return the unique ID of a sensor of the options scoped to its entry."""
+    for key in CHECKWATT_OPTIONAL_SENSOR_KEYS:
+        if registry_entry.unique_id == f"checkwattUid_{key}_{site_id}":
+            return {"new_unique_id": f"{registry_entry.unique_id}_{entry_id}"}
+    return None
+
+
+def _create_optional_sensors(
+    coordinator: CheckwattDataCoordinator, group: str, entry_id: str
+) -> list[AbstractCheckwattSensor]:
+    """Create the sensors of a group that depends on the options of an entry."""
+    entities: list[AbstractCheckwattSensor] = []
+    if group == "cm10":
+        entities.append(
+            CheckwattCM10Sensor(
+                coordinator, CHECKWATT_MONETARY_SENSORS["cm10"], entry_id
+            )
+        )
+    elif group == "energy":
         _LOGGER.debug(
-            "Setting up detailed CheckWatt sensors for %s",
-            checkwatt_data["display_name"],
+            "Setting up energy CheckWatt sensors for %s",
+            coordinator.data["display_name"],
         )
         for data_key, description in CHECKWATT_ENERGY_SENSORS.items():
-            entities.append(CheckwattEnergySensor(coordinator, description, data_key))
+            entities.append(
+                CheckwattEnergySensor(coordinator, description, data_key, entry_id)
+            )
+    elif group == "energy_periods":
+        for (data_key, period), description in CHECKWATT_ENERGY_PERIOD_SENSORS.items():
+            entities.append(
+                CheckwattEnergyPeriodSensor(
+                    coordinator, description, data_key, period, entry_id
+                )
+            )
+    elif group == "energy_value":
+        for data_key, description in CHECKWATT_ENERGY_VALUE_SENSORS.items():
+            entities.append(
+                CheckwattEnergyValueSensor(coordinator, description, data_key, entry_id)
+            )
+    elif group == "spot":
+        _LOGGER.debug(
+            "Setting up spot price CheckWatt sensors for %s",
+            coordinator.data["display_name"],
+        )
         for vat_key, description in CHECKWATT_SPOTPRICE_SENSORS.items():
-            entities.append(CheckwattSpotPriceSensor(coordinator, description, vat_key))
+            entities.append(
+                CheckwattSpotPriceSensor(coordinator, description, vat_key, entry_id)
+            )
+    return entities
+
 
-    async_add_entities(entities, True)
+def _create_portfolio_sensors(
+    portfolio: CheckwattPortfolio,
+) -> list[CheckwattPortfolioSensor]:
+    """Create the sensors of the portfolio device."""
+    return [
+        CheckwattPortfolioSensor(portfolio, description, metric)
+        for metric, description in CHECKWATT_PORTFOLIO_SENSORS.items()
+    ]
 
 
-class AbstractCheckwattSensor(CoordinatorEntity[CheckwattCoordinator], SensorEntity):
+class AbstractCheckwattSensor(
+    CoordinatorEntity[CheckwattDataCoordinator], SensorEntity
+):
     """Abstract class for an CheckWatt sensor."""
 
     _attr_attribution = ATTRIBUTION
@@ -218,10 +596,11 @@ class AbstractCheckwattSensor(CoordinatorEntity[CheckwattCoordinator], SensorEnt
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDataCoordinator,
         description: SensorEntityDescription,
+        entry_id: str | None = None,
     ) -> None:
-        """Initialize the sensor."""
+        """Initialize the sensor, of an entry if it depends on its options."""
         _LOGGER.debug("Creating %s sensor", description.name)
         super().__init__(coordinator)
         self._coordinator = coordinator
@@ -232,6 +611,8 @@ class AbstractCheckwattSensor(CoordinatorEntity[CheckwattCoordinator], SensorEnt
         self._attr_unique_id = (
             f'checkwattUid_{description.key}_{coordinator.data["id"]}'
         )
+        if entry_id is not None:
+            self._attr_unique_id += f"_{entry_id}"
         self._attr_extra_state_attributes = {}
 
     @property
@@ -251,7 +632,7 @@ class CheckwattSensor(AbstractCheckwattSensor):
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDataCoordinator,
         description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
@@ -295,6 +676,16 @@ class CheckwattSensor(AbstractCheckwattSensor):
             self._attr_extra_state_attributes.update(
                 {C_NEXT_UPDATE_TIME: self._coordinator.data["next_update_time"]}
             )
+        diagnostics = self._coordinator.hub.diagnostics
+        self._attr_extra_state_attributes.update(
+            {
+                C_STALE_ENDPOINTS: diagnostics["stale_endpoints"],
+                C_CYCLE_DURATION: diagnostics["cycle_duration"],
+                C_MISSED_CALLS: diagnostics["missed_calls"],
+                C_OVERRUN_CYCLES: diagnostics["overrun_cycles"],
+                C_SKIPPED_CYCLES: diagnostics["skipped_cycles"],
+            }
+        )
 
         self._attr_available = False
 
@@ -313,6 +704,16 @@ class CheckwattSensor(AbstractCheckwattSensor):
             self._attr_extra_state_attributes.update(
                 {C_NEXT_UPDATE_TIME: self._coordinator.data["next_update_time"]}
             )
+        diagnostics = self._coordinator.hub.diagnostics
+        self._attr_extra_state_attributes.update(
+            {
+                C_STALE_ENDPOINTS: diagnostics["stale_endpoints"],
+                C_CYCLE_DURATION: diagnostics["cycle_duration"],
+                C_MISSED_CALLS: diagnostics["missed_calls"],
+                C_OVERRUN_CYCLES: diagnostics["overrun_cycles"],
+                C_SKIPPED_CYCLES: diagnostics["skipped_cycles"],
+            }
+        )
         if "tomorrow_net_revenue" in self._coordinator.data:
             self._attr_extra_state_attributes.update(
                 {C_TOMORROW_REVENUE: self._coordinator.data["tomorrow_net_revenue"]}
@@ -332,7 +733,7 @@ class CheckwattMonthlySensor(AbstractCheckwattSensor):
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDataCoordinator,
         description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
@@ -347,6 +748,17 @@ class CheckwattMonthlySensor(AbstractCheckwattSensor):
             self._attr_extra_state_attributes.update(
                 {C_MONTH_ESITIMATE: round(self._coordinator.data["month_estimate"], 2)}
             )
+        if "month_estimate_low" in self._coordinator.data:
+            self._attr_extra_state_attributes.update(
+                {
+                    C_MONTH_ESTIMATE_LOW: round(
+                        self._coordinator.data["month_estimate_low"], 2
+                    ),
+                    C_MONTH_ESTIMATE_HIGH: round(
+                        self._coordinator.data["month_estimate_high"], 2
+                    ),
+                }
+            )
         if "daily_average" in self._coordinator.data:
             self._attr_extra_state_attributes.update(
                 {C_DAILY_AVERAGE: round(self._coordinator.data["daily_average"], 2)}
@@ -364,6 +776,17 @@ class CheckwattMonthlySensor(AbstractCheckwattSensor):
             self._attr_extra_state_attributes.update(
                 {C_MONTH_ESITIMATE: round(self._coordinator.data["month_estimate"], 2)}
             )
+        if "month_estimate_low" in self._coordinator.data:
+            self._attr_extra_state_attributes.update(
+                {
+                    C_MONTH_ESTIMATE_LOW: round(
+                        self._coordinator.data["month_estimate_low"], 2
+                    ),
+                    C_MONTH_ESTIMATE_HIGH: round(
+                        self._coordinator.data["month_estimate_high"], 2
+                    ),
+                }
+            )
         if "daily_average" in self._coordinator.data:
             self._attr_extra_state_attributes.update(
                 {C_DAILY_AVERAGE: round(self._coordinator.data["daily_average"], 2)}
@@ -383,7 +806,7 @@ class CheckwattAnnualSensor(AbstractCheckwattSensor):
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDataCoordinator,
         description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
@@ -418,12 +841,15 @@ class CheckwattEnergySensor(AbstractCheckwattSensor):
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDataCoordinator,
         description: SensorEntityDescription,
         data_key,
+        entry_id: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, description=description)
+        super().__init__(
+            coordinator=coordinator, description=description, entry_id=entry_id
+        )
         self.data_key = data_key
 
     async def async_update(self) -> None:
@@ -442,17 +868,172 @@ class CheckwattEnergySensor(AbstractCheckwattSensor):
         return round(self._coordinator.data[self.data_key] / 1000, 2)
 
 
+class CheckwattBatteryCycleSensor(AbstractCheckwattSensor):
+    """Representation of a CheckWatt battery cycle or throughput sensor."""
+
+    def __init__(
+        self,
+        coordinator: CheckwattDataCoordinator,
+        description: SensorEntityDescription,
+        data_key,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, description=description)
+        self.data_key = data_key
+
+    async def async_update(self) -> None:
+        """Get the latest data and updates the states."""
+        self._attr_available = True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Get the latest data and updates the states."""
+        if (
+            self.data_key == "battery_equivalent_full_cycles"
+            and "battery_dod_distribution" in self._coordinator.data
+        ):
+            self._attr_extra_state_attributes.update(
+                {C_DOD_DISTRIBUTION: self._coordinator.data["battery_dod_distribution"]}
+            )
+        super()._handle_coordinator_update()
+
+    @property
+    def native_value(self) -> float | None:
+        """Get the latest state value."""
+        if self.data_key in self._coordinator.data:
+            return round(self._coordinator.data[self.data_key], 2)
+        return None
+
+
+class CheckwattFCRDSensor(AbstractCheckwattSensor):
+    """Representation of a CheckWatt FCR-D statistics sensor."""
+
+    _coordinator: CheckwattDeviceCoordinator
+
+    def __init__(
+        self,
+        coordinator: CheckwattDeviceCoordinator,
+        description: SensorEntityDescription,
+        data_key,
+        fcrd_state,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, description=description)
+        self.data_key = data_key
+        self.fcrd_state = fcrd_state
+
+    async def async_update(self) -> None:
+        """Get the latest data and updates the states."""
+        self._attr_available = True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Get the latest data and updates the states."""
+        if self.data_key == "fcrd_activations":
+            self._attr_extra_state_attributes.update(
+                {
+                    C_FCRD_RECENT_TRANSITIONS: list(
+                        self._coordinator.timeline.transitions
+                    )[-FCRD_RECENT_TRANSITIONS:]
+                }
+            )
+        super()._handle_coordinator_update()
+
+    @property
+    def native_value(self) -> float | None:
+        """Get the latest state value."""
+        if (value := self._coordinator.data.get(self.data_key)) is None:
+            return None
+        if self.data_key == "fcrd_time_in_state":
+            return value.get(self.fcrd_state, 0.0)
+        if self.data_key == "fcrd_failed_activation_rate":
+            return round(value * 100, 1)
+        if self.data_key == "fcrd_mean_time_to_reactivation":
+            return round(value / 60, 1)
+        return value
+
+
+class CheckwattEnergyPeriodSensor(AbstractCheckwattSensor):
+    """Representation of a CheckWatt Energy sensor of a day, week or month."""
+
+    def __init__(
+        self,
+        coordinator: CheckwattDataCoordinator,
+        description: SensorEntityDescription,
+        data_key,
+        period,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator, description=description, entry_id=entry_id
+        )
+        self.data_key = data_key
+        self.period = period
+
+    async def async_update(self) -> None:
+        """Get the latest data and updates the states."""
+        self._attr_available = True
+
+    @property
+    def native_value(self) -> float | None:
+        """Get the latest state value."""
+        periods = self._coordinator.data.get("energy_periods", {})
+        if (energy := periods.get(self.period, {}).get(self.data_key)) is None:
+            return None
+        return round(energy / 1000, 2)
+
+
+class CheckwattEnergyValueSensor(AbstractCheckwattSensor):
+    """Representation of a CheckWatt spot priced energy cost or value sensor."""
+
+    def __init__(
+        self,
+        coordinator: CheckwattDataCoordinator,
+        description: SensorEntityDescription,
+        data_key,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator, description=description, entry_id=entry_id
+        )
+        self.data_key = data_key
+
+    async def async_update(self) -> None:
+        """Get the latest data and updates the states."""
+        self._attr_available = True
+
+    @property
+    def last_reset(self) -> datetime:
+        """Return the start of the day or month the sum is reset at."""
+        start = dt_util.start_of_local_day()
+        if self.data_key.endswith("_month"):
+            start = start.replace(day=1)
+        return start
+
+    @property
+    def native_value(self) -> float | None:
+        """Get the latest state value."""
+        if self.data_key in self._coordinator.data:
+            return round(self._coordinator.data[self.data_key], 2)
+        return None
+
+
 class CheckwattSpotPriceSensor(AbstractCheckwattSensor):
     """Representation of a CheckWatt Spot-price sensor."""
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDataCoordinator,
         description: SensorEntityDescription,
         vat_key,
+        entry_id: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, description=description)
+        super().__init__(
+            coordinator=coordinator, description=description, entry_id=entry_id
+        )
         self.vat_key = vat_key
 
     async def async_update(self) -> None:
@@ -463,25 +1044,52 @@ class CheckwattSpotPriceSensor(AbstractCheckwattSensor):
             )
             if self.vat_key == "inc_vat":
                 self._attr_extra_state_attributes.update({C_VAT: "25%"})
+        if "spot_price_resolution" in self._coordinator.data:
+            self._attr_extra_state_attributes.update(
+                {
+                    C_SPOT_PRICE_RESOLUTION: self._coordinator.data[
+                        "spot_price_resolution"
+                    ],
+                    C_CHEAPEST_HOUR: self._coordinator.data["cheapest_hour"],
+                    C_MOST_EXPENSIVE_HOUR: self._coordinator.data[
+                        "most_expensive_hour"
+                    ],
+                }
+            )
         self._attr_available = True
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Get the latest data and updates the states."""
-        if self.vat_key == "inc_vat":
-            self._attr_native_value = round(
-                self._coordinator.data["spot_price"] * 1.25, 3
+        if "spot_price_resolution" in self._coordinator.data:
+            self._attr_extra_state_attributes.update(
+                {
+                    C_SPOT_PRICE_RESOLUTION: self._coordinator.data[
+                        "spot_price_resolution"
+                    ],
+                    C_CHEAPEST_HOUR: self._coordinator.data["cheapest_hour"],
+                    C_MOST_EXPENSIVE_HOUR: self._coordinator.data[
+                        "most_expensive_hour"
+                    ],
+                }
             )
-        else:
-            self._attr_native_value = self._coordinator.data["spot_price"]
         super()._handle_coordinator_update()
 
     @property
-    def native_value(self) -> str | None:
+    def available(self) -> bool:
+        """Return True if a spot price covers the current time."""
+        return (
+            super().available and self._coordinator.data.get("spot_price") is not None
+        )
+
+    @property
+    def native_value(self) -> float | None:
         """Get the latest state value."""
+        if (spot_price := self._coordinator.data.get("spot_price")) is None:
+            return None
         if self.vat_key == "inc_vat":
-            return round(self._coordinator.data["spot_price"] * 1.25, 3)
-        return round(self._coordinator.data["spot_price"], 3)
+            return round(spot_price * 1.25, 3)
+        return round(spot_price, 3)
 
 
 class CheckwattBatterySoCSensor(AbstractCheckwattSensor):
@@ -489,7 +1097,7 @@ class CheckwattBatterySoCSensor(AbstractCheckwattSensor):
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDataCoordinator,
         description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
@@ -533,6 +1141,18 @@ class CheckwattBatterySoCSensor(AbstractCheckwattSensor):
                     ]
                 }
             )
+        if "grid_peak_hour_average" in self._coordinator.data:
+            self._attr_extra_state_attributes.update(
+                {
+                    C_GRID_PEAK_HOUR_AVERAGE: self._coordinator.data[
+                        "grid_peak_hour_average"
+                    ],
+                    C_GRID_PEAK_TOP: self._coordinator.data["grid_peak_top"],
+                    C_GRID_PEAK_TOP_AVERAGE: self._coordinator.data[
+                        "grid_peak_top_average"
+                    ],
+                }
+            )
         self._attr_available = True
 
     @callback
@@ -576,6 +1196,18 @@ class CheckwattBatterySoCSensor(AbstractCheckwattSensor):
                     ]
                 }
             )
+        if "grid_peak_hour_average" in self._coordinator.data:
+            self._attr_extra_state_attributes.update(
+                {
+                    C_GRID_PEAK_HOUR_AVERAGE: self._coordinator.data[
+                        "grid_peak_hour_average"
+                    ],
+                    C_GRID_PEAK_TOP: self._coordinator.data["grid_peak_top"],
+                    C_GRID_PEAK_TOP_AVERAGE: self._coordinator.data[
+                        "grid_peak_top_average"
+                    ],
+                }
+            )
         super()._handle_coordinator_update()
 
     @property
@@ -589,11 +1221,14 @@ class CheckwattCM10Sensor(AbstractCheckwattSensor):
 
     def __init__(
         self,
-        coordinator: CheckwattCoordinator,
+        coordinator: CheckwattDataCoordinator,
         description: SensorEntityDescription,
+        entry_id: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, description=description)
+        super().__init__(
+            coordinator=coordinator, description=description, entry_id=entry_id
+        )
 
     async def async_update(self) -> None:
         """Get the latest data and updates the states."""
@@ -658,3 +1293,49 @@ class CheckwattCM10Sensor(AbstractCheckwattSensor):
             if cm10_status is not None:
                 return cm10_status.capitalize()
         return None
+
+
+class CheckwattPortfolioSensor(SensorEntity):
+    """Representation of a sensor aggregating all CheckWatt sites."""
+
+    _attr_attribution = ATTRIBUTION
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        portfolio: CheckwattPortfolio,
+        description: SensorEntityDescription,
+        metric: str,
+    ) -> None:
+        """Initialize the sensor."""
+        _LOGGER.debug("Creating %s sensor", description.name)
+        self._portfolio = portfolio
+        self.metric = metric
+        self.entity_description = description
+        self._attr_unique_id = f"checkwattUid_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, PORTFOLIO_DEVICE_ID)},
+            manufacturer=MANUFACTURER,
+            model="Portfolio",
+            name="CheckWatt Portfolio",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for changes of the portfolio."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._portfolio.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Get the latest state value."""
+        if (value := self._portfolio.value(self.metric)) is None:
+            return None
+        return round(value, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the number of sites in the portfolio."""
+        return self._portfolio.attributes
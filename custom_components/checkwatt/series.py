@@ -0,0 +1,47 @@
+"""Buffered recent samples of the live power data."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any
+
+# Columns of the series besides the time
+SERIES_KEYS = ["battery_power", "grid_power", "solar_power", "battery_soc"]
+
+
+class PowerSeries:
+    """Bounded columnar series of the power and state of charge samples.
+
+    Each column is a ring of the latest samples. Samples are numbered as they
+    are added, so a reader asks for the samples after the last one it has
+    and gets only the appended ones, in time proportional to their number.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty series."""
+        self.columns: dict[str, deque[Any]] = {
+            key: deque(maxlen=size) for key in ["time", *SERIES_KEYS]
+        }
+        # Number of the next sample
+        self.next = 0
+
+    def add(self, now: datetime, values: dict[str, Any]) -> None:
+        """Add a sample of the values at now."""
+        self.columns["time"].append(int(now.timestamp()))
+        for key in SERIES_KEYS:
+            self.columns[key].append(values.get(key))
+        self.next += 1
+
+    def since(self, first: int = 0) -> dict[str, Any]:
+        """Return the kept samples numbered from first on, column by column."""
+        count = max(min(self.next - first, len(self.columns["time"])), 0)
+        return {
+            "first": self.next - count,
+            "next": self.next,
+            "columns": {
+                key: list(islice(reversed(column), count))[::-1]
+                for key, column in self.columns.items()
+            },
+        }
@@ -0,0 +1,181 @@
+"""Indexed search of the CheckWatt spot price curve."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+import operator
+from typing import Any
+
+HOUR = timedelta(hours=1)
+QUARTER = timedelta(minutes=15)
+
+
+class SpotPriceIndex:
+    """Index over a published spot price curve.
+
+    The index is built once per price publication. Contiguous windows are
+    searched through prefix sums and a sparse table per window length, built
+    on first use, so a window query is answered in constant time. Slots are
+    ranked once for the top-K queries. Slots are counted in UTC, as local
+    days around a daylight saving time change are 23 or 25 hours long.
+    """
+
+    def __init__(self, prices: list[float], start: datetime) -> None:
+        """Initialize the index of a curve starting at the local midnight start."""
+        self.prices = prices
+        self.start = start
+        self._start_utc = start.astimezone(timezone.utc)
+        self.slot = _slot_length(len(prices), start)
+
+        self._prefix = [0.0]
+        for price in prices:
+            self._prefix.append(self._prefix[-1] + price)
+        self._ranked = sorted(range(len(prices)), key=prices.__getitem__)
+        self._windows: dict[int, tuple[list[float], dict[str, list[list[int]]]]] = {}
+
+    @classmethod
+    def from_spot_prices(
+        cls, spot_prices: dict[str, Any] | None, start: datetime
+    ) -> SpotPriceIndex | None:
+        """Build the index from the spot prices of EnergyInBalance."""
+        if not spot_prices:
+            return None
+        prices = [each["Value"] for each in spot_prices.get("Prices", [])]
+        if not prices:
+            return None
+        return cls(prices, start)
+
+    @property
+    def end(self) -> datetime:
+        """Return the end of the curve."""
+        return self.slot_start(len(self.prices))
+
+    def slot_start(self, index: int) -> datetime:
+        """Return the local start time of a slot."""
+        return (self._start_utc + self.slot * index).astimezone(self.start.tzinfo)
+
+    def slot_index(self, when: datetime) -> int:
+        """Return the index of the slot covering when."""
+        return (when - self._start_utc) // self.slot
+
+    def price_at(self, when: datetime) -> float | None:
+        """Return the price of the slot covering when."""
+        index = self.slot_index(when)
+        if 0 <= index < len(self.prices):
+            return self.prices[index]
+        return None
+
+    def _slot_range(self, after: datetime, within: timedelta) -> tuple[int, int]:
+        """Return the first and the end slot of a search range."""
+        first = max(self.slot_index(after), 0)
+        end = min(self.slot_index(after + within), len(self.prices))
+        return first, end
+
+    def _window_table(
+        self, length: int, kind: str
+    ) -> tuple[list[float], list[list[int]]]:
+        """Return the window sums and sparse table for a window length."""
+        if length not in self._windows:
+            sums = [
+                self._prefix[index + length] - self._prefix[index]
+                for index in range(len(self.prices) - length + 1)
+            ]
+            self._windows[length] = (sums, {})
+        sums, tables = self._windows[length]
+        if kind not in tables:
+            better = operator.le if kind == "cheapest" else operator.ge
+            tables[kind] = _build_sparse_table(sums, better)
+        return sums, tables[kind]
+
+    def find_window(
+        self, hours: float, after: datetime, within: timedelta, kind: str = "cheapest"
+    ) -> dict[str, Any] | None:
+        """Return the cheapest or most expensive contiguous window of hours."""
+        length = max(round(timedelta(hours=hours) / self.slot), 1)
+        first, end = self._slot_range(after, within)
+        last = end - length
+        if last < first:
+            return None
+
+        sums, table = self._window_table(length, kind)
+        better = operator.le if kind == "cheapest" else operator.ge
+        index = _query_sparse_table(table, sums, first, last, better)
+        return {
+            "start": self.slot_start(index).isoformat(),
+            "end": self.slot_start(index + length).isoformat(),
+            "average": sums[index] / length,
+        }
+
+    def find_slots(
+        self, count: int, after: datetime, within: timedelta, kind: str = "cheapest"
+    ) -> list[dict[str, Any]]:
+        """Return the count cheapest or most expensive slots."""
+        first, end = self._slot_range(after, within)
+        ranked = self._ranked if kind == "cheapest" else reversed(self._ranked)
+        slots: list[dict[str, Any]] = []
+        for index in ranked:
+            if len(slots) == count:
+                break
+            if first <= index < end:
+                slots.append(
+                    {
+                        "start": self.slot_start(index).isoformat(),
+                        "end": self.slot_start(index + 1).isoformat(),
+                        "price": self.prices[index],
+                    }
+                )
+        return slots
+
+
+def _slot_length(count: int, start: datetime) -> timedelta:
+    """Return the slot length of a curve of count prices from a local midnight.
+
+    The curve holds today, or today and tomorrow, in hourly or 15 minute
+    slots, so the length is found from the hours of the local days.
+    """
+    start_utc = start.astimezone(timezone.utc)
+    hours = [
+        round(
+            ((start + timedelta(days=days)).astimezone(timezone.utc) - start_utc) / HOUR
+        )
+        for days in (1, 2)
+    ]
+    if count in hours:
+        return HOUR
+    if count in [day_hours * 4 for day_hours in hours]:
+        return QUARTER
+    # An unexpected length, tell the resolutions apart by the count
+    return QUARTER if count > hours[-1] else HOUR
+
+
+def _build_sparse_table(
+    values: list[float], better: Callable[[float, float], bool]
+) -> list[list[int]]:
+    """Build a sparse table of the best index over power of two ranges."""
+    table = [list(range(len(values)))]
+    span = 1
+    while span * 2 <= len(values):
+        previous = table[-1]
+        table.append(
+            [
+                a if better(values[a], values[b]) else b
+                for a, b in zip(previous, previous[span:])
+            ]
+        )
+        span *= 2
+    return table
+
+
+def _query_sparse_table(
+    table: list[list[int]],
+    values: list[float],
+    first: int,
+    last: int,
+    better: Callable[[float, float], bool],
+) -> int:
+    """Return the index of the best value between first and last, inclusive."""
+    level = (last - first + 1).bit_length() - 1
+    a = table[level][first]
+    b = table[level][last - (1 << level) + 1]
+    return a if better(values[a], values[b]) else b
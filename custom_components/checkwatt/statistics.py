@@ -0,0 +1,60 @@
+"""Long-term statistics of the CheckWatt FCR-D net revenue."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+
+def revenue_statistic_id(customer_id: str) -> str:
+    """Return the ID of the daily net revenue statistic of a customer."""
+    return f"{DOMAIN}:net_revenue_{str(customer_id).lower()}"
+
+
+async def async_import_daily_revenue(
+    hass: HomeAssistant, customer_id: str, name: str, days: dict[str, float]
+) -> int:
+    """Add the net revenue of settled days to the long-term statistics.
+
+    Days up to the last one already in the statistics are skipped, so the
+    same days can be imported again. Return the number of days added.
+    """
+    statistic_id = revenue_statistic_id(customer_id)
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"sum"}
+    )
+    last_start = None
+    total = 0.0
+    if rows := last.get(statistic_id):
+        last_start = dt_util.utc_from_timestamp(rows[0]["start"])
+        total = rows[0].get("sum") or 0.0
+
+    statistics: list[StatisticData] = []
+    for key in sorted(days):
+        start = dt_util.start_of_local_day(date.fromisoformat(key))
+        if last_start is not None and start <= last_start:
+            continue
+        total += days[key]
+        statistics.append(StatisticData(start=start, state=days[key], sum=total))
+
+    if statistics:
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{name} FCR-D Net Revenue",
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement="SEK",
+        )
+        async_add_external_statistics(hass, metadata, statistics)
+    return len(statistics)
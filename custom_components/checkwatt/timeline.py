@@ -0,0 +1,113 @@
+"""Timeline and statistics of the FCR-D state transitions."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import FCRD_ACTIVATED, FCRD_FAILED
+
+
+class FCRDTimeline:
+    """Bounded timeline of the FCR-D transitions with running statistics.
+
+    The statistics are updated as each transition arrives, so they cover all
+    transitions seen while the timeline only keeps the latest ones. The time
+    to reactivation runs from leaving the activated state until entering it
+    again.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty timeline."""
+        self.transitions: deque[dict[str, Any]] = deque(maxlen=size)
+        self.state: str | None = None
+        self.since: datetime | None = None
+        self.time_in_state: dict[str, float] = {}
+        self.activations = 0
+        self.failed_activations = 0
+        self.left_activated: datetime | None = None
+        self.reactivation_time = 0.0
+        self.reactivations = 0
+
+    def add(self, now: datetime, state: str, info: str | None = None) -> None:
+        """Add a transition to a state."""
+        if self.state is not None and self.since is not None:
+            elapsed = max((now - self.since).total_seconds(), 0.0)
+            self.time_in_state[self.state] = (
+                self.time_in_state.get(self.state, 0.0) + elapsed
+            )
+            if self.state == FCRD_ACTIVATED:
+                self.left_activated = now
+
+        if state == FCRD_ACTIVATED:
+            self.activations += 1
+            if self.left_activated is not None:
+                self.reactivation_time += (now - self.left_activated).total_seconds()
+                self.reactivations += 1
+                self.left_activated = None
+        elif state == FCRD_FAILED:
+            self.failed_activations += 1
+
+        self.transitions.append(
+            {"state": state, "from": self.state, "at": now.isoformat(), "info": info}
+        )
+        self.state = state
+        self.since = now
+
+    def time_in_states(self, now: datetime) -> dict[str, float]:
+        """Return the seconds spent in each state, including the current one."""
+        times = dict(self.time_in_state)
+        if self.state is not None and self.since is not None:
+            elapsed = max((now - self.since).total_seconds(), 0.0)
+            times[self.state] = times.get(self.state, 0.0) + elapsed
+        return times
+
+    @property
+    def failed_activation_rate(self) -> float | None:
+        """Return the share of the activation attempts that failed."""
+        if not (attempts := self.activations + self.failed_activations):
+            return None
+        return self.failed_activations / attempts
+
+    @property
+    def mean_time_to_reactivation(self) -> float | None:
+        """Return the mean seconds from leaving until entering the activated state."""
+        if not self.reactivations:
+            return None
+        return self.reactivation_time / self.reactivations
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timeline as a dictionary for storage."""
+        return {
+            "transitions": list(self.transitions),
+            "state": self.state,
+            "since": self.since.isoformat() if self.since else None,
+            "time_in_state": self.time_in_state,
+            "activations": self.activations,
+            "failed_activations": self.failed_activations,
+            "left_activated": (
+                self.left_activated.isoformat() if self.left_activated else None
+            ),
+            "reactivation_time": self.reactivation_time,
+            "reactivations": self.reactivations,
+        }
+
+    @classmethod
+    def from_dict(cls, size: int, data: dict[str, Any]) -> FCRDTimeline:
+        """Restore a timeline from storage."""
+        timeline = cls(size)
+        timeline.transitions.extend(data.get("transitions", []))
+        timeline.state = data.get("state")
+        if data.get("since"):
+            timeline.since = dt_util.parse_datetime(data["since"])
+        timeline.time_in_state = dict(data.get("time_in_state", {}))
+        timeline.activations = data.get("activations", 0)
+        timeline.failed_activations = data.get("failed_activations", 0)
+        if data.get("left_activated"):
+            timeline.left_activated = dt_util.parse_datetime(data["left_activated"])
+        timeline.reactivation_time = data.get("reactivation_time", 0.0)
+        timeline.reactivations = data.get("reactivations", 0)
+        return timeline
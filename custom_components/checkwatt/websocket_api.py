@@ -0,0 +1,179 @@
+"""WebSocket commands serving the buffered series of the CheckWatt sites."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import Unauthorized
+from homeassistant.helpers import entity_registry as er
+
+from .const import DATA_SUBSCRIPTIONS, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import CheckwattCoordinator
+    from .spotprice import SpotPriceIndex
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands."""
+    websocket_api.async_register_command(hass, websocket_series)
+    websocket_api.async_register_command(hass, websocket_subscribe_series)
+
+
+def _spot_curve(index: SpotPriceIndex | None) -> dict[str, Any] | None:
+    """Return the spot price curve in the payload format."""
+    if index is None:
+        return None
+    return {
+        "start": index.start.isoformat(),
+        "resolution": int(index.slot.total_seconds() // 60),
+        "prices": index.prices,
+    }
+
+
+def _get_hub(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> CheckwattCoordinator | None:
+    """Return the coordinator of the entry, or send an error if not loaded.
+
+    The series hold the data of the entities of the entry, so the user must
+    be allowed to read them.
+    """
+    if (hub := hass.data.get(DOMAIN, {}).get(msg["entry_id"])) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return None
+
+    user = connection.user
+    if not user.is_admin:
+        entity_ids = [
+            registry_entry.entity_id
+            for registry_entry in er.async_entries_for_config_entry(
+                er.async_get(hass), msg["entry_id"]
+            )
+        ]
+        if not entity_ids or not all(
+            user.permissions.check_entity(entity_id, POLICY_READ)
+            for entity_id in entity_ids
+        ):
+            raise Unauthorized(context=connection.context(msg), permission=POLICY_READ)
+    return hub
+
+
+@callback
+def _async_entry_subscriptions(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> set[CALLBACK_TYPE]:
+    """Return the callbacks ending the subscriptions to the series of an entry.
+
+    The subscriptions are all ended when the entry is unloaded.
+    """
+    subscriptions: dict[str, set[CALLBACK_TYPE]] = hass.data.setdefault(
+        DATA_SUBSCRIPTIONS, {}
+    )
+    if (entry_subscriptions := subscriptions.get(entry.entry_id)) is None:
+        entry_subscriptions = subscriptions[entry.entry_id] = set()
+
+        @callback
+        def async_entry_unloaded() -> None:
+            """End the subscriptions with the entry."""
+            for async_end in subscriptions.pop(entry.entry_id, set()).copy():
+                async_end()
+
+        entry.async_on_unload(async_entry_unloaded)
+    return entry_subscriptions
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/series",
+        vol.Required("entry_id"): str,
+        vol.Optional("since", default=0): vol.All(int, vol.Range(min=0)),
+    }
+)
+@callback
+def websocket_series(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the recent power series and the spot price curve of a site."""
+    if (hub := _get_hub(hass, connection, msg)) is None:
+        return
+    connection.send_result(
+        msg["id"],
+        {
+            "series": hub.series.since(msg["since"]),
+            "spot": _spot_curve(hub.spot.spot_price_index),
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/series/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("since", default=0): vol.All(int, vol.Range(min=0)),
+    }
+)
+@callback
+def websocket_subscribe_series(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Subscribe to the power series and the spot price curve of a site.
+
+    The first event holds the series from since on and the curve, the next
+    ones the appended samples and the curve when a new one is published. The
+    subscription ends when the entry is unloaded.
+    """
+    if (hub := _get_hub(hass, connection, msg)) is None:
+        return
+    sent = msg["since"]
+    spot_index: SpotPriceIndex | None = None
+    first = True
+
+    @callback
+    def async_send_updates() -> None:
+        """Send the samples and the curve not yet sent."""
+        nonlocal sent, spot_index, first
+        event: dict[str, Any] = {}
+        if first or hub.series.next != sent:
+            event["series"] = hub.series.since(sent)
+            sent = hub.series.next
+        if first or hub.spot.spot_price_index is not spot_index:
+            spot_index = hub.spot.spot_price_index
+            event["spot"] = _spot_curve(spot_index)
+        first = False
+        if event:
+            connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    unsubs = [
+        hub.async_add_listener(async_send_updates),
+        hub.spot.async_add_listener(async_send_updates),
+    ]
+    entry = next(entry for entry in hub.entries if entry.entry_id == msg["entry_id"])
+    entry_subscriptions = _async_entry_subscriptions(hass, entry)
+
+    @callback
+    def async_unsubscribe() -> None:
+        """Stop listening for updates."""
+        entry_subscriptions.discard(async_end)
+        while unsubs:
+            unsubs.pop()()
+
+    @callback
+    def async_end() -> None:
+        """End the subscription with the entry."""
+        connection.subscriptions.pop(msg["id"], None)
+        async_unsubscribe()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    entry_subscriptions.add(async_end)
+    connection.send_result(msg["id"])
+    async_send_updates()
@@ -0,0 +1 @@
+"""Tests for the CheckWatt integration."""
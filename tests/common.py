@@ -0,0 +1,191 @@
+"""Helpers for the CheckWatt tests."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any
+
+from pycheckwatt import CheckwattManager
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+from custom_components.checkwatt.const import (
+    CONF_CM10_SENSOR,
+    CONF_CWR_NAME,
+    CONF_FCRD_WATCHER,
+    CONF_POWER_SENSORS,
+    CONF_PUSH_CW_TO_RANK,
+    DOMAIN,
+)
+
+USERNAME = "user@example.com"
+
+OPTIONS = {
+    CONF_POWER_SENSORS: True,
+    CONF_PUSH_CW_TO_RANK: False,
+    CONF_CM10_SENSOR: True,
+    CONF_CWR_NAME: "",
+    CONF_FCRD_WATCHER: False,
+}
+
+# Payloads of the endpoints, by the manager attribute they are stored in
+PAYLOADS: dict[str, Any] = {
+    "customer_details": {
+        "Id": "4242",
+        "FirstName": "Ada",
+        "LastName": "Lovelace",
+        "StreetAddress": "Storgatan 1",
+        "ZipCode": "123 45",
+        "City": "Uppsala",
+    },
+    "energy_data": {
+        "BatteryNow": 1500,
+        "GridNow": 2000,
+        "SolarNow": 500,
+        "BatterySoC": 60,
+    },
+    "power_data": {
+        "Meters": [
+            {"InstallationType": meter, "Measurements": [{"Value": value}]}
+            for meter, value in [
+                ("Solar", 1000),
+                ("Charging", 2000),
+                ("Discharging", 3000),
+                ("EDIEL_E17", 4000),
+                ("EDIEL_E18", 5000),
+            ]
+        ]
+    },
+    "meter_data": {"Label": "online", "Version": "E1.2.3"},
+    "month_peak_effect": 4.2,
+    "price_zone": "SE3",
+    "revenue": {"Revenue": [{"NetRevenue": 12.5}, {"NetRevenue": 3.0}]},
+    "revenueyear": {"Revenue": [{"NetRevenue": 1000.0}]},
+    "spot_prices": {"Prices": [{"Value": 0.5 + hour / 100} for hour in range(24)]},
+}
+
+
+class FakeApi:
+    """Scripted responses of the EnergyInBalance API."""
+
+    def __init__(self) -> None:
+        """Initialize the API with the default payloads."""
+        self.payloads = deepcopy(PAYLOADS)
+        self.failing: set[str] = set()
+        self.calls: list[str] = []
+        self.managers: list[FakeCheckwattManager] = []
+
+    def factory(self, *args: Any) -> FakeCheckwattManager:
+        """Return a new manager on the API."""
+        manager = FakeCheckwattManager(self, *args)
+        self.managers.append(manager)
+        return manager
+
+
+class FakeCheckwattManager(CheckwattManager):
+    """Manager answering from the scripted API instead of EnergyInBalance."""
+
+    def __init__(self, api: FakeApi, *args: Any) -> None:
+        """Initialize the manager."""
+        super().__init__(*args)
+        self.api = api
+
+    async def __aenter__(self) -> FakeCheckwattManager:
+        """Open no session."""
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Close no session."""
+
+    def _respond(self, endpoint: str, *attributes: str) -> bool:
+        """Store the payloads of an endpoint, return False if it fails."""
+        self.api.calls.append(endpoint)
+        if endpoint in self.api.failing:
+            return False
+        for attribute in attributes:
+            setattr(self, attribute, deepcopy(self.api.payloads[attribute]))
+        return True
+
+    async def login(self) -> bool:
+        """Log in."""
+        return self._respond("login")
+
+    async def get_customer_details(self) -> bool:
+        """Fetch the customer details and the FCR-D state."""
+        if not self._respond("customer_details", "customer_details"):
+            return False
+        self.display_name = "Home"
+        self.reseller_id = 1
+        self.energy_provider_id = 1
+        self.battery_registration = {"Dso": "Ellevio"}
+        self.battery_charge_peak_ac = 15.0
+        self.battery_discharge_peak_ac = 15.0
+        self.fcrd_state = self.api.payloads.get("fcrd_state", "ACTIVATED")
+        self.fcrd_info = "90,2/0,6/97,7 %"
+        self.fcrd_timestamp = "2024-03-01 10:00:00"
+        return True
+
+    async def get_energy_trading_company(self, input_id: int) -> str:
+        """Return the energy provider."""
+        self.api.calls.append("energy_provider")
+        return "Tibber"
+
+    async def get_energy_flow(self) -> bool:
+        """Fetch the live power."""
+        return self._respond("energy_flow", "energy_data")
+
+    async def get_power_data(self) -> bool:
+        """Fetch the energy totals."""
+        return self._respond("power_data", "power_data")
+
+    async def get_meter_status(self) -> bool:
+        """Fetch the CM10 status."""
+        return self._respond("meter_status", "meter_data")
+
+    async def get_battery_month_peak_effect(self) -> bool:
+        """Fetch the monthly grid peak."""
+        return self._respond("month_peak", "month_peak_effect")
+
+    async def get_price_zone(self) -> bool:
+        """Fetch the price zone."""
+        return self._respond("price_zone", "price_zone")
+
+    async def get_spot_price(self) -> bool:
+        """Fetch the spot prices."""
+        return self._respond("spot_price", "spot_prices")
+
+    async def get_fcrd_today_net_revenue(self) -> bool:
+        """Fetch the revenue of today and tomorrow."""
+        return self._respond("revenue", "revenue")
+
+    async def get_fcrd_year_net_revenue(self) -> bool:
+        """Add the revenue of the year up, as the real manager does."""
+        if not self._respond("year_revenue", "revenueyear"):
+            return False
+        for each in self.revenueyear["Revenue"]:
+            self.revenueyeartotal += each["NetRevenue"]
+        return True
+
+    async def fetch_and_return_net_revenue(
+        self, from_date: str, to_date: str
+    ) -> dict[str, Any] | None:
+        """Return the revenue of each day of a range."""
+        self.api.calls.append("revenue_range")
+        if from_date >= to_date:
+            raise ValueError("The start date must be before the end date")
+        if "revenue_range" in self.api.failing:
+            return None
+        return deepcopy(self.api.payloads.get("revenue_range"))
+
+
+def make_entry(options: dict[str, Any] | None = None) -> ConfigEntry:
+    """Return a config entry of the test account."""
+    return ConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="CheckWatt",
+        data={CONF_USERNAME: USERNAME, CONF_PASSWORD: "secret"},
+        source="user",
+        options={**OPTIONS, **(options or {})},
+    )
@@ -0,0 +1,50 @@
+"""Fixtures for the CheckWatt tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.checkwatt.coordinator import (
+    CheckwattCoordinator,
+    async_attach_coordinator,
+)
+
+from .common import FakeApi, make_entry
+
+
+@pytest.fixture
+async def hass(tmp_path) -> AsyncGenerator[HomeAssistant, None]:
+    """Return a Home Assistant instance without integrations."""
+    hass = HomeAssistant(str(tmp_path))
+    hass.config_entries = ConfigEntries(hass, {})
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> FakeApi:
+    """Answer the calls of the coordinators from a scripted API."""
+    fake_api = FakeApi()
+    monkeypatch.setattr(
+        "custom_components.checkwatt.coordinator.CheckwattManager", fake_api.factory
+    )
+    return fake_api
+
+
+@pytest.fixture
+def setup_hub(
+    hass: HomeAssistant, api: FakeApi
+) -> Callable[..., Awaitable[CheckwattCoordinator]]:
+    """Return a function attaching an entry to the coordinator of its account."""
+
+    async def _setup(
+        entry: ConfigEntry | None = None,
+    ) -> CheckwattCoordinator:
+        return await async_attach_coordinator(hass, entry or make_entry())
+
+    return _setup
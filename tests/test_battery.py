@@ -0,0 +1,56 @@
+"""Tests of the battery cycle counter."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.checkwatt.battery import BatteryCycleCounter
+
+START = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_rainflow_example() -> None:
+    """Count the ASTM E1049 example, scaled to 5% per unit."""
+    counter = BatteryCycleCounter()
+    levels = [-2, 1, -3, 5, -1, 3, -4, 4, -2, 0]
+    reversals = [
+        counter.add_sample(START + timedelta(minutes=minute), 50 + 5 * level, None)
+        for minute, level in enumerate(levels)
+    ]
+
+    assert reversals == [False, False] + [True] * 8
+    # Half cycles of 3, 4 and 8 and a full cycle of 4 are closed
+    assert counter.equivalent_full_cycles == pytest.approx(
+        (0.5 * 15 + 0.5 * 20 + 20 + 0.5 * 40) / 100
+    )
+    distribution = counter.dod_distribution
+    assert distribution["10-20%"] == 2.0
+    assert distribution["30-40%"] == 0.5
+    assert sum(distribution.values()) == 2.5
+    # The open reversals are kept for the cycles still to close
+    assert counter.reversals == [75, 30, 70, 40]
+
+
+def test_throughput_of_the_day() -> None:
+    """The battery power is integrated per day, gaps are left out."""
+    counter = BatteryCycleCounter()
+    counter.add_sample(START, None, 1000)
+    counter.add_sample(START + timedelta(minutes=1), None, -3000)
+    assert counter.throughput_today == pytest.approx(2000 * 60 / 3600 / 1000)
+
+    counter.add_sample(START + timedelta(minutes=20), None, 1000)
+    assert counter.throughput_today == pytest.approx(2000 * 60 / 3600 / 1000)
+
+    counter.add_sample(START + timedelta(days=1), None, 1000)
+    assert counter.throughput_today == 0.0
+
+
+def test_storage_round_trip() -> None:
+    """A restored counter continues the open cycles."""
+    counter = BatteryCycleCounter()
+    for minute, soc in enumerate([50, 80, 40, 60]):
+        counter.add_sample(START + timedelta(minutes=minute), soc, 100)
+
+    restored = BatteryCycleCounter.from_dict(counter.as_dict())
+
+    assert restored.as_dict() == counter.as_dict()
@@ -0,0 +1,53 @@
+"""Tests of the endpoint circuit breaker."""
+
+from datetime import datetime, timedelta
+
+from custom_components.checkwatt.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+NOW = datetime(2024, 3, 1, 12, 0)
+
+
+def test_opens_after_consecutive_failures() -> None:
+    """The breaker opens at the failure threshold."""
+    breaker = CircuitBreaker(2, 60, 600)
+    breaker.record_failure(NOW)
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record_failure(NOW)
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request(NOW + timedelta(seconds=59))
+
+
+def test_probe_closes_on_success() -> None:
+    """A single probe is let through after the timeout."""
+    breaker = CircuitBreaker(1, 60, 600)
+    breaker.record_failure(NOW)
+
+    later = NOW + timedelta(seconds=60)
+    assert breaker.allow_request(later)
+    assert breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow_request(later)
+
+    breaker.record_success(later)
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 0
+    assert breaker.last_success == later
+
+
+def test_failed_probe_doubles_the_timeout() -> None:
+    """The timeout doubles on each failed probe, up to the maximum."""
+    breaker = CircuitBreaker(1, 60, 200)
+    breaker.record_failure(NOW)
+
+    now = NOW
+    for timeout in (120, 200, 200):
+        now += breaker.timeout
+        assert breaker.allow_request(now)
+        breaker.record_failure(now)
+        assert breaker.timeout == timedelta(seconds=timeout)
+        assert not breaker.allow_request(now + timedelta(seconds=timeout - 1))
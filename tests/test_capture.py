@@ -0,0 +1,55 @@
+"""Tests of the capture and replay of the API calls."""
+
+from contextlib import AsyncExitStack
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.checkwatt.capture import async_replay, read_capture
+from custom_components.checkwatt.coordinator import (
+    CheckwattHandoff,
+    async_pop_handoff,
+    async_store_handoff,
+)
+
+from .common import USERNAME, FakeApi
+
+
+async def _async_capture(hub) -> list[dict]:
+    """Capture a cycle of the live coordinator."""
+    hub.async_start_capture()
+    await hub.async_refresh()
+    capture = await hub.async_stop_capture()
+    return read_capture(capture["path"])
+
+
+async def test_capture_leaves_out_the_credentials(setup_hub) -> None:
+    """The capture starts from the data and login of the session, no credentials."""
+    hub = await setup_hub()
+
+    records = await _async_capture(hub)
+
+    assert records[0]["call"] == "login"
+    assert [record["call"] for record in records].count("get_energy_flow") == 1
+    for record in records:
+        assert not {"username", "password", "jwt_token"} & set(record["state"])
+    assert records[0]["state"]["energy_data"]["GridNow"] == 2000
+
+
+async def test_replay_leaves_the_session_of_the_config_flow(
+    hass: HomeAssistant, api: FakeApi, setup_hub
+) -> None:
+    """A replay answers from the capture without claiming a parked session."""
+    hub = await setup_hub()
+    records = await _async_capture(hub)
+    handoff = CheckwattHandoff(
+        api.factory(USERNAME, "secret", "test"), AsyncExitStack(), "Tibber"
+    )
+    async_store_handoff(hass, USERNAME, handoff)
+    calls = len(api.calls)
+
+    result = await async_replay(hass, hub.config_entry, records, speed=1000)
+
+    assert result["replayed"] == len(records)
+    assert result["cycle_durations"]["live"]
+    assert len(api.calls) == calls
+    assert async_pop_handoff(hass, USERNAME) is handoff
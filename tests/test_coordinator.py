@@ -0,0 +1,122 @@
+"""Tests of the CheckWatt coordinators."""
+
+from datetime import timedelta
+from functools import partial
+
+from homeassistant.config_entries import current_entry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.checkwatt.const import (
+    CONF_CM10_SENSOR,
+    CONF_UPDATE_INTERVAL_MONETARY,
+)
+from custom_components.checkwatt.coordinator import async_detach_coordinator
+
+from .common import FakeApi, make_entry
+
+
+async def _refresh_revenue_after(hub, last_success: timedelta) -> tuple[list, list]:
+    """Refresh the revenue with the last success that long before midnight."""
+    backfilled: list = []
+    imported: list = []
+
+    async def _async_backfill(cw_inst, start, today) -> bool:
+        backfilled.append(start)
+        return True
+
+    async def _async_import_revenue(cw_inst, days) -> None:
+        imported.append(days)
+
+    midnight = dt_util.start_of_local_day()
+    yesterday = (midnight - timedelta(days=1)).date()
+    hub.revenue._async_backfill = _async_backfill
+    hub.revenue._async_import_revenue = _async_import_revenue
+    hub.revenue.ledger.update_today(yesterday, 7.0, 1.0)
+    hub.revenue.last_success = midnight - last_success
+    await hub.revenue.async_refresh()
+    return backfilled, imported
+
+
+async def test_empty_spot_prices_keep_the_index(api: FakeApi, setup_hub) -> None:
+    """An empty spot price payload does not replace the curve of today."""
+    hub = await setup_hub()
+    index = hub.spot.spot_price_index
+    assert index is not None
+    assert hub.spot.data["spot_price"] is not None
+
+    # The prices of tomorrow are looked for again after a while
+    hub.spot._prices_fetched -= timedelta(minutes=CONF_UPDATE_INTERVAL_MONETARY)
+    api.payloads["spot_prices"] = {}
+    await hub.spot.async_refresh()
+
+    assert api.calls.count("spot_price") == 2
+    assert hub.spot.spot_price_index is index
+    assert hub.spot.data["spot_price"] is not None
+
+
+async def test_revenue_of_a_day_missed_at_midnight_is_fetched(setup_hub) -> None:
+    """A day left hours before its end is backfilled, not taken as seen."""
+    hub = await setup_hub()
+
+    backfilled, imported = await _refresh_revenue_after(hub, timedelta(hours=4))
+
+    yesterday = (dt_util.start_of_local_day() - timedelta(days=1)).date()
+    assert backfilled == [yesterday]
+    assert imported == []
+
+
+async def test_revenue_seen_at_the_end_of_the_day_is_final(setup_hub) -> None:
+    """The revenue seen in the last cycle of a day goes to the statistics."""
+    hub = await setup_hub()
+
+    backfilled, imported = await _refresh_revenue_after(hub, timedelta(minutes=5))
+
+    yesterday = (dt_util.start_of_local_day() - timedelta(days=1)).date()
+    assert backfilled == []
+    assert imported == [{yesterday.isoformat(): 7.0}]
+
+
+async def test_shared_coordinators_outlive_the_first_entry(
+    hass: HomeAssistant, setup_hub
+) -> None:
+    """Unloading the entry set up first leaves the coordinators running."""
+    first, second = make_entry(), make_entry({CONF_CM10_SENSOR: False})
+    for entry in (first, second):
+        # Home Assistant sets the entry up within its context
+        current_entry.set(entry)
+        hub = await setup_hub(entry)
+
+    await async_detach_coordinator(hass, first)
+    await first._async_process_on_unload(hass)
+
+    assert hub.entries == [second]
+    assert hub.session.entry is second
+    for coordinator in hub.coordinators:
+        assert coordinator.config_entry is second
+        assert not coordinator._shutdown_requested
+
+    await async_detach_coordinator(hass, second)
+
+    for coordinator in hub.coordinators:
+        assert coordinator._shutdown_requested
+
+
+async def test_account_entities_added_through_one_entry(setup_hub) -> None:
+    """The entities of the account move to another entry with their owner."""
+    hub = await setup_hub()
+    added: list[str] = []
+
+    remove_first = hub.async_add_account_entities(
+        Platform.SENSOR, "first", partial(added.append, "first")
+    )
+    remove_second = hub.async_add_account_entities(
+        Platform.SENSOR, "second", partial(added.append, "second")
+    )
+    assert added == ["first"]
+
+    remove_first()
+    assert added == ["first", "second"]
+    remove_second()
+    assert added == ["first", "second"]
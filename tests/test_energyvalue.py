@@ -0,0 +1,60 @@
+"""Tests of the spot priced import cost and export value."""
+
+from datetime import datetime
+
+import pytest
+
+from custom_components.checkwatt.energyvalue import EnergyValueTracker
+
+
+def test_energy_priced_at_the_spot_price() -> None:
+    """The energy since the previous update is priced at the current price."""
+    tracker = EnergyValueTracker()
+    assert not tracker.add(datetime(2024, 3, 1, 10, 0), 1000.0, 500.0, 1.0)
+
+    assert tracker.add(datetime(2024, 3, 1, 10, 1), 3000.0, 1500.0, 0.5)
+    assert tracker.add(datetime(2024, 3, 1, 10, 2), 4000.0, 1500.0, 2.0)
+    assert not tracker.add(datetime(2024, 3, 1, 10, 3), 4000.0, 1500.0, 2.0)
+
+    assert tracker.import_cost_today == pytest.approx(3.0)
+    assert tracker.export_value_today == pytest.approx(0.5)
+    assert tracker.import_cost_month == pytest.approx(3.0)
+
+
+def test_unpriced_energy_and_meter_reset() -> None:
+    """Energy without a price is counted apart, a reset starts over."""
+    tracker = EnergyValueTracker()
+    tracker.add(datetime(2024, 3, 1, 10, 0), 1000.0, 0.0, None)
+    tracker.add(datetime(2024, 3, 1, 10, 1), 2000.0, 0.0, None)
+    tracker.add(datetime(2024, 3, 1, 10, 2), 500.0, 0.0, 1.0)
+    tracker.add(datetime(2024, 3, 1, 10, 3), 1500.0, 0.0, 1.0)
+
+    assert tracker.unpriced_energy == pytest.approx(1.0)
+    assert tracker.import_cost_today == pytest.approx(1.0)
+
+
+def test_roll_over_days_and_months() -> None:
+    """The daily sums reset every day, the monthly ones every month."""
+    tracker = EnergyValueTracker()
+    tracker.add(datetime(2024, 3, 30, 10, 0), 0.0, 0.0, 1.0)
+    tracker.add(datetime(2024, 3, 30, 10, 1), 1000.0, 0.0, 1.0)
+    tracker.add(datetime(2024, 3, 31, 10, 0), 2000.0, 0.0, 1.0)
+
+    assert tracker.import_cost_today == pytest.approx(1.0)
+    assert tracker.import_cost_month == pytest.approx(2.0)
+
+    tracker.add(datetime(2024, 4, 1, 0, 0), 2000.0, 0.0, 1.0)
+    assert tracker.import_cost_today == 0.0
+    assert tracker.import_cost_month == 0.0
+
+
+def test_storage_round_trip() -> None:
+    """The sums are restored, the last totals are not."""
+    tracker = EnergyValueTracker()
+    tracker.add(datetime(2024, 3, 1, 10, 0), 0.0, 0.0, 1.0)
+    tracker.add(datetime(2024, 3, 1, 10, 1), 1000.0, 2000.0, 1.0)
+
+    restored = EnergyValueTracker.from_dict(tracker.as_dict())
+
+    assert restored.as_dict() == tracker.as_dict()
+    assert restored.last_import is None
@@ -0,0 +1,76 @@
+"""Tests of the export of the revenue and energy history."""
+
+import csv
+from datetime import date, timedelta
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.checkwatt.export import _async_revenue, async_export_history
+
+from .common import FakeApi
+
+
+class _RangeManager:
+    """Manager refusing ranges ending after its today, as the real one does."""
+
+    def __init__(self, today: date) -> None:
+        """Initialize the manager."""
+        self.today = today
+        self.ranges: list[tuple[str, str]] = []
+
+    async def fetch_and_return_net_revenue(self, from_date: str, to_date: str):
+        """Return the revenue of each day of the range, its last day included."""
+        self.ranges.append((from_date, to_date))
+        if date.fromisoformat(to_date) > self.today:
+            raise ValueError("To date must be within the last 6 months")
+        days = (date.fromisoformat(to_date) - date.fromisoformat(from_date)).days
+        return {"Revenue": [{"NetRevenue": day} for day in range(days + 1)]}
+
+
+async def test_revenue_range_ends_on_the_last_settled_day() -> None:
+    """The range is not refused when the system clock is a day behind."""
+    today = dt_util.now().date()
+    manager = _RangeManager(today - timedelta(days=1))
+
+    revenue = await _async_revenue(
+        manager, today - timedelta(days=3), today + timedelta(days=2)
+    )
+
+    first, last = today - timedelta(days=3), today - timedelta(days=1)
+    assert manager.ranges == [(first.isoformat(), last.isoformat())]
+    assert revenue == {first + timedelta(days=day): day for day in range(3)}
+
+
+async def test_refused_revenue_range() -> None:
+    """A range refused by EnergyInBalance fails the export with its reason."""
+    today = dt_util.now().date()
+    manager = _RangeManager(today - timedelta(days=3))
+
+    with pytest.raises(HomeAssistantError, match="refused"):
+        await _async_revenue(manager, today - timedelta(days=5), today)
+
+
+async def test_export_history_to_csv(
+    hass: HomeAssistant, api: FakeApi, setup_hub, tmp_path
+) -> None:
+    """Each day of the period is written, with the revenue of the settled ones."""
+    hub = await setup_hub()
+    api.payloads["revenue_range"] = {
+        "Revenue": [{"NetRevenue": 10.0}, {"NetRevenue": 20.0}]
+    }
+    today = dt_util.now().date()
+    path = str(tmp_path / "export.csv")
+
+    result = await async_export_history(
+        hass, [hub], today - timedelta(days=2), today, path
+    )
+
+    assert result["rows"] == 3
+    with open(path, encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["net_revenue"] for row in rows] == ["10.0", "20.0", ""]
+    assert {row["customer_id"] for row in rows} == {"4242"}
@@ -0,0 +1,86 @@
+"""Tests of the coordinators under injected faults."""
+
+import pytest
+
+from custom_components.checkwatt.breaker import STATE_CLOSED, STATE_OPEN
+from custom_components.checkwatt.const import BREAKER_FAILURE_THRESHOLD
+from custom_components.checkwatt.faults import (
+    FAULT_AUTH_EXPIRY,
+    FAULT_MALFORMED,
+    FAULT_TIMEOUT,
+    FaultInjector,
+)
+
+from .common import FakeApi
+
+
+async def test_timeouts_open_the_breaker(api: FakeApi, setup_hub) -> None:
+    """Calls timing out open the breaker, the last good data is served."""
+    hub = await setup_hub()
+    hub.faults = FaultInjector()
+    hub.faults.add(FAULT_TIMEOUT, "energy_flow", BREAKER_FAILURE_THRESHOLD)
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        await hub.async_refresh()
+
+    assert hub._breakers["energy_flow"].state == STATE_OPEN
+    assert hub.missed_calls == BREAKER_FAILURE_THRESHOLD
+    assert hub.data["grid_power"] == 2000
+    assert list(hub.stale_endpoints) == ["energy_flow"]
+    assert hub.faults.as_dict()["failing"] == ["energy_flow"]
+
+    # The open breaker keeps the endpoint from being called
+    calls = api.calls.count("energy_flow")
+    await hub.async_refresh()
+    assert api.calls.count("energy_flow") == calls
+    assert hub.data["grid_power"] == 2000
+
+
+async def test_expired_session_logs_in_again(api: FakeApi, setup_hub) -> None:
+    """A failed call expires the session, the next cycle recovers."""
+    hub = await setup_hub()
+    hub.faults = FaultInjector()
+    hub.faults.add(FAULT_AUTH_EXPIRY, "power_data")
+    total = hub.data["total_import_energy"]
+
+    await hub.async_refresh()
+
+    breaker = hub._breakers["power_data"]
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 1
+    assert hub.data["total_import_energy"] == total
+    assert list(hub.stale_endpoints) == ["power_data"]
+
+    logins = api.calls.count("login")
+    await hub.async_refresh()
+
+    assert api.calls.count("login") == logins + 1
+    assert breaker.failures == 0
+    assert hub.stale_endpoints == {}
+    assert list(hub.faults.recovery_times) == ["power_data"]
+
+
+@pytest.mark.parametrize(
+    ("endpoint", "coordinator", "key", "value"),
+    [
+        ("energy_flow", None, "grid_power", 2000),
+        ("power_data", None, "total_import_energy", 4000),
+        ("meter_status", "device", "cm10_status", "Active"),
+    ],
+)
+async def test_malformed_payloads_are_not_served(
+    setup_hub, endpoint: str, coordinator: str | None, key: str, value
+) -> None:
+    """An empty payload counts as a failure instead of replacing the data."""
+    hub = await setup_hub()
+    hub.faults = FaultInjector()
+    target = getattr(hub, coordinator) if coordinator else hub
+    assert target.data[key] == value
+
+    hub.faults.add(FAULT_MALFORMED, endpoint)
+    await target.async_refresh()
+
+    assert hub.faults.injected[FAULT_MALFORMED] == 1
+    assert target._breakers[endpoint].failures == 1
+    assert target.data[key] == value
+    assert list(target.stale_endpoints) == [endpoint]
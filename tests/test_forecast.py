@@ -0,0 +1,37 @@
+"""Tests of the month-end revenue forecast."""
+
+from datetime import date
+
+import pytest
+
+from custom_components.checkwatt.forecast import CONFIDENCE_Z, forecast_month
+
+
+def test_average_over_days_with_revenue() -> None:
+    """Days without revenue are left out of the average."""
+    forecast = forecast_month(date(2024, 4, 4), [10.0, 0.0, 20.0], 30.0)
+
+    assert forecast.daily_average == pytest.approx(20.0)
+    assert forecast.month_estimate == pytest.approx(60.0 + 20.0 * 26)
+
+
+def test_confidence_band() -> None:
+    """The band widens with the spread of the days and the days left."""
+    forecast = forecast_month(date(2024, 4, 3), [10.0, 20.0], 0.0)
+
+    margin = CONFIDENCE_Z * 7.0710678 * 27**0.5
+    assert forecast.month_estimate_low == pytest.approx(
+        forecast.month_estimate - margin
+    )
+    assert forecast.month_estimate_high == pytest.approx(
+        forecast.month_estimate + margin
+    )
+
+
+def test_no_revenue() -> None:
+    """A month without revenue forecasts nothing."""
+    forecast = forecast_month(date(2024, 4, 1), [], None)
+
+    assert forecast.daily_average == 0.0
+    assert forecast.month_estimate == 0.0
+    assert forecast.month_estimate_low == forecast.month_estimate_high == 0.0
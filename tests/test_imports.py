@@ -0,0 +1,47 @@
+"""Tests of the modules imported with the integration."""
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules only imported when an entry is set up or a service is called
+DEFERRED = [
+    "pycheckwatt",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.components.recorder",
+    "custom_components.checkwatt.coordinator",
+    "custom_components.checkwatt.statistics",
+]
+
+
+def _imported_modules(module: str) -> set[str]:
+    """Return the modules imported with module in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["custom_components.checkwatt", "custom_components.checkwatt.config_flow"],
+)
+def test_deferred_imports(module: str) -> None:
+    """The heavyweight modules are not imported at module load."""
+    imported = _imported_modules(module)
+
+    assert module in imported
+    for deferred in DEFERRED:
+        assert not {
+            name
+            for name in imported
+            if name == deferred or name.startswith(f"{deferred}.")
+        }, f"{deferred} is imported with {module}"
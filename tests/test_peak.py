@@ -0,0 +1,64 @@
+"""Tests of the monthly grid peak tracker."""
+
+from datetime import date, datetime
+
+import pytest
+
+from custom_components.checkwatt.peak import GridPeakTracker
+
+
+def _add(tracker: GridPeakTracker, day: int, hour: int, *powers: float) -> None:
+    """Add samples of an hour of March 2024."""
+    for minute, power in enumerate(powers):
+        tracker.add_sample(datetime(2024, 3, day, hour, minute), power)
+
+
+def test_hourly_average_and_daily_peaks() -> None:
+    """The highest hourly average of each day is kept, export counts as 0."""
+    tracker = GridPeakTracker(2)
+    _add(tracker, 1, 10, 2000, 4000)
+    _add(tracker, 1, 11, 1000, -3000)
+    _add(tracker, 2, 10, 5000)
+    _add(tracker, 3, 10, 1000)
+
+    assert tracker.daily_peaks == {"2024-03-01": 3.0, "2024-03-02": 5.0}
+    assert tracker.monthly_peak == 5.0
+    assert tracker.hour_average == 1.0
+    assert tracker.top_peaks == [5.0, 3.0]
+    assert tracker.top_peaks_average == 4.0
+
+
+def test_new_month_starts_over() -> None:
+    """The peaks of the previous month are dropped."""
+    tracker = GridPeakTracker(3)
+    _add(tracker, 31, 23, 9000)
+    tracker.add_sample(datetime(2024, 4, 1, 0, 0), 1000)
+
+    assert tracker.daily_peaks == {}
+    assert tracker.monthly_peak is None
+
+
+def test_reconcile_raises_the_peak() -> None:
+    """The peak of EnergyInBalance only raises the local one."""
+    tracker = GridPeakTracker(3)
+    _add(tracker, 1, 10, 2000)
+    _add(tracker, 1, 11, 0)
+
+    tracker.reconcile(date(2024, 3, 1), 1.0)
+    assert tracker.monthly_peak == 2.0
+    tracker.reconcile(date(2024, 3, 1), 4.0)
+    assert tracker.monthly_peak == 4.0
+    assert not tracker.needs_reconcile(date(2024, 3, 1))
+    assert tracker.needs_reconcile(date(2024, 3, 2))
+
+
+def test_storage_round_trip() -> None:
+    """A restored tracker continues the open hour."""
+    tracker = GridPeakTracker(3)
+    _add(tracker, 1, 10, 2000, 4000)
+
+    restored = GridPeakTracker.from_dict(3, tracker.as_dict())
+
+    assert restored.as_dict() == tracker.as_dict()
+    restored.add_sample(datetime(2024, 3, 1, 11, 0), 0)
+    assert restored.monthly_peak == pytest.approx(3.0)
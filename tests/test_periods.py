@@ -0,0 +1,72 @@
+"""Tests of the daily, weekly and monthly energy counters."""
+
+from datetime import date, datetime
+
+import pytest
+
+from custom_components.checkwatt.periods import (
+    PERIOD_DAILY,
+    PERIOD_MONTHLY,
+    PERIOD_WEEKLY,
+    EnergyPeriodCounters,
+    period_start,
+)
+
+
+@pytest.mark.parametrize(
+    ("period", "start"),
+    [
+        (PERIOD_DAILY, date(2024, 3, 14)),
+        (PERIOD_WEEKLY, date(2024, 3, 11)),
+        (PERIOD_MONTHLY, date(2024, 3, 1)),
+    ],
+)
+def test_period_start(period: str, start: date) -> None:
+    """Weeks start on Monday, months on the 1st."""
+    assert period_start(period, date(2024, 3, 14)) == start
+
+
+def test_counters_from_the_period_baselines() -> None:
+    """Each period counts from the totals when it started."""
+    counters = EnergyPeriodCounters()
+    periods, rebased = counters.update(datetime(2024, 3, 14, 10), {"import": 100.0})
+    assert rebased
+    assert periods[PERIOD_DAILY] == {"import": 0.0}
+
+    counters.update(datetime(2024, 3, 14, 23), {"import": 130.0})
+    periods, rebased = counters.update(datetime(2024, 3, 15, 1), {"import": 150.0})
+
+    assert rebased
+    assert periods[PERIOD_DAILY] == {"import": 0.0}
+    assert periods[PERIOD_WEEKLY] == {"import": 50.0}
+    assert periods[PERIOD_MONTHLY] == {"import": 50.0}
+
+
+def test_new_and_reset_meters() -> None:
+    """A new or reset meter is counted from its current total."""
+    counters = EnergyPeriodCounters()
+    counters.update(datetime(2024, 3, 14, 10), {"import": 100.0})
+
+    periods, rebased = counters.update(
+        datetime(2024, 3, 14, 11), {"import": 20.0, "export": 5.0}
+    )
+    assert rebased
+    assert periods[PERIOD_DAILY] == {"import": 0.0, "export": 0.0}
+
+    periods, rebased = counters.update(
+        datetime(2024, 3, 14, 12), {"import": 30.0, "export": 7.0}
+    )
+    assert not rebased
+    assert periods[PERIOD_DAILY] == {"import": 10.0, "export": 2.0}
+
+
+def test_storage_round_trip() -> None:
+    """The energy of a restart gap is kept in its period."""
+    counters = EnergyPeriodCounters()
+    counters.update(datetime(2024, 3, 14, 10), {"import": 100.0})
+
+    restored = EnergyPeriodCounters.from_dict(counters.as_dict())
+    periods, rebased = restored.update(datetime(2024, 3, 14, 18), {"import": 160.0})
+
+    assert not rebased
+    assert periods[PERIOD_DAILY] == {"import": 60.0}
@@ -0,0 +1,102 @@
+"""Tests of the portfolio of the CheckWatt sites."""
+
+from functools import partial
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+
+from custom_components.checkwatt.portfolio import CheckwattPortfolio
+
+
+class _Coordinator:
+    """Coordinator holding the data of a site."""
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        """Initialize the coordinator."""
+        self.data = data
+        self.listeners: list = []
+
+    def async_add_listener(self, update_callback):
+        """Listen for updates."""
+        self.listeners.append(update_callback)
+        return partial(self.listeners.remove, update_callback)
+
+    def async_update(self, **data: Any) -> None:
+        """Update the data and notify the listeners."""
+        self.data.update(data)
+        for update_callback in list(self.listeners):
+            update_callback()
+
+
+class _Hub(_Coordinator):
+    """Live coordinator of a site, with its revenue coordinator."""
+
+    def __init__(self, site: str, power: float, soc: float, revenue: float) -> None:
+        """Initialize the coordinators of a site."""
+        super().__init__({"id": site, "battery_power": power, "battery_soc": soc})
+        self.revenue = _Coordinator({"today_net_revenue": revenue})
+
+
+def _add(portfolio: CheckwattPortfolio, entry_id: str, hub: _Hub, added: list):
+    """Add the site of an entry, recording the entry adding the entities."""
+    return portfolio.async_add_site(
+        entry_id,
+        hub,
+        lambda entities: added.append(entry_id),
+        lambda portfolio: [Entity()],
+    )
+
+
+async def test_sums_and_means_of_the_sites(hass: HomeAssistant) -> None:
+    """An update of a site replaces its contribution."""
+    portfolio = CheckwattPortfolio(hass)
+    first, second = _Hub("1", 1000, 50, 10), _Hub("2", 2000, 70, 5)
+    _add(portfolio, "first", first, [])
+    _add(portfolio, "second", second, [])
+
+    assert portfolio.value("battery_power") == 3000
+    assert portfolio.value("battery_soc") == 60
+    assert portfolio.value("today_net_revenue") == 15
+
+    notified: list[bool] = []
+    portfolio.async_add_listener(partial(notified.append, True))
+    first.async_update(battery_power=-500, battery_soc=None)
+    first.revenue.async_update(today_net_revenue=12.5)
+
+    assert notified == [True, True]
+    assert portfolio.value("battery_power") == 1500
+    assert portfolio.value("battery_soc") == 70
+    assert portfolio.value("today_net_revenue") == pytest.approx(17.5)
+    assert portfolio.value("monthly_net_revenue") is None
+
+
+async def test_entities_move_with_their_entry(hass: HomeAssistant) -> None:
+    """The entities come with the second site and move off an unloaded entry."""
+    portfolio = CheckwattPortfolio(hass)
+    shared, other = _Hub("1", 1000, 50, 10), _Hub("2", 2000, 70, 5)
+    added: list[str] = []
+
+    remove_first = _add(portfolio, "first", shared, added)
+    assert added == []
+    remove_second = _add(portfolio, "second", shared, added)
+    assert added == []
+    remove_other = _add(portfolio, "other", other, added)
+    assert added == ["first"]
+
+    # The site of the first entry is still served by the second one
+    remove_first()
+    assert added == ["first", "second"]
+    assert portfolio.attributes == {"sites": 2}
+
+    remove_other()
+    assert portfolio.attributes == {"sites": 1}
+    assert portfolio.value("battery_power") == 1000
+    assert not other.listeners and not other.revenue.listeners
+
+    remove_second()
+    assert portfolio.sites == {}
+    assert portfolio.value("battery_power") is None
+    assert added == ["first", "second"]
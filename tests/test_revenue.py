@@ -0,0 +1,64 @@
+"""Tests of the local revenue ledger."""
+
+from datetime import date
+
+from custom_components.checkwatt.revenue import RevenueLedger
+
+
+def test_roll_over_settles_today() -> None:
+    """The last revenue of a day is settled into the month."""
+    ledger = RevenueLedger()
+    ledger.reconcile(date(2024, 3, 10), {"2024-03-09": 4.0}, 100.0, 2.0)
+    ledger.update_today(date(2024, 3, 10), 6.0, 1.0)
+    ledger.update_today(date(2024, 3, 11), 3.0, 0.0)
+
+    assert ledger.daily == {"2024-03-09": 4.0, "2024-03-10": 6.0}
+    assert ledger.monthly == 13.0
+    assert ledger.annual == 94.0 + 4.0 + 6.0 + 3.0
+
+
+def test_reconcile_on_first_day_of_month() -> None:
+    """Today is not counted twice when the month series is not fetched."""
+    ledger = RevenueLedger()
+    ledger.reconcile(date(2024, 3, 31), {"2024-03-31": 5.0}, 100.0, 5.0)
+    ledger.update_today(date(2024, 4, 1), 7.0, 0.0)
+
+    # The annual total of EnergyInBalance already holds today
+    ledger.reconcile(date(2024, 4, 1), {}, 107.0, 7.0)
+
+    assert ledger.monthly == 7.0
+    assert ledger.annual == 107.0
+
+
+def test_new_year_resets_the_sums() -> None:
+    """The annual sum starts over with the year."""
+    ledger = RevenueLedger()
+    ledger.reconcile(date(2023, 12, 31), {"2023-12-30": 2.0}, 500.0, 3.0)
+    ledger.update_today(date(2024, 1, 1), 1.0, 0.0)
+
+    assert ledger.monthly == 1.0
+    assert ledger.annual == 1.0
+
+
+def test_needs_reconcile() -> None:
+    """The sums are reconciled once a day, after the reconcile hour."""
+    ledger = RevenueLedger()
+    assert ledger.needs_reconcile(date(2024, 3, 10), 0, 2)
+
+    ledger.reconcile(date(2024, 3, 10), {}, 0.0, 0.0)
+    assert not ledger.needs_reconcile(date(2024, 3, 10), 12, 2)
+    assert not ledger.needs_reconcile(date(2024, 3, 11), 1, 2)
+    assert ledger.needs_reconcile(date(2024, 3, 11), 2, 2)
+    assert ledger.needs_reconcile(date(2024, 3, 13), 0, 2)
+
+
+def test_storage_round_trip() -> None:
+    """A restored ledger equals the stored one."""
+    ledger = RevenueLedger()
+    ledger.reconcile(date(2024, 3, 10), {"2024-03-09": 4.0}, 100.0, 2.0)
+    ledger.update_today(date(2024, 3, 10), 6.0, 1.0)
+
+    restored = RevenueLedger.from_dict(ledger.as_dict())
+
+    assert restored.as_dict() == ledger.as_dict()
+    assert restored.annual == ledger.annual
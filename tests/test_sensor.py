@@ -0,0 +1,40 @@
+"""Tests of the CheckWatt sensors."""
+
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.checkwatt.sensor import (
+    _create_optional_sensors,
+    _scope_unique_id,
+)
+
+
+async def test_option_sensors_belong_to_their_entry(setup_hub) -> None:
+    """Entries of an account have their own sensors of the options."""
+    hub = await setup_hub()
+
+    first = _create_optional_sensors(hub, "energy", "first")
+    second = _create_optional_sensors(hub, "energy", "second")
+
+    assert first[0].unique_id == "checkwattUid_solar_4242_first"
+    assert not {entity.unique_id for entity in first} & {
+        entity.unique_id for entity in second
+    }
+
+
+def test_unique_ids_of_option_sensors_scoped() -> None:
+    """The registry entries of the sensors of the options move to the entry."""
+    solar = er.RegistryEntry(
+        entity_id="sensor.home_solar_energy",
+        unique_id="checkwattUid_solar_4242",
+        platform="checkwatt",
+    )
+    daily = er.RegistryEntry(
+        entity_id="sensor.home_daily_yield",
+        unique_id="checkwattUid_4242",
+        platform="checkwatt",
+    )
+
+    assert _scope_unique_id("first", "4242", solar) == {
+        "new_unique_id": "checkwattUid_solar_4242_first"
+    }
+    assert _scope_unique_id("first", "4242", daily) is None
@@ -0,0 +1,49 @@
+"""Tests of the buffered power series."""
+
+from datetime import UTC, datetime
+
+from custom_components.checkwatt.series import PowerSeries
+
+
+def _add(series: PowerSeries, count: int) -> None:
+    """Add count samples a minute apart."""
+    for number in range(series.next, series.next + count):
+        series.add(
+            datetime(2024, 3, 1, 10, number, tzinfo=UTC),
+            {"battery_power": number, "battery_soc": 50},
+        )
+
+
+def test_since_returns_the_appended_samples() -> None:
+    """A reader gets only the samples after the last one it has."""
+    series = PowerSeries(10)
+    _add(series, 3)
+
+    first = series.since()
+    assert first["first"] == 0
+    assert first["next"] == 3
+    assert first["columns"]["battery_power"] == [0, 1, 2]
+    assert first["columns"]["grid_power"] == [None, None, None]
+
+    _add(series, 2)
+    appended = series.since(first["next"])
+    assert appended["first"] == 3
+    assert appended["columns"]["battery_power"] == [3, 4]
+    assert appended["columns"]["time"] == [
+        int(datetime(2024, 3, 1, 10, minute, tzinfo=UTC).timestamp())
+        for minute in (3, 4)
+    ]
+
+    assert series.since(series.next)["columns"]["time"] == []
+
+
+def test_since_is_bounded_by_the_kept_samples() -> None:
+    """Samples dropped from the ring are not returned."""
+    series = PowerSeries(3)
+    _add(series, 5)
+
+    result = series.since(1)
+
+    assert result["first"] == 2
+    assert result["next"] == 5
+    assert result["columns"]["battery_power"] == [2, 3, 4]
@@ -0,0 +1,95 @@
+"""Tests of the spot price index."""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.checkwatt.spotprice import SpotPriceIndex
+
+TZ = ZoneInfo("Europe/Stockholm")
+
+
+@pytest.mark.parametrize(
+    ("day", "count", "slot"),
+    [
+        ((2024, 6, 1), 24, timedelta(hours=1)),
+        ((2024, 6, 1), 48, timedelta(hours=1)),
+        ((2024, 6, 1), 96, timedelta(minutes=15)),
+        ((2024, 6, 1), 192, timedelta(minutes=15)),
+        # Across the autumn change, the first day has 25 hours
+        ((2024, 10, 27), 25, timedelta(hours=1)),
+        ((2024, 10, 27), 49, timedelta(hours=1)),
+        ((2024, 10, 27), 196, timedelta(minutes=15)),
+        # Across the spring change, the first day has 23 hours
+        ((2024, 3, 31), 47, timedelta(hours=1)),
+        ((2024, 3, 31), 92, timedelta(minutes=15)),
+    ],
+)
+def test_resolution(day: tuple[int, int, int], count: int, slot: timedelta) -> None:
+    """The resolution follows from the hours of the local days."""
+    index = SpotPriceIndex([1.0] * count, datetime(*day, tzinfo=TZ))
+
+    assert index.slot == slot
+
+
+def test_slots_across_autumn_change() -> None:
+    """The slots after the change keep their times."""
+    start = datetime(2024, 10, 27, tzinfo=TZ)
+    index = SpotPriceIndex([float(slot) for slot in range(49)], start)
+
+    # 02:00 occurs twice, first in summer and then in winter time
+    assert index.slot_start(2).isoformat() == "2024-10-27T02:00:00+02:00"
+    assert index.slot_start(3).isoformat() == "2024-10-27T02:00:00+01:00"
+    assert index.price_at(datetime(2024, 10, 27, 4, 30, tzinfo=TZ)) == 5.0
+    assert index.end == datetime(2024, 10, 29, tzinfo=TZ)
+
+
+def test_price_at_outside_the_curve() -> None:
+    """No price is known outside the curve."""
+    start = datetime(2024, 6, 1, tzinfo=TZ)
+    index = SpotPriceIndex([1.0] * 24, start)
+
+    assert index.price_at(start - timedelta(minutes=1)) is None
+    assert index.price_at(start + timedelta(hours=24)) is None
+
+
+def test_find_window_matches_brute_force() -> None:
+    """The indexed window search finds the best contiguous window."""
+    prices = [5.0, 3.0, 8.0, 1.0, 2.0, 9.0, 4.0, 7.0, 6.0, 0.5, 3.5, 2.5]
+    start = datetime(2024, 6, 1, tzinfo=TZ)
+    index = SpotPriceIndex(prices, start)
+
+    for hours in range(1, 5):
+        sums = [sum(prices[i : i + hours]) for i in range(len(prices) - hours + 1)]
+        for kind, best in (("cheapest", min), ("most_expensive", max)):
+            window = index.find_window(hours, start, timedelta(hours=12), kind)
+            assert window is not None
+            assert window["average"] == pytest.approx(best(sums) / hours)
+
+
+def test_find_window_within_range() -> None:
+    """Windows are searched after a time and within a duration only."""
+    prices = [1.0, 9.0, 9.0, 2.0, 9.0, 9.0]
+    start = datetime(2024, 6, 1, tzinfo=TZ)
+    index = SpotPriceIndex(prices, start)
+
+    window = index.find_window(1, start + timedelta(hours=1), timedelta(hours=5))
+    assert window == {
+        "start": "2024-06-01T03:00:00+02:00",
+        "end": "2024-06-01T04:00:00+02:00",
+        "average": 2.0,
+    }
+    assert index.find_window(3, start, timedelta(hours=2)) is None
+
+
+def test_find_slots() -> None:
+    """The top ranked slots are returned in order."""
+    prices = [4.0, 1.0, 3.0, 2.0]
+    start = datetime(2024, 6, 1, tzinfo=TZ)
+    index = SpotPriceIndex(prices, start)
+
+    slots = index.find_slots(2, start, timedelta(hours=4))
+    assert [slot["price"] for slot in slots] == [1.0, 2.0]
+    slots = index.find_slots(1, start, timedelta(hours=4), "most_expensive")
+    assert [slot["price"] for slot in slots] == [4.0]
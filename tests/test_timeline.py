@@ -0,0 +1,75 @@
+"""Tests of the FCR-D timeline."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.checkwatt.const import (
+    FCRD_ACTIVATED,
+    FCRD_DEACTIVATED,
+    FCRD_FAILED,
+)
+from custom_components.checkwatt.timeline import FCRDTimeline
+
+START = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _timeline(size: int = 10) -> FCRDTimeline:
+    """Return a timeline of transitions ten minutes apart."""
+    timeline = FCRDTimeline(size)
+    states = [
+        FCRD_ACTIVATED,
+        FCRD_DEACTIVATED,
+        FCRD_FAILED,
+        FCRD_ACTIVATED,
+        FCRD_DEACTIVATED,
+    ]
+    for step, state in enumerate(states):
+        timeline.add(START + timedelta(minutes=10 * step), state, f"info {step}")
+    return timeline
+
+
+def test_statistics() -> None:
+    """The statistics cover all transitions."""
+    timeline = _timeline()
+
+    assert timeline.activations == 2
+    assert timeline.failed_activations == 1
+    assert timeline.failed_activation_rate == pytest.approx(1 / 3)
+    # Left the activated state at 10 minutes, back at 30
+    assert timeline.mean_time_to_reactivation == 20 * 60
+    assert timeline.time_in_states(START + timedelta(minutes=45)) == {
+        FCRD_ACTIVATED: 20 * 60,
+        FCRD_DEACTIVATED: 15 * 60,
+        FCRD_FAILED: 10 * 60,
+    }
+
+
+def test_keeps_the_latest_transitions() -> None:
+    """The timeline is bounded, the statistics are not."""
+    timeline = _timeline(size=2)
+
+    assert [each["state"] for each in timeline.transitions] == [
+        FCRD_ACTIVATED,
+        FCRD_DEACTIVATED,
+    ]
+    assert timeline.transitions[-1]["from"] == FCRD_ACTIVATED
+    assert timeline.activations == 2
+
+
+def test_no_statistics_without_transitions() -> None:
+    """The rates are unknown until there are transitions."""
+    timeline = FCRDTimeline(10)
+
+    assert timeline.failed_activation_rate is None
+    assert timeline.mean_time_to_reactivation is None
+    assert timeline.time_in_states(START) == {}
+
+
+def test_storage_round_trip() -> None:
+    """A restored timeline equals the stored one."""
+    timeline = _timeline()
+
+    restored = FCRDTimeline.from_dict(10, timeline.as_dict())
+
+    assert restored.as_dict() == timeline.as_dict()
@@ -0,0 +1,120 @@
+"""Tests of the WebSocket commands serving the series."""
+
+from datetime import timedelta
+import logging
+from typing import Any
+
+import pytest
+
+from homeassistant.auth import models as auth_models
+from homeassistant.auth.permissions import PermissionLookup
+from homeassistant.components.websocket_api import const as ws_const
+from homeassistant.components.websocket_api.connection import ActiveConnection
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from custom_components.checkwatt.const import DATA_SUBSCRIPTIONS, DOMAIN
+from custom_components.checkwatt.websocket_api import (
+    async_register_websocket_commands,
+)
+
+ENTITY_ID = "sensor.home_battery_power"
+OTHER_ENTITY_ID = "sensor.other_battery_power"
+
+
+@pytest.fixture
+async def hub(hass: HomeAssistant, setup_hub):
+    """Return a loaded hub with an entity of its entry."""
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    hub = await setup_hub()
+    entry = hub.config_entry
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = hub
+    er.async_get(hass).async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "battery_power",
+        config_entry=entry,
+        suggested_object_id="home_battery_power",
+    )
+    async_register_websocket_commands(hass)
+    return hub
+
+
+def _connect(
+    hass: HomeAssistant, readable: bool, messages: list[dict[str, Any]]
+) -> ActiveConnection:
+    """Return a connection of a user allowed to read the entity or not."""
+    user = auth_models.User(
+        name="viewer",
+        perm_lookup=PermissionLookup(er.async_get(hass), dr.async_get(hass)),
+        is_active=True,
+        groups=[
+            auth_models.Group(
+                name="viewers",
+                policy={
+                    "entities": {
+                        "entity_ids": {ENTITY_ID if readable else OTHER_ENTITY_ID: True}
+                    }
+                },
+            )
+        ],
+    )
+    refresh_token = auth_models.RefreshToken(user, None, timedelta(minutes=30))
+    return ActiveConnection(
+        logging.getLogger(__name__), hass, messages.append, user, refresh_token
+    )
+
+
+async def test_series_read_by_a_user_allowed_to(hass: HomeAssistant, hub) -> None:
+    """A user reading the entities of the entry gets its series."""
+    messages: list[dict[str, Any]] = []
+    connection = _connect(hass, True, messages)
+
+    connection.async_handle(
+        {"id": 1, "type": f"{DOMAIN}/series", "entry_id": hub.config_entry.entry_id}
+    )
+
+    assert messages[0]["success"]
+    assert messages[0]["result"]["series"]["columns"]["grid_power"] == [2000]
+
+
+async def test_series_refused_to_other_users(hass: HomeAssistant, hub) -> None:
+    """A user not allowed to read the entities of the entry is refused."""
+    messages: list[dict[str, Any]] = []
+    connection = _connect(hass, False, messages)
+
+    connection.async_handle(
+        {"id": 1, "type": f"{DOMAIN}/series", "entry_id": hub.config_entry.entry_id}
+    )
+
+    assert not messages[0]["success"]
+    assert messages[0]["error"]["code"] == ws_const.ERR_UNAUTHORIZED
+
+
+async def test_subscriptions_end_with_the_entry(hass: HomeAssistant, hub) -> None:
+    """The subscriptions are kept in one registry ended by the entry unload."""
+    entry = hub.config_entry
+    messages: list[dict[str, Any]] = []
+    connection = _connect(hass, True, messages)
+    listeners = len(hub._listeners)
+
+    for msg_id in (1, 2):
+        connection.async_handle(
+            {
+                "id": msg_id,
+                "type": f"{DOMAIN}/series/subscribe",
+                "entry_id": entry.entry_id,
+            }
+        )
+    assert len(hass.data[DATA_SUBSCRIPTIONS][entry.entry_id]) == 2
+
+    # A subscription ended by the client leaves the registry
+    connection.subscriptions.pop(1)()
+    assert len(hass.data[DATA_SUBSCRIPTIONS][entry.entry_id]) == 1
+
+    await entry._async_process_on_unload(hass)
+
+    assert connection.subscriptions == {}
+    assert entry.entry_id not in hass.data[DATA_SUBSCRIPTIONS]
+    assert len(hub._listeners) == listeners